@@ -1,6 +1,11 @@
 import streamlit as st
+import pandas as pd
 from data_collector import BCBDataCollector
-from database_manager import DatabaseManager
+from database_manager import get_database_manager
+from collection_pipeline import collect_and_save, collection_lease
+from write_service import get_write_service
+from series_catalog import get_catalog
+from scheduler import get_collection_status, scheduler_alive, request_refresh
 
 def coleta_page(last_n_years):
     st.title("🔄 Coleta de Dados")
@@ -13,13 +18,102 @@ def coleta_page(last_n_years):
     - Armazenamento em banco de dados
     """)
     
+    incremental = st.checkbox(
+        "Coleta incremental (baixa apenas os dados novos desde a última coleta)",
+        value=True
+    )
+    
     if st.button("Coleta de Dados"):
-        with st.spinner("Coletando dados..."):
+        if scheduler_alive():
+            # Com o agendador em execução, a coleta é só antecipada: a página não espera pela rede
+            request_refresh()
+            st.success("Coleta solicitada ao agendador; acompanhe a situação em \"Agendador de Coleta\".")
+        else:
+            with st.spinner("Coletando dados..."), collection_lease() as acquired:
+                if not acquired:
+                    # Outra sessão (ou processo) já está coletando: não disparar uma segunda coleta
+                    st.info("Já há uma coleta em andamento; os dados aparecem assim que ela terminar.")
+                else:
+                    collector = BCBDataCollector()
+                    db = get_database_manager()
+                    if incremental:
+                        date_ranges = collector.incremental_date_ranges(db.get_last_dates(),
+                                                                        last_n_years=last_n_years)
+                    else:
+                        date_ranges = collector.full_date_ranges(last_n_years)
+                    # Cada série é gravada assim que termina de baixar; anos e linhas inalterados não são regravados
+                    results = collect_and_save(collector, db, date_ranges)
+                    failed = [indicator for indicator, outcome in collector.outcomes.items()
+                              if outcome['status'] not in ('ok', 'empty')]
+                    if failed:
+                        st.warning(f"Não foi possível coletar: {', '.join(failed)}. Tente novamente mais tarde.")
+                    if all(results.values()):
+                        st.success("Dados coletados e salvos com sucesso!")
+                    else:
+                        st.warning("Alguns dados não puderam ser salvos.")
+    
+    st.markdown("---")
+    st.markdown("### Carga Histórica Completa")
+    st.markdown("Baixa todo o histórico das séries selecionadas em janelas. "
+                "Se a carga for interrompida, basta executá-la novamente para retomar de onde parou.")
+    catalog = get_catalog()
+    backfill_indicators = st.multiselect(
+        "Séries para carga histórica",
+        catalog.names(),
+        default=[name for name, frequency in catalog.frequency_map().items() if frequency == 'daily'],
+        format_func=lambda x: catalog.labels().get(x, x)
+    )
+    
+    if st.button("Carga Histórica") and backfill_indicators:
+        with st.spinner("Baixando histórico completo..."):
             collector = BCBDataCollector()
-            data = collector.collect_all_data(last_n_years)
-            db = DatabaseManager()
-            results = db.save_all_data(data)
-            if all(results.values()):
-                st.success("Dados coletados e salvos com sucesso!")
+            service = get_write_service()
+            futures = {}
+            for indicator in backfill_indicators:
+                df = collector.backfill(indicator)
+                if df is not None:
+                    # Cada série vai para o gravador único enquanto a próxima é baixada
+                    futures[indicator] = service.submit(indicator, df)
+            results = {indicator: future.result() for indicator, future in futures.items()}
+            if futures and len(futures) == len(backfill_indicators) and all(results.values()):
+                st.success("Histórico completo salvo com sucesso!")
             else:
-                st.warning("Alguns dados não puderam ser salvos.")
+                st.warning("Algumas séries não foram concluídas. Execute novamente para retomar.")
+    
+    st.markdown("---")
+    st.markdown("### Situação das Séries")
+    catalog = get_catalog()
+    metadata = get_database_manager().get_series_metadata()
+    if metadata:
+        st.table(pd.DataFrame([
+            {
+                'Série': catalog.labels().get(name, name),
+                'Registros': entry['row_count'],
+                'Primeira data': entry['first_date'],
+                'Última data': entry['last_date'],
+                'Última gravação': entry['last_write'],
+            }
+            for name, entry in metadata.items()
+        ]))
+    else:
+        st.info("Nenhuma série coletada ainda.")
+    
+    st.markdown("---")
+    st.markdown("### Agendador de Coleta")
+    if scheduler_alive():
+        st.caption("Agendador em execução: as séries são atualizadas em segundo plano.")
+    else:
+        st.caption("Agendador parado. Para atualizar as séries em segundo plano, execute python scheduler.py.")
+    status = get_collection_status()
+    if status:
+        st.table(pd.DataFrame([
+            {
+                'Série': catalog.labels().get(name, name),
+                'Situação': entry['status'],
+                'Última coleta': entry['last_run_at'],
+                'Próxima coleta': entry['next_run_at'],
+                'Registros': entry['last_rows'],
+                'Erro': entry['last_error'] or '',
+            }
+            for name, entry in status.items()
+        ]))
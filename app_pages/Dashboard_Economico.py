@@ -1,9 +1,10 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
-from components.indicadores import indicator_names, load_data
+from components.indicadores import get_indicator_names, load_data, load_many
 
 def dashboard_page():
+    indicator_names = get_indicator_names()
     st.title("📈 Dashboard Econômico - Dados do Banco Central do Brasil")
 
     st.sidebar.subheader(":blue[Indicadores]")
@@ -13,11 +14,34 @@ def dashboard_page():
         default=['ipca'],
         format_func=lambda x: indicator_names.get(x, x)
     )
+    resolution_labels = {'monthly': 'Mensal', 'quarterly': 'Trimestral', 'yearly': 'Anual', None: 'Original'}
+    resolution = st.sidebar.selectbox(
+        ":blue[Resolução dos gráficos]",
+        list(resolution_labels.keys()),
+        format_func=lambda x: resolution_labels[x]
+    )
     if not indicators:
         st.warning("Por favor, selecione pelo menos um indicador no menu lateral.")
     else:
+        if len(indicators) > 1:
+            # Séries alinhadas na mesma grade de datas, em uma única consulta
+            comparison = load_many(indicators, freq=resolution)
+            if comparison is not None and not comparison.empty:
+                st.subheader("Comparação entre indicadores")
+                fig = px.line(
+                    comparison.rename(columns=indicator_names), x='date',
+                    y=[indicator_names.get(x, x) for x in indicators],
+                    labels={'date': 'Data', 'value': 'Valor', 'variable': 'Indicador'}
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                st.markdown("---")
+
         for indicator in indicators:
             data = load_data(indicator)
+            # Gráfico de longo prazo a partir dos agregados por período (médias)
+            chart_data = load_data(indicator, resolution=resolution) if resolution else None
+            if chart_data is None or chart_data.empty:
+                chart_data = data
 
             if data is not None and not data.empty:
                 # Garante que as colunas de data sejam do tipo datetime
@@ -27,7 +51,7 @@ def dashboard_page():
             if data is not None and not data.empty:
                 st.subheader(indicator_names[indicator])
                 fig = px.line(
-                    data, x='date', y='value',
+                    chart_data, x='date', y='value',
                     title=f'Evolução de {indicator_names[indicator]}',
                     labels={'date': 'Data', 'value': 'Valor'}
                 )
@@ -2,15 +2,29 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-import time
-from components.indicadores import indicator_names, load_data
+from components.indicadores import get_indicator_names, load_data
 from ml_core.forecaster import simulate_forecast, calcular_estatisticas
+from ml_core.backtesting import backtest_all
 from utils.report_generator import generate_downloadable_report
 from utils.ai_report_generator import AIReportGenerator
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# O backtest roda fora da requisição da página (com o Prophet leva minutos): um cálculo
+# por motor de cada vez, compartilhado entre as sessões
+_backtest_executor = ThreadPoolExecutor(max_workers=1)
+_backtest_jobs = {}
+
+
+def _start_backtest(engine):
+    """Inicia o backtest do motor em segundo plano, se ainda não houver um em andamento"""
+    job = _backtest_jobs.get(engine)
+    if job is None or job.done():
+        _backtest_jobs[engine] = _backtest_executor.submit(backtest_all, engine=engine)
 
 
 def ml_page():
+    indicator_names = get_indicator_names()
     st.title("🔮 Previsões de Indicadores Econômicos")
     indicator = st.selectbox(
         "Selecione o indicador para prever",
@@ -18,8 +32,15 @@ def ml_page():
         format_func=lambda x: indicator_names.get(x, x)
     )
     forecast_periods = st.slider("Número de meses para prever", 3, 36, 6)
+    engine = st.radio(
+        "Modelo de previsão",
+        ['fast', 'prophet'],
+        format_func=lambda x: {'fast': 'Rápido (Holt-Winters)', 'prophet': 'Prophet (análise completa)'}[x],
+        horizontal=True
+    )
     
-    data = load_data(indicator)
+    # A previsão é mensal: séries diárias entram pelas médias mensais já agregadas no banco
+    data = load_data(indicator, resolution='monthly')
 
     if data is not None and not data.empty:
         st.subheader(f"Dados históricos de {indicator_names[indicator]}")
@@ -28,9 +49,7 @@ def ml_page():
 
         if st.button("Simular Previsão"):
             with st.spinner("Calculando previsão..."):
-                time.sleep(2) # Simulação de processamento
-                
-                future_df = simulate_forecast(data, forecast_periods)
+                future_df = simulate_forecast(data, forecast_periods, engine=engine)
                 future_df['tipo'] = 'Previsto'
                 future_df['date_str'] = future_df['date'].dt.strftime('%d/%b/%Y')
 
@@ -99,6 +118,32 @@ def ml_page():
                 }
                 st.success("Previsão concluída!")
 
+        with st.expander("📏 Precisão dos modelos (backtest)"):
+            st.caption(
+                "Validação com origem móvel: o modelo escolhido é ajustado em cortes sucessivos do "
+                "histórico e comparado com os 12 meses seguintes. Só as séries com dados novos são recalculadas."
+            )
+            if st.button("Atualizar tabela de precisão"):
+                _start_backtest(engine)
+            
+            job = _backtest_jobs.get(engine)
+            if job is not None and not job.done():
+                st.info("⏳ Calculando backtest em segundo plano; a página continua disponível.")
+                st.button("Verificar andamento")
+            elif job is not None:
+                _backtest_jobs.pop(engine, None)
+                try:
+                    accuracy = job.result()
+                    accuracy['name'] = accuracy['name'].map(lambda x: indicator_names.get(x, x))
+                    st.session_state['backtest_table'] = accuracy.rename(columns={
+                        'name': 'Indicador', 'folds': 'Dobras', 'mape': 'MAPE (%)', 'rmse': 'RMSE',
+                        'mae': 'MAE', 'coverage': 'Cobertura', 'computed_at': 'Calculado em'
+                    })[['Indicador', 'Dobras', 'MAPE (%)', 'RMSE', 'MAE', 'Cobertura', 'Calculado em']]
+                except Exception as e:
+                    st.error(f"Erro no backtest: {e}")
+            if 'backtest_table' in st.session_state:
+                st.dataframe(st.session_state['backtest_table'], use_container_width=True, hide_index=True)
+
         if 'forecast_results' in st.session_state:
             results = st.session_state['forecast_results']
             
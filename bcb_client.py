@@ -0,0 +1,186 @@
+# Arquivo: bcb_client.py
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+import requests
+from config import (BCB_CONNECT_TIMEOUT, BCB_READ_TIMEOUT, BCB_MAX_RETRIES, BCB_BACKOFF_BASE_SECONDS,
+                    BCB_BACKOFF_MAX_SECONDS, BCB_RATE_LIMIT_PER_SECOND,
+                    BCB_CIRCUIT_FAILURE_THRESHOLD, BCB_CIRCUIT_RESET_SECONDS)
+
+# Status HTTP que indicam falha temporária do servidor (vale a pena tentar de novo)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Requisição bloqueada porque o circuito do endpoint está aberto"""
+
+
+class RateLimiter:
+    """Limitador global de requisições por segundo (token bucket)"""
+
+    def __init__(self, rate=BCB_RATE_LIMIT_PER_SECOND):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloqueia até haver uma ficha disponível"""
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Disjuntor de um endpoint
+
+    Após `failure_threshold` falhas seguidas o circuito abre e as requisições são
+    recusadas imediatamente; passado `reset_timeout`, uma requisição de teste é
+    liberada (meio-aberto) e o resultado dela fecha ou reabre o circuito.
+    """
+
+    def __init__(self, failure_threshold=BCB_CIRCUIT_FAILURE_THRESHOLD, reset_timeout=BCB_CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """Indica se uma requisição pode ser feita agora"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+# Limitador e disjuntores compartilhados por todos os clientes do processo, para que
+# valham entre coletas diferentes (cada clique na página cria um novo coletor)
+_shared_rate_limiter = RateLimiter()
+_shared_breakers = {}
+_shared_breakers_lock = threading.Lock()
+
+
+class BCBClient:
+    """
+    Cliente HTTP da API do BCB com timeouts, novas tentativas com backoff exponencial
+    (com jitter), limite global de requisições por segundo e disjuntor por endpoint
+    """
+
+    def __init__(self, session=None, timeout=(BCB_CONNECT_TIMEOUT, BCB_READ_TIMEOUT),
+                 max_retries=BCB_MAX_RETRIES, backoff_base=BCB_BACKOFF_BASE_SECONDS,
+                 backoff_max=BCB_BACKOFF_MAX_SECONDS, rate_limiter=None):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter or _shared_rate_limiter
+        self.breakers = _shared_breakers
+        self._local = threading.local()
+
+    @property
+    def last_attempts(self):
+        """Número de tentativas da última requisição feita nesta thread"""
+        return getattr(self._local, 'attempts', 0)
+
+    def reset_attempts(self):
+        """Zera o contador de tentativas desta thread (ex.: antes de uma leitura do cache)"""
+        self._local.attempts = 0
+
+    def _breaker(self, url):
+        """Disjuntor do endpoint (caminho da URL, sem os parâmetros de data)"""
+        endpoint = urlsplit(url).path
+        with _shared_breakers_lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker()
+            return self.breakers[endpoint]
+
+    def _backoff(self, attempt, response=None):
+        """Espera antes da próxima tentativa: Retry-After ou backoff exponencial com jitter"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url, headers=None, stream=False):
+        """
+        Faz um GET com novas tentativas para falhas temporárias
+
+        Returns:
+            requests.Response (status 2xx ou 304)
+
+        Raises:
+            CircuitOpenError: se o circuito do endpoint estiver aberto
+            requests.exceptions.RequestException: se todas as tentativas falharem
+        """
+        breaker = self._breaker(url)
+        if not breaker.allow():
+            self._local.attempts = 0
+            raise CircuitOpenError(f"Circuito aberto para {urlsplit(url).path}")
+
+        attempt = 0
+        while True:
+            attempt += 1
+            self._local.attempts = attempt
+            self.rate_limiter.acquire()
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, stream=stream, timeout=self.timeout)
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    breaker.record_success()
+                    return response
+                error = requests.exceptions.HTTPError(
+                    f"{response.status_code} para {url}", response=response)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            except requests.exceptions.HTTPError:
+                # Erros do cliente (4xx) não são falhas do servidor: não tentar de novo
+                breaker.record_success()
+                raise
+
+            if attempt > self.max_retries:
+                breaker.record_failure()
+                raise error
+            if response is not None:
+                response.close()
+            time.sleep(self._backoff(attempt - 1, response))
@@ -0,0 +1,64 @@
+# Arquivo: benchmarks/bench_backtesting.py
+# Tabela de precisão (backtest_all) para várias séries mensais sintéticas: primeiro
+# cálculo, repetição sem dados novos (métricas pela versão dos dados) e recálculo
+# depois de chegar um mês novo em metade das séries (só as dobras novas são ajustadas).
+#
+# Uso: python benchmarks/bench_backtesting.py [séries] [engine]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+from series_catalog import get_catalog
+from ml_core.backtesting import backtest_all
+
+MONTHS = 240
+
+
+def synthetic(months, seed):
+    t = np.arange(months)
+    values = (10 + 0.02 * t + 2 * np.sin(2 * np.pi * t / 12)
+              + np.random.default_rng(seed).normal(0, 0.3, months))
+    return pd.DataFrame({'date': pd.date_range('2000-01-01', periods=months, freq='MS'), 'value': values})
+
+
+def timed(func):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        result = func()
+    return time.perf_counter() - started, result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    engine = sys.argv[2] if len(sys.argv) > 2 else 'fast'
+
+    path = os.path.join(tempfile.mkdtemp(), 'backtesting.db')
+    catalog_file = os.path.join(os.path.dirname(path), 'series.csv')
+    names = [f'bench_{i}' for i in range(count)]
+    pd.DataFrame({'name': names, 'series_id': range(900000, 900000 + count),
+                  'frequency': 'monthly'}).to_csv(catalog_file, index=False)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        get_catalog(path).load_file(catalog_file)
+        db = DatabaseManager(path)
+        db.save_all_data({name: synthetic(MONTHS, i) for i, name in enumerate(names)})
+
+    cold, table = timed(lambda: backtest_all(names, engine, db_path=path))
+    warm, _ = timed(lambda: backtest_all(names, engine, db_path=path))
+
+    # Um mês novo em metade das séries
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        db.save_all_data({name: synthetic(MONTHS + 1, i).tail(1) for i, name in enumerate(names[::2])})
+    incremental, updated = timed(lambda: backtest_all(names, engine, db_path=path))
+
+    print(f"{count} séries mensais de {MONTHS} pontos, motor '{engine}', {int(table['folds'].iloc[0])} dobras\n")
+    print(f"{'primeiro cálculo':<30}{cold * 1000:>9.0f} ms")
+    print(f"{'sem dados novos':<30}{warm * 1000:>9.0f} ms")
+    print(f"{'mês novo em metade das séries':<30}{incremental * 1000:>9.0f} ms "
+          f"({(~updated['cached']).sum()} séries recalculadas)")
+    print(f"\nMAPE médio {table['mape'].mean():.2f}%, cobertura média {table['coverage'].mean():.1%}")
@@ -0,0 +1,58 @@
+# Arquivo: benchmarks/bench_batch_forecast.py
+# Previsão em lote de várias séries mensais sintéticas com 1, 2, 4... processos, sem o
+# cache de modelos (todo modelo é ajustado), medindo o tempo total e o ganho em relação
+# a um processo. Com o Prophet, o ajuste domina e o ganho deve ficar perto do número
+# de processos.
+#
+# Uso: python benchmarks/bench_batch_forecast.py [séries] [meses de histórico]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+from series_catalog import get_catalog
+from ml_core.batch_forecast import forecast_all, available_cpus
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    months = int(sys.argv[2]) if len(sys.argv) > 2 else 240
+
+    path = os.path.join(tempfile.mkdtemp(), 'batch_forecast.db')
+    catalog_file = os.path.join(os.path.dirname(path), 'series.csv')
+    names = [f'bench_{i}' for i in range(count)]
+    pd.DataFrame({'name': names, 'series_id': range(900000, 900000 + count),
+                  'frequency': 'monthly'}).to_csv(catalog_file, index=False)
+
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=months, freq='MS')
+    t = np.arange(months)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        get_catalog(path).load_file(catalog_file)
+        db = DatabaseManager(path)
+        db.save_all_data({name: pd.DataFrame({'date': dates,
+                                              'value': 5 + 0.01 * t + np.sin(2 * np.pi * t / 12)
+                                              + rng.normal(0, 0.2, months)})
+                          for name in names})
+
+    workers = [1]
+    while workers[-1] * 2 <= available_cpus():
+        workers.append(workers[-1] * 2)
+
+    print(f"{count} séries mensais de {months} pontos, horizontes (6, 12, 24)\n")
+    print(f"{'processos':>10}{'tempo':>10}{'ganho':>8}")
+    baseline = None
+    for n in workers:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            forecasts, failures = forecast_all(names, (6, 12, 24), db_path=path,
+                                               max_workers=n, use_cache=False)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        assert not failures, failures
+        print(f"{n:>10}{elapsed:>9.1f}s{baseline / elapsed:>7.1f}x")
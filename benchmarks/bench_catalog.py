@@ -0,0 +1,68 @@
+# Arquivo: benchmarks/bench_catalog.py
+# Mede as operações do catálogo de séries com milhares de séries: importação do
+# arquivo, consultas, criação das tabelas, última data por série e coleta completa
+# (contra o servidor SGS local).
+#
+# Uso: python benchmarks/bench_catalog.py [número de séries]
+import os
+import sys
+import time
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from series_catalog import SeriesCatalog
+from database_manager import DatabaseManager
+from data_collector import BCBDataCollector
+from collection_pipeline import collect_and_save
+from bcb_client import RateLimiter
+from mock_sgs_server import MockSGSServer
+
+
+def timed(label, func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{label:<40}{(time.perf_counter() - started) * 1000:>10.1f} ms")
+    return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'catalog_bench.db')
+    catalog_path = os.path.join(workdir, 'catalog.csv')
+
+    pd.DataFrame({
+        'name': [f"serie_{i}" for i in range(count)],
+        'series_id': range(100000, 100000 + count),
+        'label': [f"Série sintética {i}" for i in range(count)],
+        'frequency': ['daily' if i % 10 == 0 else 'monthly' for i in range(count)],
+        'unit': '%'
+    }).to_csv(catalog_path, index=False)
+
+    print(f"Catálogo sintético com {count} séries\n")
+    catalog = SeriesCatalog(db_path)
+    timed("Importar arquivo do catálogo", catalog.load_file, catalog_path)
+    timed(f"{count} consultas por nome", lambda: [catalog.get(f"serie_{i}") for i in range(count)])
+    timed(f"{count} consultas por código", lambda: [catalog.get_by_id(100000 + i) for i in range(count)])
+
+    db = DatabaseManager(db_path)
+    db.catalog = catalog
+    timed("Criar tabelas de todas as séries", db._create_tables)
+    timed("Última data de todas as séries", db.get_last_dates)
+
+    stdout = sys.stdout
+    with MockSGSServer(rows=24) as server:
+        collector = BCBDataCollector(max_workers=32, use_cache=False, base_url=server.base_url, catalog=catalog)
+        collector.client.rate_limiter = RateLimiter(rate=0)
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            started = time.perf_counter()
+            results = collect_and_save(collector, db, collector.full_date_ranges(2), queue_size=64)
+            elapsed = time.perf_counter() - started
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    print(f"{'Coletar e gravar todas as séries':<40}{elapsed * 1000:>10.1f} ms "
+          f"({sum(results.values())} séries gravadas, {len(results) / elapsed:.0f} séries/s)")
+    timed("Estatísticas do banco", db.get_stats)
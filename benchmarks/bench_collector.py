@@ -0,0 +1,70 @@
+# Arquivo: benchmarks/bench_collector.py
+# Mede vazão e latência de cauda do BCBDataCollector.collect_all_data contra o
+# servidor SGS local (benchmarks/mock_sgs_server.py), totalmente offline.
+#
+# Uso: python benchmarks/bench_collector.py --latency 0.2 --jitter 0.1 --error-rate 0.05 --rounds 5
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_collector import BCBDataCollector
+from bcb_client import RateLimiter
+from mock_sgs_server import MockSGSServer
+
+
+def run(server, workers, rounds, last_n_years):
+    """Executa `rounds` coletas completas e retorna (tempos por rodada, latências por série, falhas)"""
+    round_times, latencies, failures = [], [], 0
+    for _ in range(rounds):
+        collector = BCBDataCollector(max_workers=workers, use_cache=False, base_url=server.base_url)
+        # Sem limite de taxa: o objetivo é medir o coletor, não o limitador
+        collector.client.rate_limiter = RateLimiter(rate=0)
+        collector.client.backoff_base = 0.05
+
+        started = time.perf_counter()
+        collector.collect_all_data(last_n_years)
+        round_times.append(time.perf_counter() - started)
+
+        latencies.extend(outcome['elapsed'] for outcome in collector.outcomes.values())
+        failures += sum(outcome['status'] not in ('ok', 'empty') for outcome in collector.outcomes.values())
+    return np.array(round_times), np.array(latencies), failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do coletor contra o servidor SGS local")
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0.1)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rows', type=int, default=None)
+    parser.add_argument('--fixtures', default=None)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    with MockSGSServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                       rows=args.rows, fixtures_dir=args.fixtures) as server:
+        print(f"Servidor local: latência {args.latency}s ±{args.jitter}s, "
+              f"erros {args.error_rate:.0%}, {args.rounds} rodadas\n")
+        print(f"{'Workers':>8}{'Rodada (s)':>12}{'Séries/s':>10}{'p50 (s)':>9}{'p95 (s)':>9}"
+              f"{'p99 (s)':>9}{'Falhas':>8}")
+
+        # Silenciar os prints do coletor durante as medições
+        stdout = sys.stdout
+        for workers in args.workers:
+            sys.stdout = open(os.devnull, 'w')
+            try:
+                round_times, latencies, failures = run(server, workers, args.rounds, args.years)
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+
+            series = len(latencies) / args.rounds
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            print(f"{workers:>8}{round_times.mean():>12.2f}{series / round_times.mean():>10.1f}"
+                  f"{p50:>9.3f}{p95:>9.3f}{p99:>9.3f}{failures:>8}")
+
+        print(f"\nRequisições atendidas pelo servidor: {server.requests} ({server.errors} com erro)")
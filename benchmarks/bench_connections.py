@@ -0,0 +1,54 @@
+# Arquivo: benchmarks/bench_connections.py
+# Mede o custo de uma leitura como a feita a cada rerun do dashboard: antes, um novo
+# DatabaseManager (com engine SQLAlchemy) por chamada; agora, o gerenciador
+# compartilhado com conexões persistentes.
+#
+# Uso: python benchmarks/bench_connections.py [leituras]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager, get_database_manager
+
+
+def legacy_load(db_path, table_name):
+    """Leitura anterior: engine novo a cada chamada"""
+    engine = create_engine(f'sqlite:///{db_path}')
+    df = pd.read_sql(f"SELECT * FROM {table_name} ORDER BY date", engine)
+    df['date'] = pd.to_datetime(df['date'])
+    engine.dispose()
+    return df
+
+
+def per_call(reads, func):
+    started = time.perf_counter()
+    for _ in range(reads):
+        func()
+    return (time.perf_counter() - started) / reads * 1000
+
+
+if __name__ == "__main__":
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    db_path = os.path.join(tempfile.mkdtemp(), 'connections.db')
+
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=120, freq='MS')
+    df = pd.DataFrame({'date': dates, 'value': np.random.default_rng(0).normal(5, 1, len(dates))})
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        DatabaseManager(db_path, schema='tables').save_data('ipca', df)
+
+    # Série mensal curta: o tempo é dominado pela abertura de conexão/engine
+    # (sem o cache de leituras, para medir a consulta de fato)
+    get_database_manager(db_path).query_cache = None
+    legacy = per_call(reads, lambda: legacy_load(db_path, 'ipca'))
+    shared = per_call(reads, lambda: get_database_manager(db_path).load_data('ipca'))
+
+    print(f"{reads} leituras de uma série mensal (120 registros)\n")
+    print(f"{'engine novo por chamada':<35}{legacy:>8.2f} ms/leitura")
+    print(f"{'conexões persistentes':<35}{shared:>8.2f} ms/leitura")
+    print(f"\nGanho: {legacy / shared:.1f}x")
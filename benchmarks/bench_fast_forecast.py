@@ -0,0 +1,56 @@
+# Arquivo: benchmarks/bench_fast_forecast.py
+# Latência da previsão rápida (NumPy) de uma série mensal, por método, comparada com
+# a previsão simples e com o Prophet (se instalado), e o tempo para prever muitas
+# séries de uma vez com fast_forecast_many.
+#
+# Uso: python benchmarks/bench_fast_forecast.py [meses de histórico] [séries]
+import os
+import sys
+import time
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ml_core.fast_forecast import fast_forecast, fast_forecast_many, FAST_FORECAST_METHODS
+from ml_core.forecaster import create_simple_forecast, simulate_forecast, PROPHET_AVAILABLE
+
+PERIODS = 24
+
+
+def per_call(func, calls):
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        func()
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+    return (time.perf_counter() - started) / calls * 1000
+
+
+def synthetic(months, seed):
+    t = np.arange(months)
+    values = (10 + 0.02 * t + 2 * np.sin(2 * np.pi * t / 12)
+              + np.random.default_rng(seed).normal(0, 0.3, months))
+    return pd.DataFrame({'date': pd.date_range(end=pd.Timestamp.today().normalize(), periods=months, freq='MS'),
+                         'value': values})
+
+
+if __name__ == "__main__":
+    months = int(sys.argv[1]) if len(sys.argv) > 1 else 240
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    df = synthetic(months, 0)
+
+    print(f"Série mensal de {months} pontos, {PERIODS} períodos\n")
+    for method in FAST_FORECAST_METHODS:
+        print(f"{'fast ' + method:<22}{per_call(lambda: fast_forecast(df, PERIODS, method), 50):>9.2f} ms")
+    print(f"{'previsão simples':<22}{per_call(lambda: create_simple_forecast(df, PERIODS), 50):>9.2f} ms")
+    if PROPHET_AVAILABLE:
+        prophet_ms = per_call(lambda: simulate_forecast(df, PERIODS, use_cache=False), 3)
+        print(f"{'prophet':<22}{prophet_ms:>9.2f} ms")
+
+    series = {f'serie_{i}': synthetic(months, i) for i in range(count)}
+    started = time.perf_counter()
+    fast_forecast_many(series, PERIODS)
+    elapsed = time.perf_counter() - started
+    print(f"\n{count} séries com fast_forecast_many (ets): {elapsed * 1000:.0f} ms "
+          f"({elapsed / count * 1000:.2f} ms por série)")
@@ -0,0 +1,61 @@
+# Arquivo: benchmarks/bench_load_data.py
+# Compara a leitura anterior de load_data (SQL interpolado + pd.read_sql em engine
+# SQLAlchemy + pd.to_datetime) com a nova leitura por arrays tipados, nos dois
+# layouts de armazenamento, para uma série diária longa.
+#
+# Uso: python benchmarks/bench_load_data.py [anos de série diária]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+
+
+def legacy_load(engine, table_name):
+    """Implementação anterior de load_data (layout de uma tabela por série)"""
+    df = pd.read_sql(f"SELECT * FROM {table_name} ORDER BY date", engine)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def best_of(func, repeat=30):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    df = pd.DataFrame({'date': dates, 'value': np.random.default_rng(0).normal(10, 2, len(dates))})
+    workdir = tempfile.mkdtemp()
+
+    databases = {}
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for schema in ('tables', 'long'):
+            databases[schema] = DatabaseManager(os.path.join(workdir, f'{schema}.db'), schema=schema)
+            databases[schema].query_cache = None
+            databases[schema].save_data('selic', df)
+
+    engine = create_engine(f"sqlite:///{databases['tables'].db_path}")
+    baseline = best_of(lambda: legacy_load(engine, 'selic'))
+    steps = [('anterior: pd.read_sql + SQLAlchemy', baseline)]
+    for schema, db in databases.items():
+        steps += [
+            (f'{schema}: load_data', best_of(lambda: db.load_data('selic'))),
+            (f'{schema}: load_data (date, value)', best_of(lambda: db.load_data('selic', columns=('date', 'value')))),
+            (f'{schema}: load_series', best_of(lambda: db.load_series('selic'))),
+        ]
+
+    print(f"Série diária sintética: {years} anos, {len(df)} registros\n")
+    for label, elapsed in steps:
+        print(f"{label:<40}{elapsed:>9.2f} ms{baseline / elapsed:>8.1f}x")
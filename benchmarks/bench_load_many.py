@@ -0,0 +1,66 @@
+# Arquivo: benchmarks/bench_load_many.py
+# Compara o alinhamento de séries diárias e mensais feito com um load_data por
+# indicador + resample/merge no pandas com DatabaseManager.load_many (uma consulta).
+#
+# Uso: python benchmarks/bench_load_many.py [anos]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+
+
+def per_indicator_loop(db, indicators, freq):
+    """Uma leitura por indicador e alinhamento no pandas"""
+    frames = []
+    for indicator in indicators:
+        data = db.load_data(indicator, columns=('date', 'value')).set_index('date')['value']
+        if freq:
+            data = data.resample({'monthly': 'MS', 'quarterly': 'QS', 'yearly': 'YS'}[freq]).mean()
+        frames.append(data.rename(indicator))
+    return pd.concat(frames, axis=1, sort=True).ffill().reset_index()
+
+
+def best_of(func, repeat=10):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    end = pd.Timestamp.today().normalize()
+    rng = np.random.default_rng(0)
+
+    results = {}
+    for schema in ('tables', 'long'):
+        db = DatabaseManager(os.path.join(tempfile.mkdtemp(), f'{schema}.db'), schema=schema)
+        db.query_cache = None
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            for name, frequency in db.catalog.frequency_map().items():
+                if frequency == 'daily':
+                    dates = pd.bdate_range(end=end, periods=years * 252)
+                else:
+                    dates = pd.date_range(end=end, periods=years * 12, freq='MS')
+                db.save_data(name, pd.DataFrame({'date': dates, 'value': rng.normal(10, 2, len(dates))}))
+        indicators = db.catalog.names()
+
+        for freq in (None, 'monthly'):
+            label = freq or 'união das datas'
+            results[(schema, label)] = {
+                'loop por indicador (ms)': best_of(lambda: per_indicator_loop(db, indicators, freq)),
+                'load_many (ms)': best_of(lambda: db.load_many(indicators, freq=freq)),
+            }
+
+    table = pd.DataFrame(results).T
+    table['ganho'] = table['loop por indicador (ms)'] / table['load_many (ms)']
+    print(f"{len(indicators)} séries (2 diárias, {len(indicators) - 2} mensais), {years} anos\n")
+    print(table.round(2).to_string())
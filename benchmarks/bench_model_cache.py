@@ -0,0 +1,52 @@
+# Arquivo: benchmarks/bench_model_cache.py
+# Simula o uso da página de previsões: o mesmo indicador com horizontes diferentes,
+# medindo o tempo de simulate_forecast sem cache (ajuste a cada chamada), no primeiro
+# acesso (ajuste + gravação do JSON) e com o modelo em cache (só predict), inclusive
+# relendo o modelo do disco, como em um novo processo.
+#
+# Uso: python benchmarks/bench_model_cache.py [meses de histórico]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ml_core.model_cache as model_cache
+from ml_core.forecaster import simulate_forecast
+
+HORIZONS = (6, 12, 24, 36)
+
+
+def timed(func):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        func()
+    return (time.perf_counter() - started) * 1000
+
+
+if __name__ == "__main__":
+    months = int(sys.argv[1]) if len(sys.argv) > 1 else 240
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=months, freq='MS')
+    t = np.arange(months)
+    df = pd.DataFrame({'date': dates,
+                       'value': 5 + 0.01 * t + np.sin(2 * np.pi * t / 12)
+                       + np.random.default_rng(0).normal(0, 0.2, months)})
+
+    cache = model_cache._cache = model_cache.ModelCache(cache_dir=tempfile.mkdtemp())
+
+    uncached = [timed(lambda: simulate_forecast(df, h, use_cache=False)) for h in HORIZONS]
+    first = timed(lambda: simulate_forecast(df, HORIZONS[0]))
+    memory = [timed(lambda: simulate_forecast(df, h)) for h in HORIZONS[1:]]
+    cache._memory.clear()
+    disk = timed(lambda: simulate_forecast(df, HORIZONS[0]))
+
+    print(f"Histórico mensal de {months} pontos, horizontes {HORIZONS}\n")
+    print(f"{'sem cache (média)':<26}{np.mean(uncached):>9.0f} ms")
+    print(f"{'primeiro acesso':<26}{first:>9.0f} ms")
+    print(f"{'em cache, memória (média)':<26}{np.mean(memory):>9.0f} ms")
+    print(f"{'em cache, lido do disco':<26}{disk:>9.0f} ms")
+    print(f"\nTaxa de acerto: {cache.hit_rate():.1%}; {cache.stats}")
+    print(f"Cache em disco: {cache.size() / 1024:.0f} KB")
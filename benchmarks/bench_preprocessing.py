@@ -0,0 +1,59 @@
+# Arquivo: benchmarks/bench_preprocessing.py
+# Tempo de ajuste por indicador com o histórico bruto (todas as observações na
+# frequência nativa) e com o histórico preparado (agregado à frequência da previsão
+# e limitado pela política de histórico). O ajuste é o do Prophet quando instalado;
+# sem ele, o da previsão rápida (Holt-Winters em NumPy).
+#
+# Uso: python benchmarks/bench_preprocessing.py [anos de histórico]
+import os
+import sys
+import time
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import BCB_INDICATOR_FREQUENCY_MAP
+from ml_core.preprocessing import prepare_history
+from ml_core.fast_forecast import fast_forecast
+from ml_core.forecaster import fit_prophet, PROPHET_AVAILABLE
+
+PERIODS = 12
+
+
+def synthetic(frequency, years, seed):
+    end = pd.Timestamp.today().normalize()
+    if frequency == 'daily':
+        dates = pd.bdate_range(end=end, periods=years * 252)
+    else:
+        dates = pd.date_range(end=end, periods=years * 12, freq='MS')
+    t = np.arange(len(dates)) / len(dates) * years
+    values = 10 + 0.2 * t + np.sin(2 * np.pi * t) + np.random.default_rng(seed).normal(0, 0.3, len(dates))
+    return pd.DataFrame({'date': dates, 'value': values})
+
+
+def fit(history):
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        started = time.perf_counter()
+        if PROPHET_AVAILABLE:
+            fit_prophet(history.rename(columns={'date': 'ds', 'value': 'y'}), use_cache=False)
+        else:
+            # Sem o Prophet, mede a previsão rápida com o histórico inteiro (max_history=None)
+            fast_forecast(history, PERIODS, max_history=None)
+        return (time.perf_counter() - started) * 1000
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    engine = 'Prophet' if PROPHET_AVAILABLE else 'previsão rápida'
+    print(f"{years} anos de histórico, ajuste com {engine}\n")
+    print(f"{'indicador':<20}{'pontos':>8}{'ajuste':>11}{'preparado':>11}{'prep.':>9}{'ajuste':>11}{'ganho':>8}")
+
+    for i, (name, frequency) in enumerate(BCB_INDICATOR_FREQUENCY_MAP.items()):
+        raw = synthetic(frequency, years, i)
+        started = time.perf_counter()
+        prepared = prepare_history(raw)
+        prepare_ms = (time.perf_counter() - started) * 1000
+        raw_ms, prepared_ms = fit(raw), fit(prepared)
+        print(f"{name:<20}{len(raw):>8}{raw_ms:>8.0f} ms{len(prepared):>11}{prepare_ms:>6.1f} ms"
+              f"{prepared_ms:>8.0f} ms{raw_ms / prepared_ms:>7.1f}x")
@@ -0,0 +1,53 @@
+# Arquivo: benchmarks/bench_query_cache.py
+# Simula reruns do dashboard: a mesma leitura repetida, com uma gravação no meio,
+# medindo o tempo das leituras com e sem o cache em memória, a taxa de acerto e a
+# memória ocupada.
+#
+# Uso: python benchmarks/bench_query_cache.py [reruns]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+
+
+def per_call(reads, func):
+    started = time.perf_counter()
+    for _ in range(reads):
+        func()
+    return (time.perf_counter() - started) / reads * 1e6
+
+
+if __name__ == "__main__":
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'query_cache.db'))
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=40 * 252)
+    df = pd.DataFrame({'date': dates, 'value': np.random.default_rng(0).normal(10, 2, len(dates))})
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        db.save_data('selic', df)
+
+    cache = db.query_cache
+    db.query_cache = None
+    uncached_series = per_call(reruns, lambda: db.load_series('selic'))
+    uncached_frame = per_call(reruns, lambda: db.load_data('selic'))
+    db.query_cache = cache
+
+    cached_series = per_call(reruns, lambda: db.load_series('selic'))
+    cached_frame = per_call(reruns, lambda: db.load_data('selic'))
+
+    # Uma coleta no meio dos reruns: a primeira leitura seguinte já vê o dado novo
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        db.save_data('selic', df.tail(1).assign(value=-1.0))
+    assert db.load_series('selic')['value'][-1] == -1.0
+
+    print(f"Série diária de {len(df)} registros, {reruns} reruns\n")
+    print(f"{'':<14}{'sem cache':>14}{'com cache':>14}")
+    print(f"{'load_series':<14}{uncached_series:>11.0f} µs{cached_series:>11.0f} µs")
+    print(f"{'load_data':<14}{uncached_frame:>11.0f} µs{cached_frame:>11.0f} µs")
+    print(f"\nTaxa de acerto: {cache.hit_rate():.1%}; {cache.stats}")
+    print(f"Memória do cache: {cache.memory_usage() / 1024:.0f} KB em {len(cache)} entradas")
@@ -0,0 +1,66 @@
+# Arquivo: benchmarks/bench_revisions.py
+# Simula atualizações de rotina de uma série diária longa (a coleta traz os últimos
+# anos de novo) e mede o tempo e as linhas gravadas no banco (observações, revisões,
+# agregados e metadados) com o descarte de anos inalterados pelo hash, comparado ao
+# reprocessamento de todas as linhas recebidas (only_changed=False).
+#
+# Uso: python benchmarks/bench_revisions.py [anos de série diária] [anos por coleta]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+
+
+def measure(db, df, only_changed):
+    """Tempo (ms) e linhas alteradas no banco por uma gravação"""
+    with db.connections.writer() as conn:
+        changes = conn.total_changes
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        db.save_data('selic', df, only_changed)
+    elapsed = (time.perf_counter() - started) * 1000
+    with db.connections.writer() as conn:
+        return elapsed, conn.total_changes - changes
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    window = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.offsets.BDay(1), periods=years * 252)
+    df = pd.DataFrame({'date': dates, 'value': np.random.default_rng(0).normal(10, 2, len(dates))})
+    refresh = df[df['date'] >= df['date'].iloc[-1] - pd.DateOffset(years=window)]
+
+    # Cenários de uma coleta: nada novo; um dia novo; um dia novo e três datas revisadas
+    new_day = pd.DataFrame({'date': [pd.Timestamp.today().normalize()], 'value': [10.0]})
+    revised = refresh.copy()
+    revised.loc[revised.index[-3:], 'value'] += 0.5
+    scenarios = [
+        ('coleta idêntica', refresh),
+        ('um dia novo', pd.concat([refresh, new_day])),
+        ('um dia novo + 3 revisões', pd.concat([revised, new_day.assign(value=11.0)])),
+    ]
+
+    print(f"Série diária de {len(df)} registros; cada coleta traz {len(refresh)} registros ({window} anos)\n")
+    print(f"{'':<28}{'reprocessando tudo':>26}{'padrão (hash por ano)':>28}")
+    workdir = tempfile.mkdtemp()
+    for schema in ('tables', 'long'):
+        databases = {}
+        for only_changed in (False, True):
+            db = DatabaseManager(os.path.join(workdir, f'{schema}_{only_changed}.db'), schema=schema)
+            db.query_cache = None
+            with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                db.save_data('selic', df)
+            databases[only_changed] = db
+
+        print(schema)
+        for label, data in scenarios:
+            full_ms, full_rows = measure(databases[False], data, only_changed=False)
+            skip_ms, skip_rows = measure(databases[True], data, only_changed=True)
+            print(f"  {label:<26}{full_ms:>9.1f} ms {full_rows:>6} linhas{skip_ms:>11.1f} ms {skip_rows:>6} linhas")
+        print(f"  revisões registradas: {len(databases[True].load_revisions('selic'))}")
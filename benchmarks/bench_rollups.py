@@ -0,0 +1,48 @@
+# Arquivo: benchmarks/bench_rollups.py
+# Mede a leitura de uma série diária longa na resolução original e pelos agregados
+# mensais, trimestrais e anuais, e o custo de manter os agregados em uma gravação
+# incremental (um dia novo) e em uma carga completa.
+#
+# Uso: python benchmarks/bench_rollups.py [anos de série diária]
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+
+
+def best_of(func, repeat=10):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    df = pd.DataFrame({'date': dates, 'value': np.random.default_rng(0).normal(10, 2, len(dates))})
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'rollups.db'))
+    db.query_cache = None
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        started = time.perf_counter()
+        db.save_data('selic', df)
+        full_save = (time.perf_counter() - started) * 1000
+        last_day = df.tail(1).assign(value=1.0)
+        append_save = best_of(lambda: db.save_data('selic', last_day, only_changed=False))
+
+    print(f"Série diária sintética: {years} anos, {len(df)} registros\n")
+    for resolution in (None, 'monthly', 'quarterly', 'yearly'):
+        rows = len(db.load_series('selic', resolution=resolution)['date'])
+        elapsed = best_of(lambda: db.load_data('selic', columns=('date', 'value'), resolution=resolution))
+        print(f"load_data {resolution or 'original':<12}{rows:>8} linhas{elapsed:>10.2f} ms")
+    print(f"\nsave_data carga completa (com agregados): {full_save:.1f} ms")
+    print(f"save_data de um dia (com agregados):      {append_save:.1f} ms")
@@ -0,0 +1,77 @@
+# Arquivo: benchmarks/bench_save_data.py
+# Compara a gravação linha a linha (iterrows + SELECT + UPDATE/INSERT) com o upsert
+# em lote de DatabaseManager.save_data, em registros por segundo.
+#
+# Uso: python benchmarks/bench_save_data.py [anos de série diária]
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+
+
+def legacy_save(db_path, table_name, df):
+    """Implementação anterior de save_data"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {table_name} (
+        id INTEGER PRIMARY KEY,
+        date DATE NOT NULL,
+        value FLOAT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table_name}_date ON {table_name} (date)')
+    for _, row in df[['date', 'value']].iterrows():
+        date_str = row['date'].strftime('%Y-%m-%d') if isinstance(row['date'], datetime) else row['date']
+        value = row['value']
+        cursor.execute(f"SELECT id FROM {table_name} WHERE date = ?", (date_str,))
+        if cursor.fetchone():
+            cursor.execute(f"UPDATE {table_name} SET value = ?, created_at = CURRENT_TIMESTAMP WHERE date = ?",
+                           (value, date_str))
+        else:
+            cursor.execute(f"INSERT INTO {table_name} (date, value) VALUES (?, ?)", (date_str, value))
+    conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    df = pd.DataFrame({'date': dates, 'value': np.random.default_rng(0).normal(10, 2, len(dates))})
+    print(f"Série diária sintética: {years} anos, {len(df)} registros\n")
+
+    workdir = tempfile.mkdtemp()
+    legacy_db = os.path.join(workdir, 'legacy.db')
+    bulk_db = os.path.join(workdir, 'bulk.db')
+    db = DatabaseManager(bulk_db)
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        steps = [
+            ('linha a linha: inserção', lambda: legacy_save(legacy_db, 'selic', df)),
+            ('linha a linha: atualização', lambda: legacy_save(legacy_db, 'selic', df)),
+            ('em lote: inserção', lambda: db.save_data('selic', df)),
+            ('em lote: atualização', lambda: db.save_data('selic', df, only_changed=False)),
+        ]
+        timings = []
+        for label, func in steps:
+            started = time.perf_counter()
+            func()
+            timings.append((label, time.perf_counter() - started))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    for label, elapsed in timings:
+        print(f"{label:<30}{elapsed * 1000:>10.1f} ms{len(df) / elapsed:>14,.0f} registros/s")
+    print(f"\nGanho na inserção: {timings[0][1] / timings[2][1]:.1f}x; "
+          f"na atualização: {timings[1][1] / timings[3][1]:.1f}x")
@@ -0,0 +1,79 @@
+# Arquivo: benchmarks/bench_sgs_parser.py
+# Compara o parser antigo (response.json() + DataFrame + pd.to_datetime) com o
+# parser vetorizado de sgs_parser.py, em tempo e pico de memória.
+#
+# Uso: python benchmarks/bench_sgs_parser.py [anos]
+import os
+import sys
+import json
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sgs_parser import parse_sgs_payload, parse_sgs_stream
+
+
+def make_payload(years):
+    """Gera uma resposta sintética de série diária (dias úteis) no formato da API SGS"""
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    values = np.round(np.random.default_rng(0).normal(10, 2, len(dates)), 6)
+    records = [{'data': d.strftime('%d/%m/%Y'), 'valor': f"{v}"} for d, v in zip(dates, values)]
+    return json.dumps(records, separators=(',', ':')).encode('utf-8')
+
+
+def legacy_parse(payload):
+    """Caminho anterior de get_data"""
+    df = pd.DataFrame(json.loads(payload))
+    df.rename(columns={'data': 'date', 'valor': 'value'}, inplace=True)
+    df['date'] = pd.to_datetime(df['date'], format='%d/%m/%Y')
+    df['value'] = df['value'].astype(float)
+    return df
+
+
+def vectorized_parse(payload):
+    dates, values = parse_sgs_payload(payload)
+    return pd.DataFrame({'date': dates, 'value': values})
+
+
+def streamed_parse(payload, chunk_size=64 * 1024):
+    chunks = (payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size))
+    dates, values = parse_sgs_stream(chunks)
+    return pd.DataFrame({'date': dates, 'value': values})
+
+
+def measure(func, payload, repeat=5):
+    """Retorna (melhor tempo em ms, pico de memória em MB)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(payload)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / (1024 * 1024)
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    payload = make_payload(years)
+
+    expected = legacy_parse(payload)
+    result = vectorized_parse(payload)
+    assert np.array_equal(expected['date'].values.astype('datetime64[D]'), result['date'].values.astype('datetime64[D]'))
+    assert np.allclose(expected['value'].values, result['value'].values)
+
+    print(f"Série diária sintética: {years} anos, {len(expected)} registros, "
+          f"{len(payload) / (1024 * 1024):.2f} MB de JSON\n")
+    print(f"{'Parser':<14}{'Tempo (ms)':>12}{'Pico (MB)':>12}")
+
+    baseline_time, baseline_peak = measure(legacy_parse, payload)
+    print(f"{'json+pandas':<14}{baseline_time:>12.1f}{baseline_peak:>12.2f}")
+    for name, func in [('vetorizado', vectorized_parse), ('streaming', streamed_parse)]:
+        elapsed, peak = measure(func, payload)
+        print(f"{name:<14}{elapsed:>12.1f}{peak:>12.2f}"
+              f"   ({baseline_time / elapsed:.1f}x mais rápido, {baseline_peak / peak:.1f}x menos memória)")
@@ -0,0 +1,48 @@
+# Arquivo: benchmarks/bench_stats.py
+# Compara get_stats por varredura (COUNT/MIN/MAX em cada tabela, implementação
+# anterior) com a leitura da tabela de metadados, para históricos crescentes.
+#
+# Uso: python benchmarks/bench_stats.py
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+
+
+def legacy_stats(db):
+    """Implementação anterior de get_stats (layout de uma tabela por série)"""
+    stats = {}
+    with db.connections.reader() as conn:
+        for table in db.catalog.names():
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            min_date, max_date = conn.execute(f"SELECT MIN(date), MAX(date) FROM {table}").fetchone()
+            stats[table] = {'count': count, 'period': f"{min_date} a {max_date}"}
+    return stats
+
+
+def best_of(func, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    print(f"{'anos':>6}{'registros':>12}{'varredura':>12}{'metadados':>12}")
+    for years in (5, 20, 80):
+        db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'stats.db'), schema='tables')
+        rows = 0
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            for name in db.catalog.names():
+                dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+                db.save_data(name, pd.DataFrame({'date': dates, 'value': np.random.default_rng(0).random(len(dates))}))
+                rows += len(dates)
+        print(f"{years:>6}{rows:>12}{best_of(lambda: legacy_stats(db)):>9.2f} ms{best_of(db.get_stats):>9.2f} ms")
@@ -0,0 +1,73 @@
+# Arquivo: benchmarks/bench_storage_schema.py
+# Compara os dois layouts de armazenamento (uma tabela por série x tabela única de
+# observações WITHOUT ROWID) em tamanho de arquivo, leitura de série, estatísticas
+# e última data de todas as séries. O banco 'long' é obtido com migrate_storage.py.
+#
+# Uso: python benchmarks/bench_storage_schema.py [anos]
+import os
+import sys
+import time
+import shutil
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+from migrate_storage import migrate_to_long
+from config import BCB_INDICATOR_FREQUENCY_MAP
+
+
+def synthetic_series(frequency, years):
+    if frequency == 'daily':
+        dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    else:
+        dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=years * 12, freq='MS')
+    values = np.round(np.random.default_rng(len(dates)).normal(10, 2, len(dates)), 4)
+    return pd.DataFrame({'date': dates, 'value': values})
+
+
+def best_of(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def measure(db):
+    db.query_cache = None
+    return {
+        'Tamanho do arquivo (KB)': os.path.getsize(db.db_path) / 1024,
+        'load_data selic (ms)': best_of(lambda: db.load_data('selic')),
+        'load_data selic, último ano (ms)': best_of(
+            lambda: db.load_data('selic', str((pd.Timestamp.today() - pd.DateOffset(years=1)).date()))),
+        'get_stats (ms)': best_of(db.get_stats),
+        'get_last_dates (ms)': best_of(db.get_last_dates),
+    }
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    workdir = tempfile.mkdtemp()
+    tables_db = os.path.join(workdir, 'tables.db')
+    long_db = os.path.join(workdir, 'long.db')
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        db = DatabaseManager(tables_db, schema='tables')
+        for name, frequency in BCB_INDICATOR_FREQUENCY_MAP.items():
+            db.save_data(name, synthetic_series(frequency, years))
+        with db.connections.writer() as conn:
+            conn.execute('VACUUM')
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+        shutil.copy(tables_db, long_db)
+        migrate_to_long(long_db)
+
+        results = {'uma tabela por série': measure(DatabaseManager(tables_db)),
+                   'tabela única (long)': measure(DatabaseManager(long_db))}
+
+    print(f"{len(BCB_INDICATOR_FREQUENCY_MAP)} séries sintéticas, {years} anos\n")
+    print(pd.DataFrame(results).round(2).to_string())
@@ -0,0 +1,101 @@
+# Arquivo: benchmarks/bench_write_service.py
+# Simula várias sessões gravando ao mesmo tempo (cada uma acrescentando um mês novo
+# a uma série mensal por rodada):
+# - threads de um processo: chamadas diretas a save_data, uma transação por série,
+#   comparadas ao gravador único (write_service), que grava os pedidos simultâneos
+#   em um só commit e combina os pedidos da mesma série;
+# - vários processos (workers) no mesmo arquivo: vazão e gravações que falharam.
+#
+# Uso: python benchmarks/bench_write_service.py [rodadas por sessão]
+import os
+import sys
+import time
+import tempfile
+import threading
+import contextlib
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+from write_service import WriteService
+
+SERIES = ['ipca', 'pib', 'divida_pib', 'selic_meta', 'transacoes', 'igpm', 'inpc', 'resultado_primario']
+
+
+def run_sessions(sessions, rounds, write, same_series=False):
+    """Gravações por segundo com `sessions` threads gravando `rounds` vezes cada"""
+    history = pd.date_range('1990-01-01', periods=rounds + 420, freq='MS')
+    values = np.random.default_rng(0).normal(5, 1, len(history))
+
+    def session(index):
+        name = SERIES[0] if same_series else SERIES[index % len(SERIES)]
+        for step in range(rounds):
+            # Cada coleta traz os últimos 5 anos, com um mês novo
+            end = 420 + step
+            write(name, pd.DataFrame({'date': history[end - 60:end], 'value': values[end - 60:end]}))
+
+    threads = [threading.Thread(target=session, args=(index,)) for index in range(sessions)]
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return sessions * rounds / (time.perf_counter() - started)
+
+
+def worker_process(db_path, index, rounds, outcomes):
+    """Um worker em outro processo, com o seu próprio gravador único"""
+    from write_service import get_write_service
+    service = get_write_service(db_path=db_path)
+    saved = []
+    run_sessions(1, rounds, lambda name, df: saved.append(service.save(SERIES[index % len(SERIES)], df)))
+    outcomes.put(sum(saved))
+
+
+def new_database(workdir, label):
+    db = DatabaseManager(os.path.join(workdir, f'{label}.db'))
+    history = pd.date_range('1990-01-01', periods=420, freq='MS')
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        db.save_many({name: pd.DataFrame({'date': history, 'value': 1.0}) for name in SERIES})
+    return db
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    workdir = tempfile.mkdtemp()
+
+    print(f"{rounds} gravações por sessão (série mensal, 5 anos por coleta)\n")
+    print(f"{'sessões':>8}{'save_data direto':>20}{'gravador único':>18}{'commits':>10}")
+    for sessions in (1, 2, 4, 8):
+        direct_db = new_database(workdir, f'direct_{sessions}')
+        direct = run_sessions(sessions, rounds, direct_db.save_data)
+
+        service = WriteService(new_database(workdir, f'service_{sessions}'))
+        grouped = run_sessions(sessions, rounds, service.save)
+        service.close()
+        print(f"{sessions:>8}{direct:>14.0f} gr/s{grouped:>12.0f} gr/s{service.stats['batches']:>10}")
+
+    # Cliques simultâneos na coleta da mesma série: os pedidos pendentes viram um só
+    service = WriteService(new_database(workdir, 'coalesced'))
+    run_sessions(8, rounds, service.save, same_series=True)
+    service.close()
+    print(f"\n{'processos':>9}{'vazão':>12}{'falhas':>10}")
+    for processes in (1, 2, 4, 8):
+        db_path = new_database(workdir, f'processes_{processes}').db_path
+        outcomes = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=worker_process, args=(db_path, index, rounds, outcomes))
+                   for index in range(processes)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        saved = sum(outcomes.get() for _ in workers)
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        print(f"{processes:>9}{processes * rounds / elapsed:>7.0f} gr/s{processes * rounds - saved:>10}")
+
+    print(f"\nMesma série em 8 sessões: {service.stats['requests']} pedidos, "
+          f"{service.stats['coalesced']} combinados, {service.stats['batches']} commits")
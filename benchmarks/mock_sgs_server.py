@@ -0,0 +1,203 @@
+# Arquivo: benchmarks/mock_sgs_server.py
+# Servidor local que imita a API SGS do BCB (/dados/serie/bcdata.sgs.{id}/dados),
+# para exercitar o BCBDataCollector sem acesso à internet.
+#
+# Uso:
+#   python benchmarks/mock_sgs_server.py --port 8765 --latency 0.2 --error-rate 0.05
+#   python benchmarks/mock_sgs_server.py --record fixtures/   # grava respostas reais para replay
+#   python benchmarks/mock_sgs_server.py --fixtures fixtures/ # serve as respostas gravadas
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import BCB_INDICATOR_SERIES_MAP, BCB_INDICATOR_FREQUENCY_MAP
+
+SERIES_PATH = re.compile(r'^/dados/serie/bcdata\.sgs\.(\d+)/dados$')
+SERIES_FREQUENCY = {serie_id: BCB_INDICATOR_FREQUENCY_MAP.get(name, 'monthly')
+                    for name, serie_id in BCB_INDICATOR_SERIES_MAP.items()}
+
+
+def synthetic_payload(serie_id, start, end, rows=None):
+    """
+    Gera uma resposta sintética no formato da API SGS
+
+    Séries diárias têm um registro por dia útil; as demais, um por mês. Com `rows`,
+    o número de registros é fixo (terminando em `end`), independente do período.
+    """
+    frequency = SERIES_FREQUENCY.get(serie_id, 'monthly')
+    rng = random.Random(serie_id)
+    dates = []
+    current = end
+    while (rows is None and current >= start) or (rows is not None and len(dates) < rows):
+        if frequency != 'daily' or current.weekday() < 5:
+            dates.append(current)
+        if frequency == 'daily':
+            current -= timedelta(days=1)
+        else:
+            current = (current.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+    level = rng.uniform(1, 100)
+    records = []
+    for date in reversed(dates):
+        level = max(0.01, level + rng.gauss(0, level * 0.01))
+        records.append({'data': date.strftime('%d/%m/%Y'), 'valor': f"{level:.4f}"})
+    return json.dumps(records, separators=(',', ':')).encode('utf-8')
+
+
+class MockSGSServer:
+    """
+    Servidor SGS local, em uma thread
+
+    Args:
+        port: Porta (0 escolhe uma livre)
+        latency: Latência média de cada resposta, em segundos
+        jitter: Variação máxima (±) somada à latência
+        error_rate: Probabilidade de responder HTTP 503
+        rows: Número fixo de registros por resposta (None: proporcional ao período)
+        fixtures_dir: Pasta com respostas gravadas ({serie_id}.json) para replay
+    """
+
+    def __init__(self, port=0, latency=0.0, jitter=0.0, error_rate=0.0, rows=None, fixtures_dir=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rows = rows
+        self.fixtures_dir = fixtures_dir
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """URL base equivalente a BCB_API_BASE_URL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/dados/serie/bcdata.sgs"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def payload(self, serie_id, query):
+        """Corpo da resposta: fixture gravada, se houver, ou dados sintéticos"""
+        if self.fixtures_dir:
+            path = os.path.join(self.fixtures_dir, f"{serie_id}.json")
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+
+        end = _parse_date(query.get('dataFinal'), datetime.now())
+        start = _parse_date(query.get('dataInicial'), end - timedelta(days=365 * 10))
+        return synthetic_payload(serie_id, start, end, self.rows)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                match = SERIES_PATH.match(url.path)
+                with server._lock:
+                    server.requests += 1
+
+                delay = server.latency + random.uniform(-server.jitter, server.jitter)
+                if delay > 0:
+                    time.sleep(delay)
+
+                if not match:
+                    self.send_error(404)
+                    return
+                if random.random() < server.error_rate:
+                    with server._lock:
+                        server.errors += 1
+                    self.send_error(503)
+                    return
+
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                body = server.payload(int(match.group(1)), query)
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _parse_date(value, default):
+    return datetime.strptime(value, '%d/%m/%Y') if value else default
+
+
+def record_fixtures(fixtures_dir, last_n_years=10):
+    """Grava as respostas reais da API para cada série configurada ({serie_id}.json)"""
+    import requests
+    from config import BCB_API_BASE_URL
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    start = (datetime.now() - timedelta(days=365 * last_n_years)).strftime('%d/%m/%Y')
+    for name, serie_id in BCB_INDICATOR_SERIES_MAP.items():
+        url = f"{BCB_API_BASE_URL}.{serie_id}/dados?formato=json&dataInicial={start}"
+        response = requests.get(url, timeout=(5, 60))
+        response.raise_for_status()
+        with open(os.path.join(fixtures_dir, f"{serie_id}.json"), 'wb') as f:
+            f.write(response.content)
+        print(f"Gravado {name} ({serie_id}): {len(response.content) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API SGS do BCB")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="latência média (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="variação da latência (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fração de respostas 503")
+    parser.add_argument('--rows', type=int, default=None, help="registros fixos por resposta")
+    parser.add_argument('--fixtures', default=None, help="pasta com respostas gravadas")
+    parser.add_argument('--record', default=None, help="grava respostas reais nesta pasta e sai")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record)
+        sys.exit(0)
+
+    server = MockSGSServer(args.port, args.latency, args.jitter, args.error_rate, args.rows, args.fixtures)
+    print(f"Servidor SGS local em {server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
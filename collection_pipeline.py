@@ -0,0 +1,186 @@
+# Arquivo: collection_pipeline.py
+import os
+import time
+import socket
+import threading
+from queue import Queue, Empty, Full
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from config import DATABASE_NAME, BCB_PIPELINE_QUEUE_SIZE, COLLECTION_LEASE_SECONDS
+from connection_manager import get_connection_manager
+from write_service import get_write_service
+
+# Sinal de fim da fila para a etapa de gravação
+_DONE = object()
+
+# Intervalo (s) em que um produtor bloqueado na fila cheia verifica se a gravação parou
+_PUT_POLL_SECONDS = 0.5
+
+
+def _put(queue, item, writer_stopped):
+    """
+    Entrega um item à etapa de gravação, bloqueando enquanto a fila estiver cheia
+    (o que limita as séries em memória)
+
+    Raises:
+        RuntimeError: a etapa de gravação parou e a fila não vai mais esvaziar
+    """
+    while not writer_stopped.is_set():
+        try:
+            queue.put(item, timeout=_PUT_POLL_SECONDS)
+            return
+        except Full:
+            continue
+    raise RuntimeError("A etapa de gravação foi interrompida")
+
+
+def _download(collector, queue, writer_stopped, indicator, start_date, end_date):
+    """Etapa de download: baixa uma série e a entrega à etapa de gravação"""
+    df = collector.collect_indicator(indicator, start_date, end_date)
+    if df is not None:
+        _put(queue, (indicator, df), writer_stopped)
+
+
+def _write(service, queue, results, only_changed, write_times, stopped):
+    """
+    Etapa de gravação: entrega ao gravador único todas as séries que já chegaram
+    na fila, que são gravadas no mesmo commit
+
+    Se a etapa parar por um erro inesperado, sinaliza stopped e esvazia a fila, para
+    que os downloads bloqueados nela falhem em vez de esperar para sempre.
+    """
+    try:
+        done = False
+        while not done:
+            items = [queue.get()]
+            while True:
+                try:
+                    items.append(queue.get_nowait())
+                except Empty:
+                    break
+            done = any(item is _DONE for item in items)
+            batch = [item for item in items if item is not _DONE]
+            del items
+
+            started = time.perf_counter()
+            futures = {}
+            for indicator, df in batch:
+                try:
+                    futures[indicator] = service.submit(indicator, df, only_changed)
+                except Exception as e:
+                    print(f"Erro ao salvar dados para {indicator}: {e}")
+                    results[indicator] = False
+            for indicator, future in futures.items():
+                try:
+                    results[indicator] = future.result()
+                except Exception as e:
+                    print(f"Erro ao salvar dados para {indicator}: {e}")
+                    results[indicator] = False
+                finally:
+                    write_times[indicator] = time.perf_counter() - started
+            del batch, futures
+    except Exception as e:
+        print(f"Erro na etapa de gravação: {e}")
+    finally:
+        stopped.set()
+        while True:
+            try:
+                queue.get_nowait()
+            except Empty:
+                break
+
+
+def collect_and_save(collector, db, date_ranges, max_workers=None,
+                     queue_size=BCB_PIPELINE_QUEUE_SIZE, only_changed=True):
+    """
+    Coleta e grava as séries em pipeline (produtor/consumidor)
+
+    Os downloads rodam em paralelo e cada série é entregue, por uma fila limitada,
+    ao gravador único do processo (write_service) assim que chega; as séries que
+    chegam juntas são gravadas no mesmo commit. Rede e disco trabalham ao mesmo
+    tempo, e no máximo max_workers + queue_size séries ficam em memória.
+
+    Args:
+        collector: BCBDataCollector
+        db: DatabaseManager
+        date_ranges: Dict {indicador: (início, fim)} (ex.: collector.full_date_ranges())
+        max_workers: Número de séries baixadas em paralelo (padrão: collector.max_workers)
+        queue_size: Número máximo de séries aguardando gravação
+        only_changed: Se False, reprocessa todas as linhas coletadas (ver DatabaseManager.save_data)
+
+    Returns:
+        Dict {indicador: True/False} com o resultado da gravação de cada série coletada
+    """
+    workers = max(1, min(max_workers or collector.max_workers, len(date_ranges) or 1))
+    queue = Queue(maxsize=max(1, queue_size))
+    results = {}
+    write_times = {}
+
+    collector.timings = {}
+    collector.outcomes = {}
+
+    started = time.perf_counter()
+    service = get_write_service(db)
+    writer_stopped = threading.Event()
+    writer = threading.Thread(target=_write, args=(service, queue, results, only_changed, write_times,
+                                                   writer_stopped))
+    writer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_download, collector, queue, writer_stopped, indicator, start_date, end_date)
+                       for indicator, (start_date, end_date) in date_ranges.items()]
+            for future in futures:
+                future.result()
+    finally:
+        try:
+            _put(queue, _DONE, writer_stopped)
+        except RuntimeError:
+            pass
+        writer.join()
+
+    elapsed = time.perf_counter() - started
+    print(f"Pipeline concluído em {elapsed:.2f}s "
+          f"(rede: {sum(collector.timings.values()):.2f}s, disco: {sum(write_times.values()):.2f}s somados)")
+
+    return {indicator: results[indicator] for indicator in date_ranges if indicator in results}
+
+
+LEASE_TABLE = 'collection_lease'
+
+
+@contextmanager
+def collection_lease(db_path=DATABASE_NAME, ttl_seconds=COLLECTION_LEASE_SECONDS):
+    """
+    Reserva exclusiva da coleta entre processos (workers do Streamlit e agendador)
+
+    Só um processo coleta por vez: os demais recebem False e não disparam outra
+    coleta das mesmas séries. A reserva vence após ttl_seconds, caso o processo que
+    a detém termine sem liberá-la.
+
+    Yields:
+        True se a reserva foi obtida
+    """
+    connections = get_connection_manager(db_path)
+    owner = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    now = time.time()
+    with connections.writer() as conn:
+        conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {LEASE_TABLE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        ''')
+        cursor = conn.execute(f'''
+        INSERT INTO {LEASE_TABLE} (id, owner, expires_at) VALUES (1, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+        WHERE {LEASE_TABLE}.expires_at < ?
+        ''', (owner, now + ttl_seconds, now))
+        acquired = cursor.rowcount == 1
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connections.writer() as conn:
+                conn.execute(f"DELETE FROM {LEASE_TABLE} WHERE id = 1 AND owner = ?", (owner,))
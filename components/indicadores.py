@@ -1,18 +1,14 @@
-from database_manager import DatabaseManager
+from database_manager import get_database_manager
+from series_catalog import get_catalog
 
-indicator_names = {
-    'ipca': 'Inflação (IPCA)',
-    'pib': 'PIB Real',
-    'divida_pib': 'Dívida/PIB',
-    'selic': 'Taxa SELIC Diária',
-    'selic_meta': 'Meta da Taxa SELIC',
-    'transacoes': 'Saldo em Transações Correntes',
-    'cambio_dolar': 'Taxa de Câmbio do Dólar Diária',
-    'igpm': 'Índice geral de preços do mercado (IGP-M)',
-    'inpc': 'Índice nacional de preços ao consumidor (INPC)',
-    'resultado_primario': 'Resultado Primário'
-}
+def get_indicator_names():
+    """Nomes de exibição de todas as séries do catálogo ({nome: rótulo})"""
+    return get_catalog().labels()
 
-def load_data(table_name, start_date=None, end_date=None):
-    db_manager = DatabaseManager()
-    return db_manager.load_data(table_name, start_date, end_date)
\ No newline at end of file
+def load_data(table_name, start_date=None, end_date=None, columns=None, resolution=None):
+    db_manager = get_database_manager()
+    return db_manager.load_data(table_name, start_date, end_date, columns, resolution)
+
+def load_many(indicators, start_date=None, end_date=None, freq=None):
+    db_manager = get_database_manager()
+    return db_manager.load_many(indicators, start_date, end_date, freq)
\ No newline at end of file
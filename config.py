@@ -1,8 +1,47 @@
-
 # Configurações da API do Banco Central do Brasil
 BCB_API_BASE_URL = "https://api.bcb.gov.br/dados/serie/bcdata.sgs"
 
+# Número de séries baixadas em paralelo (1 = coleta sequencial)
+BCB_MAX_WORKERS = 8
+
+# Número máximo de séries baixadas aguardando gravação no banco (coleta em pipeline)
+BCB_PIPELINE_QUEUE_SIZE = 4
+
+# Janela (em dias) recoletada antes da última data salva, para capturar revisões
+BCB_REVISION_OVERLAP_DAYS = 60
+
+# Carga histórica completa: séries longas são baixadas em janelas de tamanho fixo
+BCB_BACKFILL_START_DATE = '01/01/1980'
+BCB_BACKFILL_WINDOW_YEARS = 5
+BCB_BACKFILL_CHECKPOINT_DIR = '.backfill'
+
+# Resiliência do cliente HTTP: timeouts (s), novas tentativas com backoff exponencial,
+# limite global de requisições por segundo e disjuntor por endpoint
+BCB_CONNECT_TIMEOUT = 5
+BCB_READ_TIMEOUT = 30
+BCB_MAX_RETRIES = 3
+BCB_BACKOFF_BASE_SECONDS = 0.5
+BCB_BACKOFF_MAX_SECONDS = 10
+BCB_RATE_LIMIT_PER_SECOND = 10
+BCB_CIRCUIT_FAILURE_THRESHOLD = 5
+BCB_CIRCUIT_RESET_SECONDS = 60
+
+# Agendador de coleta em segundo plano (python scheduler.py): séries diárias são
+# atualizadas a cada dia útil; as demais, diariamente dentro da janela de divulgação
+# (dias do mês) até chegar um período novo, e então só na janela do mês seguinte
+SCHEDULER_POLL_SECONDS = 60                 # intervalo máximo entre verificações das séries vencidas
+SCHEDULER_MAX_CONCURRENT = 4                # séries baixadas ao mesmo tempo
+SCHEDULER_RUN_HOUR = 19                     # hora local das coletas agendadas
+SCHEDULER_JITTER_SECONDS = 15 * 60          # atraso aleatório (0 a N s) somado a cada agendamento
+SCHEDULER_RETRY_SECONDS = 30 * 60           # nova tentativa após falha de coleta ou gravação
+SCHEDULER_RELEASE_WINDOWS = {'monthly': (1, 20), 'quarterly': (1, 20), 'yearly': (1, 20)}
+SCHEDULER_RELEASE_WINDOW_OVERRIDES = {'igpm': (25, 31)}   # IGP-M sai no fim do próprio mês
+
+# Tamanho (em bytes) das partes lidas ao decodificar respostas sem cache
+BCB_STREAM_CHUNK_SIZE = 64 * 1024
+
 # Mapeamento de indicadores do BCB e suas séries
+# (catálogo inicial; outras séries podem ser importadas com python series_catalog.py arquivo.csv)
 BCB_INDICATOR_SERIES_MAP = {
     'ipca': 433,           # Inflação: IPCA
     'pib': 4380,           # Atividade Econômica: PIB Real
@@ -16,5 +55,132 @@ BCB_INDICATOR_SERIES_MAP = {
     'resultado_primario': 7547 # Indicadores Fiscais: Resultado Primário
 }
 
+# Nome de exibição de cada série
+BCB_INDICATOR_LABELS = {
+    'ipca': 'Inflação (IPCA)',
+    'pib': 'PIB Real',
+    'divida_pib': 'Dívida/PIB',
+    'selic': 'Taxa SELIC Diária',
+    'selic_meta': 'Meta da Taxa SELIC',
+    'transacoes': 'Saldo em Transações Correntes',
+    'cambio_dolar': 'Taxa de Câmbio do Dólar Diária',
+    'igpm': 'Índice geral de preços do mercado (IGP-M)',
+    'inpc': 'Índice nacional de preços ao consumidor (INPC)',
+    'resultado_primario': 'Resultado Primário'
+}
+
+# Unidade de medida de cada série
+BCB_INDICATOR_UNIT_MAP = {
+    'ipca': '% a.m.',
+    'pib': 'R$ milhões',
+    'divida_pib': '% do PIB',
+    'selic': '% a.d.',
+    'selic_meta': '% a.a.',
+    'transacoes': 'US$ milhões',
+    'cambio_dolar': 'R$/US$',
+    'igpm': '% a.m.',
+    'inpc': '% a.m.',
+    'resultado_primario': 'R$ milhões'
+}
+
+# Frequência de publicação de cada série
+BCB_INDICATOR_FREQUENCY_MAP = {
+    'ipca': 'monthly',
+    'pib': 'monthly',
+    'divida_pib': 'monthly',
+    'selic': 'daily',
+    'selic_meta': 'monthly',
+    'transacoes': 'monthly',
+    'cambio_dolar': 'daily',
+    'igpm': 'monthly',
+    'inpc': 'monthly',
+    'resultado_primario': 'monthly'
+}
+
+# Cache em disco das respostas da API (tempo de validade por frequência, em segundos)
+BCB_CACHE_ENABLED = True
+BCB_CACHE_DIR = '.cache/sgs'
+BCB_CACHE_TTL_SECONDS = {
+    'daily': 6 * 3600,
+    'monthly': 24 * 3600,
+    'quarterly': 3 * 24 * 3600,
+    'yearly': 7 * 24 * 3600
+}
+# Limites da pasta do cache: idade máxima das entradas (s) e tamanho total (bytes)
+BCB_CACHE_MAX_AGE_SECONDS = 30 * 24 * 3600
+BCB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 # Configurações do Banco de Dados
-DATABASE_NAME = 'economic_data.db'
\ No newline at end of file
+DATABASE_NAME = 'economic_data.db'
+
+# Layout de armazenamento para bancos novos:
+#   'tables' - uma tabela por série (padrão)
+#   'long'   - tabela única de observações WITHOUT ROWID, chave (series_id, data como inteiro)
+# Bancos existentes são detectados automaticamente; para converter um banco já criado,
+# use python migrate_storage.py
+DATABASE_SCHEMA = 'tables'
+
+# Conexões persistentes: tamanho do pool de leitura e PRAGMAs aplicados a toda conexão
+DATABASE_READER_POOL_SIZE = 4
+DATABASE_PRAGMAS = {
+    'journal_mode': 'WAL',          # leituras não bloqueiam a gravação
+    'synchronous': 'NORMAL',        # seguro com WAL e bem mais rápido que FULL
+    'foreign_keys': 'ON',
+    'busy_timeout': 5000,           # ms de espera por um lock antes de falhar
+    'cache_size': -64000,           # cache de páginas de ~64 MB por conexão
+    'mmap_size': 256 * 1024 * 1024, # leitura do arquivo mapeada em memória
+    'temp_store': 'MEMORY',
+}
+
+# Gravador único por processo (write_service.py): pedidos pendentes são gravados em
+# lotes de até WRITE_BATCH_MAX_SERIES séries por transação, esperando até
+# WRITE_BATCH_MAX_DELAY_SECONDS por pedidos simultâneos
+WRITE_BATCH_MAX_SERIES = 16
+WRITE_BATCH_MAX_DELAY_SECONDS = 0
+
+# Coleta exclusiva entre processos: validade (s) da reserva de quem está coletando
+COLLECTION_LEASE_SECONDS = 15 * 60
+
+# Cache em disco dos modelos Prophet ajustados (chave: hash do histórico + configuração
+# do modelo); os modelos usados há mais tempo são removidos acima de MODEL_CACHE_MAX_BYTES
+MODEL_CACHE_ENABLED = True
+MODEL_CACHE_DIR = '.cache/models'
+MODEL_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MODEL_CACHE_MEMORY_ENTRIES = 8
+
+# Previsão em lote (ml_core/batch_forecast.py): horizontes padrão (meses), processos
+# (None = núcleos disponíveis) e tempo máximo (s) da previsão de cada série
+BATCH_FORECAST_HORIZONS = (6, 12, 24)
+BATCH_FORECAST_MAX_WORKERS = None
+BATCH_FORECAST_TIMEOUT_SECONDS = 5 * 60
+
+# Previsão rápida em NumPy (ml_core/fast_forecast.py): método padrão ('ets',
+# 'seasonal_naive' ou 'ar'), cobertura do intervalo e máximo de pontos usados
+FAST_FORECAST_METHOD = 'ets'
+FAST_FORECAST_INTERVAL_WIDTH = 0.8
+FAST_FORECAST_MAX_HISTORY = 240
+
+# Pré-processamento das previsões (ml_core/preprocessing.py): frequência da previsão
+# (séries mais finas são agregadas a ela antes do ajuste) e máximo de pontos mais
+# recentes usados no ajuste, por frequência
+FORECAST_FREQUENCY = 'monthly'
+FORECAST_MAX_HISTORY = {
+    'monthly': 240,
+    'quarterly': 120,
+    'yearly': 60
+}
+
+# Backtest com origem móvel (ml_core/backtesting.py): períodos previstos por dobra,
+# número de dobras, distância entre cortes (em períodos), mínimo de pontos antes do
+# primeiro corte e processos usados nas dobras do Prophet (None = núcleos disponíveis)
+BACKTEST_HORIZON = 12
+BACKTEST_FOLDS = 8
+BACKTEST_STEP = 3
+BACKTEST_MIN_TRAIN = 36
+BACKTEST_MAX_WORKERS = None
+
+# Cache em memória das leituras de séries (invalidado a cada gravação da série, em
+# qualquer processo)
+QUERY_CACHE_ENABLED = True
+QUERY_CACHE_MAX_ENTRIES = 256
+QUERY_CACHE_MAX_BYTES = 64 * 1024 * 1024
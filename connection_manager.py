@@ -0,0 +1,106 @@
+# Arquivo: connection_manager.py
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from config import DATABASE_NAME, DATABASE_READER_POOL_SIZE, DATABASE_PRAGMAS
+
+
+class ConnectionManager:
+    """
+    Conexões SQLite persistentes de um arquivo de banco de dados
+
+    Leituras usam um pool de conexões reaproveitadas; gravações passam por uma única
+    conexão de escrita, protegida por lock (o SQLite admite um escritor por vez).
+    Todas as conexões recebem os mesmos PRAGMAs de DATABASE_PRAGMAS.
+    """
+
+    def __init__(self, db_path=DATABASE_NAME, pool_size=DATABASE_READER_POOL_SIZE, pragmas=None):
+        self.db_path = db_path
+        self.pragmas = dict(DATABASE_PRAGMAS if pragmas is None else pragmas)
+        self._readers = queue.LifoQueue(maxsize=pool_size)
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._watcher = None
+        self._watch_lock = threading.Lock()
+
+    def _connect(self):
+        """Abre uma conexão (utilizável entre threads) e aplica o perfil de PRAGMAs"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Empresta uma conexão de leitura do pool (criada sob demanda)"""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def writer(self):
+        """
+        Conexão de escrita exclusiva: confirma a transação ao sair do bloco
+        e a desfaz se houver exceção
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def data_version(self):
+        """
+        Contador de alterações do arquivo (PRAGMA data_version), lido sempre da mesma
+        conexão dedicada: muda a cada transação confirmada por qualquer outra conexão,
+        deste ou de outro processo
+        """
+        with self._watch_lock:
+            if self._watcher is None:
+                self._watcher = self._connect()
+            return self._watcher.execute('PRAGMA data_version').fetchone()[0]
+
+    def close(self):
+        """Fecha todas as conexões abertas (o gerenciador continua utilizável)"""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._watch_lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path=DATABASE_NAME):
+    """Gerenciador de conexões compartilhado (um por arquivo de banco de dados no processo)"""
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = ConnectionManager(db_path)
+        return _managers[key]
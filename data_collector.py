@@ -4,12 +4,51 @@ import pandas as pd
 import json
 from datetime import datetime, timedelta
 import time
-from config import BCB_API_BASE_URL, BCB_INDICATOR_SERIES_MAP
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from config import (BCB_API_BASE_URL, BCB_MAX_WORKERS, BCB_REVISION_OVERLAP_DAYS,
+                    BCB_BACKFILL_START_DATE, BCB_BACKFILL_WINDOW_YEARS, BCB_BACKFILL_CHECKPOINT_DIR,
+                    BCB_CACHE_ENABLED, BCB_STREAM_CHUNK_SIZE)
+from series_catalog import get_catalog
+from response_cache import ResponseCache
+from bcb_client import BCBClient, CircuitOpenError
+from sgs_parser import parse_sgs_payload, parse_sgs_stream
 
 class BCBDataCollector:
-    def __init__(self):
-        self.base_url = BCB_API_BASE_URL 
-        self.indicators = BCB_INDICATOR_SERIES_MAP 
+    def __init__(self, max_workers=BCB_MAX_WORKERS, use_cache=BCB_CACHE_ENABLED, base_url=BCB_API_BASE_URL,
+                 catalog=None):
+        self.base_url = base_url
+        
+        # Séries a coletar, resolvidas pelo catálogo de séries
+        catalog = catalog or get_catalog()
+        self.indicators = catalog.series_map()
+        self.frequencies = catalog.frequency_map()
+        self.max_workers = max(1, max_workers)
+        
+        # Cache em disco das respostas (None desativa)
+        self.cache = ResponseCache() if use_cache else None
+        
+        # Sessão compartilhada: reaproveita conexões TLS entre as requisições
+        self.session = self._create_session(self.max_workers)
+        
+        # Cliente com timeouts, novas tentativas, limite de taxa e disjuntor por endpoint
+        self.client = BCBClient(self.session)
+        
+        # Tempo (em segundos) gasto em cada série na última coleta
+        self.timings = {}
+        
+        # Resultado estruturado de cada série na última coleta
+        # ({'status', 'rows', 'elapsed', 'attempts', 'error'})
+        self.outcomes = {}
+    
+    def _create_session(self, pool_size):
+        """Cria uma sessão HTTP com pool de conexões dimensionado para os workers"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
         
     def get_data(self, indicator, start_date=None, end_date=None):
         """
@@ -27,6 +66,26 @@ class BCBDataCollector:
             print(f"Indicador '{indicator}' não reconhecido")
             return None
         
+        try:
+            df = self._request_data(indicator, start_date, end_date)
+            if df is None:
+                print(f"Nenhum dado retornado para o indicador '{indicator}'")
+            return df
+                
+        except requests.exceptions.RequestException as e:
+            print(f"Erro ao acessar a API para o indicador '{indicator}': {e}")
+            return None
+    
+    def _request_data(self, indicator, start_date=None, end_date=None):
+        """
+        Baixa os dados de um indicador, propagando os erros de rede
+        
+        Returns:
+            DataFrame com os dados do indicador, ou None se a série vier vazia
+        
+        Raises:
+            requests.exceptions.RequestException: falha após todas as tentativas
+        """
         # Construir URL
         serie_id = self.indicators[indicator]
         url = f"{self.base_url}.{serie_id}/dados?formato=json"
@@ -37,70 +96,313 @@ class BCBDataCollector:
         if end_date:
             url += f"&dataFinal={end_date}"
         
+        # Fazer requisição à API (ou reaproveitar a resposta em cache) e converter
+        # o JSON diretamente em arrays tipados (datetime64 / float64)
+        dates, values = self._fetch(serie_id, url, indicator, start_date, end_date)
+        
+        if not len(dates):
+            return None
+        
+        # Converter para DataFrame no padrão de colunas do projeto
+        df = pd.DataFrame({'date': dates, 'value': values})
+        
+        # Adicionar coluna com nome do indicador
+        df['indicator'] = indicator
+        
+        return df
+    
+    def _fetch(self, serie_id, url, indicator, start_date, end_date):
+        """
+        Obtém os dados da API como arrays (datas, valores), usando o cache em disco quando possível
+        
+        Entradas dentro do TTL são servidas sem acesso à rede; entradas vencidas são
+        revalidadas com cabeçalhos condicionais (ETag / Last-Modified). Sem cache, a
+        resposta é decodificada em partes, à medida que chega.
+        """
+        if self.cache is None:
+            with self.client.get(url, stream=True) as response:
+                return parse_sgs_stream(response.iter_content(chunk_size=BCB_STREAM_CHUNK_SIZE))
+        
+        entry = self.cache.get(serie_id, start_date, end_date)
+        if entry is not None and self.cache.is_fresh(entry, self.frequencies.get(indicator)):
+            self.cache.record('hits')
+            return self._cached_arrays(entry, start_date)
+        
+        headers = self.cache.validators(entry) if entry is not None else {}
+        response = self.client.get(url, headers=headers)
+        
+        if response.status_code == 304 and entry is not None:
+            self.cache.record('revalidated')
+            self.cache.touch(serie_id, start_date, end_date, entry)
+            return self._cached_arrays(entry, start_date)
+        
+        self.cache.record('misses')
+        self.cache.put(serie_id, start_date, end_date, response.content,
+                       etag=response.headers.get('ETag'),
+                       last_modified=response.headers.get('Last-Modified'))
+        return parse_sgs_payload(response.content)
+    
+    def _cached_arrays(self, entry, start_date):
+        """Arrays de uma entrada do cache, sem as datas anteriores à janela pedida"""
+        dates, values = parse_sgs_payload(entry['body'])
+        # Entradas em aberto podem ter começado antes da data inicial pedida
+        if start_date and entry.get('start_date') != start_date:
+            keep = dates >= pd.to_datetime(start_date, format='%d/%m/%Y').to_datetime64().astype('datetime64[D]')
+            dates, values = dates[keep], values[keep]
+        return dates, values
+    
+    def collect_indicator(self, indicator, start_date, end_date):
+        """Coleta um indicador, registrando o resultado estruturado e o tempo gasto"""
+        outcome = {'status': 'ok', 'rows': 0, 'elapsed': 0.0, 'attempts': 0, 'error': None}
+        self.client.reset_attempts()
+        started = time.perf_counter()
+        df = None
         try:
-            # Fazer requisição à API
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            # Converter resposta para JSON
-            data = response.json()
-            
-            if data:
-                # Converter para DataFrame
-                df = pd.DataFrame(data)
-                
-                # Renomear colunas para padrão
-                df.rename(columns={
-                    'data': 'date',
-                    'valor': 'value'
-                }, inplace=True)
-                
-                # Converter data para datetime
-                df['date'] = pd.to_datetime(df['date'], format='%d/%m/%Y')
-                
-                # Adicionar coluna com nome do indicador
-                df['indicator'] = indicator
-                
-                return df
+            df = self._request_data(indicator, start_date, end_date)
+            if df is None:
+                outcome['status'] = 'empty'
             else:
-                print(f"Nenhum dado retornado para o indicador '{indicator}'")
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Erro ao acessar a API para o indicador '{indicator}': {e}")
-            return None
+                outcome['rows'] = len(df)
+        except CircuitOpenError as e:
+            outcome['status'] = 'circuit_open'
+            outcome['error'] = str(e)
+        except Exception as e:
+            outcome['status'] = 'error'
+            outcome['error'] = str(e)
+        finally:
+            outcome['elapsed'] = time.perf_counter() - started
+            outcome['attempts'] = self.client.last_attempts
+            self.timings[indicator] = outcome['elapsed']
+            self.outcomes[indicator] = outcome
+        return df
     
-    def collect_all_data(self, last_n_years=5):
+    def collect_all_data(self, last_n_years=5, max_workers=None, return_timings=False):
         """
         Coletar dados de todos os indicadores
         
         Args:
             last_n_years: Número de anos retroativos para coletar dados
+            max_workers: Número de séries baixadas em paralelo (padrão: self.max_workers)
+            return_timings: Se True, retorna também o tempo gasto em cada série
         
         Returns:
             Dict com DataFrames para cada indicador
+            (ou tupla (dados, tempos) quando return_timings=True)
         """
+        date_ranges = self.full_date_ranges(last_n_years)
+        return self._collect(date_ranges, max_workers, return_timings)
+    
+    def full_date_ranges(self, last_n_years=5):
+        """Período de coleta ({indicador: (início, fim)}) dos últimos last_n_years anos"""
         # Calcular datas
         end_date = datetime.now().strftime('%d/%m/%Y')
         start_date = (datetime.now() - timedelta(days=365 * last_n_years)).strftime('%d/%m/%Y')
         
+        return {indicator: (start_date, end_date) for indicator in self.indicators}
+    
+    def collect_incremental_data(self, last_dates, overlap_days=BCB_REVISION_OVERLAP_DAYS,
+                                 last_n_years=5, max_workers=None, return_timings=False):
+        """
+        Coletar apenas os dados novos de cada indicador, a partir da última data salva
+        
+        Args:
+            last_dates: Dict {indicador: última data salva} (ex.: DatabaseManager.get_last_dates())
+            overlap_days: Dias recoletados antes da última data, para capturar revisões
+            last_n_years: Anos coletados para indicadores ainda sem dados salvos
+            max_workers: Número de séries baixadas em paralelo (padrão: self.max_workers)
+            return_timings: Se True, retorna também o tempo gasto em cada série
+        
+        Returns:
+            Dict com DataFrames para cada indicador
+            (ou tupla (dados, tempos) quando return_timings=True)
+        """
+        date_ranges = self.incremental_date_ranges(last_dates, overlap_days, last_n_years)
+        return self._collect(date_ranges, max_workers, return_timings)
+    
+    def incremental_date_ranges(self, last_dates, overlap_days=BCB_REVISION_OVERLAP_DAYS, last_n_years=5):
+        """Período de coleta ({indicador: (início, fim)}) a partir da última data salva"""
+        now = datetime.now()
+        end_date = now.strftime('%d/%m/%Y')
+        default_start = now - timedelta(days=365 * last_n_years)
+        
+        date_ranges = {}
+        for indicator in self.indicators:
+            last_date = last_dates.get(indicator)
+            if last_date is not None:
+                start = pd.to_datetime(last_date) - timedelta(days=overlap_days)
+            else:
+                start = default_start
+            date_ranges[indicator] = (start.strftime('%d/%m/%Y'), end_date)
+        
+        return date_ranges
+    
+    def _collect(self, date_ranges, max_workers=None, return_timings=False):
+        """Coleta os indicadores de date_ranges ({indicador: (início, fim)}) em paralelo"""
+        workers = max(1, min(max_workers or self.max_workers, len(date_ranges)))
+        
         results = {}
+        self.timings = {}
+        self.outcomes = {}
         
-        # Coletar dados para cada indicador
-        for indicator in self.indicators.keys():
-            print(f"Coletando dados para {indicator}...")
-            try:
-                df = self.get_data(indicator, start_date, end_date)
+        # Coletar dados para cada indicador em paralelo, compartilhando a sessão
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for indicator, (start_date, end_date) in date_ranges.items():
+                print(f"Coletando dados para {indicator}...")
+                future = executor.submit(self.collect_indicator, indicator, start_date, end_date)
+                futures[future] = indicator
+            
+            for future in as_completed(futures):
+                indicator = futures[future]
+                df = future.result()
+                outcome = self.outcomes[indicator]
                 
-                if df is not None and not df.empty:
-                    print(f"Coletados {len(df)} registros para {indicator}")
+                if outcome['status'] == 'ok':
+                    print(f"Coletados {len(df)} registros para {indicator} "
+                          f"em {outcome['elapsed']:.2f}s ({outcome['attempts']} tentativa(s))")
                     results[indicator] = df
-                else:
+                elif outcome['status'] == 'empty':
                     print(f"Nenhum dado retornado para {indicator}")
-            except Exception as e:
-                print(f"Erro ao coletar dados para {indicator}: {e}")
+                else:
+                    print(f"Erro ao coletar dados para {indicator}: {outcome['error']}")
+        
+        # Manter a ordem original dos indicadores no resultado
+        results = {indicator: results[indicator] for indicator in date_ranges if indicator in results}
         
+        if return_timings:
+            return results, dict(self.timings)
         return results
+    
+    def backfill(self, indicator, start_date=BCB_BACKFILL_START_DATE, end_date=None,
+                 window_years=BCB_BACKFILL_WINDOW_YEARS, checkpoint_dir=BCB_BACKFILL_CHECKPOINT_DIR,
+                 max_workers=None):
+        """
+        Carga histórica completa de um indicador, em janelas de tamanho fixo
+        
+        As janelas são baixadas em paralelo e cada janela concluída é salva como
+        checkpoint em disco, de modo que uma carga interrompida retoma de onde parou.
+        
+        Args:
+            indicator: Nome do indicador
+            start_date: Data inicial (formato 'DD/MM/AAAA')
+            end_date: Data final (formato 'DD/MM/AAAA', padrão: hoje)
+            window_years: Tamanho de cada janela, em anos
+            checkpoint_dir: Pasta dos checkpoints (None desativa os checkpoints)
+            max_workers: Número de janelas baixadas em paralelo (padrão: self.max_workers)
+        
+        Returns:
+            DataFrame com a série completa, sem datas duplicadas
+        """
+        if indicator not in self.indicators:
+            print(f"Indicador '{indicator}' não reconhecido")
+            return None
+        
+        today = pd.Timestamp(datetime.now().date())
+        start = pd.to_datetime(start_date, format='%d/%m/%Y')
+        end = pd.to_datetime(end_date, format='%d/%m/%Y') if end_date else today
+        windows = self._backfill_windows(start, end, window_years)
+        
+        frames = []
+        pending = []
+        for window_start, window_end in windows:
+            checkpoint = self._checkpoint_path(checkpoint_dir, indicator, window_start, window_end)
+            if checkpoint and os.path.exists(checkpoint):
+                frames.append(pd.read_csv(checkpoint, parse_dates=['date']))
+            else:
+                pending.append((window_start, window_end))
+        
+        print(f"Carga histórica de {indicator}: {len(windows)} janelas "
+              f"({len(windows) - len(pending)} já concluídas)")
+        
+        workers = max(1, min(max_workers or self.max_workers, len(pending) or 1))
+        failed = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._backfill_window, indicator,
+                                window_start.strftime('%d/%m/%Y'),
+                                window_end.strftime('%d/%m/%Y')): (window_start, window_end)
+                for window_start, window_end in pending
+            }
+            for future in as_completed(futures):
+                window_start, window_end = futures[future]
+                status, df = future.result()
+                
+                if status == 'error':
+                    failed.append((window_start, window_end))
+                    continue
+                
+                # Janelas sem observações (por exemplo, anteriores ao início da série)
+                # também são concluídas, com um checkpoint vazio
+                if df is None:
+                    df = pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'),
+                                       'value': pd.Series(dtype='float64'),
+                                       'indicator': pd.Series(dtype=object)})
+                else:
+                    df = df[['date', 'value', 'indicator']]
+                    frames.append(df)
+                
+                # A janela que inclui hoje ainda pode receber dados, então não é marcada como concluída
+                checkpoint = self._checkpoint_path(checkpoint_dir, indicator, window_start, window_end)
+                if checkpoint and window_end < today:
+                    self._write_checkpoint(checkpoint, df)
+        
+        if failed:
+            print(f"{len(failed)} janelas de {indicator} falharam; execute novamente para retomar")
+        
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return None
+        
+        result = pd.concat(frames, ignore_index=True)
+        result = (result.drop_duplicates(subset='date', keep='last')
+                        .sort_values('date')
+                        .reset_index(drop=True))
+        result['indicator'] = indicator
+        return result
+    
+    def _backfill_window(self, indicator, start_date, end_date):
+        """
+        Baixa uma janela da carga histórica, separando janelas vazias de falhas
+        
+        Returns:
+            Tupla (status, df): ('ok', DataFrame), ('empty', None) ou ('error', None)
+        """
+        try:
+            df = self._request_data(indicator, start_date, end_date)
+        except requests.exceptions.HTTPError as e:
+            # A API responde 404 a períodos sem nenhuma observação da série
+            if e.response is not None and e.response.status_code == 404:
+                return 'empty', None
+            print(f"Erro na janela {start_date}-{end_date} de {indicator}: {e}")
+            return 'error', None
+        except Exception as e:
+            print(f"Erro na janela {start_date}-{end_date} de {indicator}: {e}")
+            return 'error', None
+        return ('empty', None) if df is None else ('ok', df)
+    
+    def _backfill_windows(self, start, end, window_years):
+        """Divide o período [start, end] em janelas consecutivas de window_years anos"""
+        windows = []
+        window_start = start
+        while window_start <= end:
+            window_end = min(window_start + pd.DateOffset(years=window_years) - pd.Timedelta(days=1), end)
+            windows.append((window_start, window_end))
+            window_start = window_end + pd.Timedelta(days=1)
+        return windows
+    
+    def _checkpoint_path(self, checkpoint_dir, indicator, window_start, window_end):
+        """Caminho do checkpoint de uma janela da carga histórica"""
+        if not checkpoint_dir:
+            return None
+        return os.path.join(checkpoint_dir, indicator,
+                            f"{window_start:%Y%m%d}_{window_end:%Y%m%d}.csv")
+    
+    def _write_checkpoint(self, path, df):
+        """Grava o checkpoint de forma atômica (arquivo temporário + rename)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
 
 
 
@@ -110,7 +412,10 @@ if __name__ == "__main__":
     collector = BCBDataCollector()
     
     # Coletar dados dos últimos 5 anos
-    data = collector.collect_all_data(last_n_years=5)
+    data, timings = collector.collect_all_data(last_n_years=5, return_timings=True)
+    print(f"Tempo total limitado pela série mais lenta: {max(timings.values(), default=0):.2f}s")
+    if collector.cache is not None:
+        print(f"Cache: {collector.cache.stats} (taxa de acerto {collector.cache.hit_rate():.0%})")
     
     # Verificar dados coletados
     for indicator, df in data.items():
@@ -1,121 +1,829 @@
 # Arquivo: database_manager.py
-import sqlite3
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine
 import os
-from datetime import datetime
-from config import DATABASE_NAME, BCB_INDICATOR_SERIES_MAP
+import time
+import threading
+from itertools import repeat
+from config import DATABASE_NAME, DATABASE_SCHEMA, QUERY_CACHE_ENABLED
+from series_catalog import get_catalog
+from connection_manager import get_connection_manager
+from query_cache import get_query_cache
+
+# Tabela única de observações do layout 'long'
+OBSERVATIONS_TABLE = 'observations'
+
+# Colunas de leitura e seu tipo no cursor, por layout
+READ_COLUMNS = {
+    'date': {'tables': 'S10', 'long': 'i8'},
+    'value': {'tables': 'f8', 'long': 'f8'},
+    'created_at': {'tables': 'S19', 'long': 'i8'},
+}
+DATETIME_UNITS = {'date': 'datetime64[D]', 'created_at': 'datetime64[s]'}
+
+# Agregados por período (início do período em dias desde 1970-01-01), nos dois layouts
+ROLLUPS_TABLE = 'series_rollups'
+ROLLUP_RESOLUTIONS = ('monthly', 'quarterly', 'yearly')
+ROLLUP_AGGREGATES = ('mean', 'last', 'min', 'max')
+
+# Ordem das frequências, da mais fina para a mais grossa (alinhamento em load_many)
+FREQUENCY_RANK = {'daily': 0, 'monthly': 1, 'quarterly': 2, 'yearly': 3}
+
+# Metadados por série (contagem, período, última gravação, hash do conteúdo)
+METADATA_TABLE = 'series_metadata'
+HASH_MASK = (1 << 64) - 1
+
+# Contagem e hash do conteúdo por série e ano: anos idênticos ao já salvo não são regravados
+CHUNKS_TABLE = 'series_chunks'
+
+# Histórico (somente inserção) dos valores substituídos por revisões, nos dois layouts
+REVISIONS_TABLE = 'series_revisions'
 
 class DatabaseManager:
-    def __init__(self, db_name=DATABASE_NAME):
-        """Inicializa o gerenciador de banco de dados SQLite"""
+    def __init__(self, db_name=DATABASE_NAME, schema=None):
+        """
+        Inicializa o gerenciador de banco de dados SQLite
+        
+        Args:
+            db_name: Arquivo do banco de dados
+            schema: Layout para um banco novo ('tables' ou 'long'; padrão: DATABASE_SCHEMA).
+                Em bancos existentes, o layout é detectado automaticamente.
+        """
         self.db_path = db_name
-        self.engine = create_engine(f'sqlite:///{db_name}')
+        is_new = not os.path.exists(db_name)
+        
+        # Conexões persistentes compartilhadas por todas as instâncias do mesmo arquivo
+        self.connections = get_connection_manager(db_name)
+        
+        # Cache das leituras de séries, também compartilhado por arquivo
+        self.query_cache = get_query_cache(db_name) if QUERY_CACHE_ENABLED else None
+        
+        # Catálogo de séries (cria o arquivo do banco e a tabela do catálogo, se preciso)
+        self.catalog = get_catalog(db_name)
+        self._known_tables = None
+        self._upsert_ready = set()
+        
+        detected = None if is_new else self._detect_schema()
+        self.schema = detected or schema or DATABASE_SCHEMA
         
-        # Criar o banco de dados se não existir
-        if not os.path.exists(db_name):
+        # Criar o banco de dados se não existir (ou se ainda não tiver séries)
+        if detected is None:
             self._create_tables()
-            self._optimize_sqlite()
+        else:
+            # Tabelas anteriores ao upsert em lote perdem as datas duplicadas antes de
+            # qualquer cálculo sobre os dados
+            known = set(self._known_tables)
+            deduplicated = self._migrate_date_indexes()
+            
+            # Bancos anteriores aos agregados e metadados: calcular a partir dos dados já salvos;
+            # nos demais, recalcular as séries que tiveram duplicatas removidas
+            if ROLLUPS_TABLE not in known:
+                self.rebuild_rollups()
+            elif deduplicated:
+                self.rebuild_rollups(deduplicated)
+            if METADATA_TABLE not in known or CHUNKS_TABLE not in known:
+                self.rebuild_metadata()
+            elif deduplicated:
+                self.rebuild_metadata(deduplicated)
+    
+    def _detect_schema(self):
+        """
+        Identifica o layout de um banco existente: 'long' se houver a tabela de
+        observações, 'tables' se houver tabelas de séries, None se não houver nenhuma
+        """
+        with self.connections.reader() as conn:
+            existing = self._existing_tables(conn.cursor())
+        
+        if OBSERVATIONS_TABLE in existing:
+            return 'long'
+        if any(name in existing for name in self.catalog.names()):
+            return 'tables'
+        return None
     
     def _create_tables(self):
-        """Cria as tabelas necessárias no banco de dados"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Indicadores do BCB
-        indicators = list(BCB_INDICATOR_SERIES_MAP.keys()) 
-        
-        for indicator in indicators:
-            cursor.execute(f'''
-            CREATE TABLE IF NOT EXISTS {indicator} (
-                id INTEGER PRIMARY KEY,
-                date DATE NOT NULL,
-                value FLOAT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            # Criar índice para a coluna de data
-            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{indicator}_date ON {indicator} (date)')
+        """Cria as tabelas de todas as séries do catálogo, em uma única transação"""
+        with self.connections.writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            if self.schema == 'long':
+                self._create_observations_table(cursor)
+            else:
+                for indicator in self.catalog.names():
+                    self._create_series_table(cursor, indicator)
+            self._create_rollups_table(cursor)
+            self._create_metadata_table(cursor)
+            self._create_chunks_table(cursor)
+            self._create_revisions_table(cursor)
+        
+        self._known_tables = None
+    
+    def _create_observations_table(self, cursor):
+        """
+        Cria a tabela única de observações (layout 'long')
+        
+        A chave primária (series_id, date) é o próprio índice da tabela (WITHOUT ROWID);
+        datas são guardadas como dias desde 1970-01-01 e created_at como timestamp Unix.
+        """
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {OBSERVATIONS_TABLE} (
+            series_id INTEGER NOT NULL,
+            date INTEGER NOT NULL,
+            value REAL NOT NULL,
+            created_at INTEGER NOT NULL,
+            PRIMARY KEY (series_id, date)
+        ) WITHOUT ROWID
+        ''')
+    
+    def _create_rollups_table(self, cursor):
+        """Cria a tabela de agregados mensais, trimestrais e anuais das séries"""
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {ROLLUPS_TABLE} (
+            series_id INTEGER NOT NULL,
+            resolution TEXT NOT NULL,
+            period INTEGER NOT NULL,
+            mean_value REAL NOT NULL,
+            last_value REAL NOT NULL,
+            min_value REAL NOT NULL,
+            max_value REAL NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (series_id, resolution, period)
+        ) WITHOUT ROWID
+        ''')
+    
+    def _create_metadata_table(self, cursor):
+        """Cria a tabela de metadados das séries, mantida pela própria gravação"""
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {METADATA_TABLE} (
+            name TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            first_date TEXT,
+            last_date TEXT,
+            last_write TIMESTAMP,
+            content_hash TEXT NOT NULL
+        )
+        ''')
+    
+    def _create_chunks_table(self, cursor):
+        """Cria a tabela de contagem e hash do conteúdo de cada ano das séries"""
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {CHUNKS_TABLE} (
+            name TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            PRIMARY KEY (name, year)
+        ) WITHOUT ROWID
+        ''')
+    
+    def _create_revisions_table(self, cursor):
+        """
+        Cria a tabela de revisões: cada linha é um valor que vigorou de recorded_at
+        até superseded_at (timestamps Unix), quando foi substituído
+        """
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {REVISIONS_TABLE} (
+            series_id INTEGER NOT NULL,
+            date INTEGER NOT NULL,
+            value REAL NOT NULL,
+            recorded_at INTEGER NOT NULL,
+            superseded_at INTEGER NOT NULL
+        )
+        ''')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{REVISIONS_TABLE}_series_date '
+                       f'ON {REVISIONS_TABLE} (series_id, date)')
+    
+    def _create_series_table(self, cursor, indicator):
+        """Cria a tabela (e o índice de data) de uma série"""
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {indicator} (
+            id INTEGER PRIMARY KEY,
+            date DATE NOT NULL,
+            value FLOAT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+        
+        # Criar índice único para a coluna de data (usado pelo upsert em lote)
+        cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS uidx_{indicator}_date ON {indicator} (date)')
+    
+    def _ensure_unique_date_index(self, cursor, indicator):
+        """
+        Migra tabelas criadas antes do upsert em lote: remove datas duplicadas (mantendo
+        o registro mais recente) e troca o índice simples de data por um índice único
+        
+        Returns:
+            Número de registros duplicados removidos
+        """
+        cursor.execute(f"PRAGMA index_list({indicator})")
+        if any(row[1] == f'uidx_{indicator}_date' for row in cursor.fetchall()):
+            return 0
+        cursor.execute(f"DELETE FROM {indicator} WHERE id NOT IN (SELECT MAX(id) FROM {indicator} GROUP BY date)")
+        removed = cursor.rowcount
+        cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS uidx_{indicator}_date ON {indicator} (date)')
+        cursor.execute(f'DROP INDEX IF EXISTS idx_{indicator}_date')
+        return removed
+    
+    def _migrate_date_indexes(self):
+        """
+        Aplica _ensure_unique_date_index às tabelas de séries que ainda não têm o índice
+        único de data (uma consulta ao sqlite_master quando não há nada a migrar)
+        
+        Returns:
+            Lista das séries que tiveram datas duplicadas removidas
+        """
+        if self.schema == 'long':
+            return []
+        with self.connections.reader() as conn:
+            existing = self._existing_tables(conn.cursor())
+            indexed = {row[0] for row in conn.execute(
+                "SELECT tbl_name FROM sqlite_master WHERE type = 'index' AND name = 'uidx_' || tbl_name || '_date'")}
+        pending = [name for name in self.catalog.names() if name in existing and name not in indexed]
+        self._upsert_ready.update(name for name in self.catalog.names() if name in indexed)
+        if not pending:
+            return []
         
-        conn.commit()
-        conn.close()
+        deduplicated = []
+        with self.connections.writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            for indicator in pending:
+                if self._ensure_unique_date_index(cursor, indicator):
+                    deduplicated.append(indicator)
+        self._upsert_ready.update(pending)
+        return deduplicated
+    
+    def _existing_tables(self, cursor):
+        """Conjunto das tabelas existentes no banco (consultado uma vez por instância)"""
+        if self._known_tables is None:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            self._known_tables = {row[0] for row in cursor.fetchall()}
+        return self._known_tables
+    
+    def _ensure_series_table(self, cursor, indicator):
+        """Cria sob demanda a tabela de uma série incluída no catálogo depois da criação do banco"""
+        if self.schema == 'long':
+            return
+        if indicator not in self._existing_tables(cursor):
+            self._create_series_table(cursor, indicator)
+            self._known_tables.add(indicator)
+        elif indicator not in self._upsert_ready:
+            self._ensure_unique_date_index(cursor, indicator)
+        self._upsert_ready.add(indicator)
     
-    def _optimize_sqlite(self):
-        """Configura otimizações para o SQLite"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_last_dates(self, tables=None):
+        """
+        Obtém a última data salva de cada tabela
         
-        # Ativar modo WAL (Write-Ahead Logging) para melhorar concorrência
-        cursor.execute('PRAGMA journal_mode=WAL')
+        Args:
+            tables: Lista de tabelas (padrão: todas as séries do catálogo)
         
-        # Garantir integridade dos dados
-        cursor.execute('PRAGMA foreign_keys=ON')
+        Returns:
+            Dict {tabela: 'AAAA-MM-DD'} (None para tabelas vazias ou inexistentes)
+        """
+        tables = tables or self.catalog.names()
         
-        # Otimizar operações para velocidade
-        cursor.execute('PRAGMA synchronous=NORMAL')
+        with self.connections.reader() as conn:
+            stored = dict(conn.execute(f"SELECT name, last_date FROM {METADATA_TABLE}").fetchall())
         
-        conn.commit()
-        conn.close()
+        return {table: stored.get(table) for table in tables}
     
-    def save_data(self, table_name, df):
-        """Salva um DataFrame no banco de dados"""
-        if df is None or df.empty:
-            print(f"Nenhum dado para salvar na tabela {table_name}")
-            return False
+    def _prepare_rows(self, df):
+        """
+        Normaliza as colunas para gravação, direto em arrays NumPy (sem DataFrames
+        intermediários, cujo custo fixo domina a gravação de séries curtas)
+        
+        Returns:
+            Dict {'date': datetime64[D], 'value': float64} em ordem de data, sem datas repetidas
+        """
+        dates = df['date'].to_numpy()
+        if dates.dtype.kind != 'M':
+            dates = pd.to_datetime(df['date']).to_numpy()
+        dates = dates.astype('datetime64[D]')
+        values = df['value'].to_numpy()
+        values = (values.astype('float64') if values.dtype.kind in 'fiub'
+                  else pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype='float64'))
         
-        # Selecionar apenas as colunas necessárias
-        if 'date' in df.columns and 'value' in df.columns:
-            df_copy = df[['date', 'value']].copy()
+        # Valores ausentes não podem ser gravados (coluna NOT NULL); datas repetidas ficam com o último valor
+        valid = ~np.isnan(values) & ~np.isnat(dates)
+        dates, values = dates[valid], values[valid]
+        order = np.argsort(dates, kind='stable')
+        dates, values = dates[order], values[order]
+        last = np.append(dates[1:] != dates[:-1], True)
+        return {'date': dates[last], 'value': values[last]}
+    
+    def _stored_chunks(self, cursor, table_name, years):
+        """Contagem e hash (int) já salvos de cada ano entre o menor e o maior dos anos informados"""
+        cursor.execute(f"SELECT year, row_count, content_hash FROM {CHUNKS_TABLE} "
+                       f"WHERE name = ? AND year BETWEEN ? AND ?", (table_name, int(years.min()), int(years.max())))
+        return {year: (row_count, int(content_hash, 16)) for year, row_count, content_hash in cursor.fetchall()}
+    
+    def _skip_unchanged_chunks(self, cursor, table_name, rows):
+        """
+        Descarta das linhas a gravar os anos idênticos ao conteúdo já salvo
+        
+        Compara a contagem e o hash de cada ano das linhas com os da tabela de blocos
+        anuais, sem ler as observações. Anos com qualquer diferença (inclusive anos
+        parciais) seguem para a comparação linha a linha.
+        """
+        if len(rows['date']) == 0:
+            return rows
+        date_keys = rows['date'].astype('int64')
+        years, counts, hashes = _year_sums(date_keys, _row_hashes(date_keys, rows['value']),
+                                           np.ones(len(date_keys)))
+        stored = self._stored_chunks(cursor, table_name, years)
+        unchanged = [year for year, count, content_hash in zip(years.tolist(), counts.tolist(), hashes.tolist())
+                     if stored.get(year) == (count, content_hash)]
+        if not unchanged:
+            return rows
+        return _select(rows, ~np.isin(_years(date_keys), unchanged))
+    
+    def _merge_stored_rows(self, cursor, table_name, rows):
+        """
+        Junta às linhas a gravar o valor já salvo de cada data ('stored_value', NaN se nova)
+        e o momento em que ele foi gravado ('stored_created_at', timestamp Unix)
+        
+        Lê apenas o intervalo de datas das linhas, pelo índice de data, e casa as datas
+        por busca binária (as linhas já estão em ordem e sem repetição).
+        """
+        dates = rows['date']
+        if self.schema == 'long':
+            cursor.execute(f"SELECT date, value, created_at FROM {OBSERVATIONS_TABLE} "
+                           f"WHERE series_id = ? AND date BETWEEN ? AND ?",
+                           (self.catalog.get(table_name)['series_id'], int(dates[0].astype('int64')),
+                            int(dates[-1].astype('int64'))))
+            existing = cursor.fetchall()
+            stored_dates = np.array([row[0] for row in existing], dtype='int64').astype('datetime64[D]')
+        else:
+            cursor.execute(f"SELECT date, value, CAST(strftime('%s', created_at) AS INTEGER) FROM {table_name} "
+                           f"WHERE date BETWEEN ? AND ?", (str(dates[0]), str(dates[-1])))
+            existing = cursor.fetchall()
+            stored_dates = np.array([row[0] for row in existing], dtype='datetime64[D]')
+        
+        merged = {**rows, 'stored_value': np.full(len(dates), np.nan),
+                  'stored_created_at': np.full(len(dates), np.nan)}
+        if existing:
+            positions = np.searchsorted(dates, stored_dates).clip(max=len(dates) - 1)
+            found = dates[positions] == stored_dates
+            merged['stored_value'][positions[found]] = np.array(
+                [row[1] for row in existing], dtype='float64')[found]
+            merged['stored_created_at'][positions[found]] = np.array(
+                [row[2] for row in existing], dtype='float64')[found]
+        return merged
+    
+    def _record_revisions(self, cursor, table_name, merged, superseded_at):
+        """
+        Guarda na tabela de revisões os valores salvos que as linhas gravadas substituem
+        
+        Returns:
+            Número de datas revisadas
+        """
+        revised = _select(merged, ~np.isnan(merged['stored_value']) & (merged['value'] != merged['stored_value']))
+        if len(revised['date']) == 0:
+            return 0
+        
+        series_id = self.catalog.get(table_name)['series_id']
+        date_keys = revised['date'].astype('int64')
+        recorded_at = np.nan_to_num(revised['stored_created_at'], nan=0).astype('int64')
+        cursor.executemany(f'''
+        INSERT INTO {REVISIONS_TABLE} (series_id, date, value, recorded_at, superseded_at)
+        VALUES (?, ?, ?, ?, ?)
+        ''', zip(repeat(series_id), date_keys.tolist(), revised['stored_value'].tolist(),
+               recorded_at.tolist(), repeat(superseded_at)))
+        return len(revised['date'])
+    
+    def save_data(self, table_name, df, only_changed=True):
+        """
+        Salva um DataFrame no banco de dados
+        
+        Anos com a mesma contagem e hash de conteúdo já salvos são descartados sem
+        tocar nas observações; das demais linhas, só as novas ou alteradas são
+        gravadas, em lote, com INSERT ... ON CONFLICT DO UPDATE. O valor anterior
+        de cada data revisada vai para a tabela de revisões (consultável por
+        load_as_of), e created_at passa a indicar desde quando o valor atual vale.
+        
+        Args:
+            table_name: Nome da tabela
+            df: DataFrame com as colunas 'date' e 'value'
+            only_changed: Se False, reprocessa todas as linhas (agregados e metadados
+                inclusive), sem descartar anos pelo hash; valores iguais aos salvos
+                continuam sem ser regravados
+        """
+        return self.save_many({table_name: df}, only_changed)[table_name]
+    
+    def save_many(self, data_dict, only_changed=True):
+        """
+        Salva vários DataFrames em uma única transação (commit em grupo)
+        
+        Cada série é gravada como em save_data, dentro de um SAVEPOINT: uma falha
+        desfaz apenas a série que falhou, e as demais são confirmadas juntas.
+        
+        Args:
+            data_dict: Dict {tabela: DataFrame com 'date' e 'value'}
+            only_changed: Ver save_data
+        
+        Returns:
+            Dict {tabela: True/False}
+        """
+        results = {}
+        prepared = {}
+        for table_name, df in data_dict.items():
+            if df is None or df.empty:
+                print(f"Nenhum dado para salvar na tabela {table_name}")
+                results[table_name] = False
+            elif table_name not in self.catalog:
+                print(f"Série '{table_name}' não está no catálogo de séries")
+                results[table_name] = False
+            elif 'date' not in df.columns or 'value' not in df.columns:
+                print(f"Colunas necessárias não encontradas no DataFrame para a tabela {table_name}")
+                results[table_name] = False
+            else:
+                try:
+                    prepared[table_name] = self._prepare_rows(df)
+                except Exception as e:
+                    print(f"Erro ao salvar dados na tabela {table_name}: {e}")
+                    results[table_name] = False
+        if not prepared:
+            return results
+        
+        written = {}
+        try:
+            with self.connections.writer() as conn:
+                cursor = conn.cursor()
+                # IMMEDIATE reserva a escrita já no início: outro processo gravando faz esta
+                # transação esperar (busy_timeout) em vez de falhar ao passar de leitura a escrita
+                cursor.execute('BEGIN IMMEDIATE')
+                for table_name, rows in prepared.items():
+                    cursor.execute('SAVEPOINT save_series')
+                    try:
+                        written[table_name] = self._write_series(cursor, table_name, rows, only_changed)
+                        cursor.execute('RELEASE save_series')
+                    except Exception as e:
+                        cursor.execute('ROLLBACK TO save_series')
+                        cursor.execute('RELEASE save_series')
+                        # A criação da tabela também pode ter sido desfeita
+                        self._known_tables = None
+                        self._upsert_ready.discard(table_name)
+                        print(f"Erro ao salvar dados na tabela {table_name}: {e}")
+                        results[table_name] = False
+        except Exception as e:
+            self._known_tables = None
+            self._upsert_ready.clear()
+            for table_name in written:
+                print(f"Erro ao salvar dados na tabela {table_name}: {e}")
+                results[table_name] = False
+            return results
+        
+        for table_name, outcome in written.items():
+            results[table_name] = True
+            if outcome is None:
+                print(f"Nenhuma alteração para salvar na tabela {table_name}")
+                continue
+            if self.query_cache is not None:
+                self.query_cache.bump(table_name)
+            count, revised = outcome
+            print(f"{count} registros salvos com sucesso na tabela {table_name}"
+                  + (f" ({revised} revisados)" if revised else ""))
+        return {table_name: results[table_name] for table_name in data_dict}
+    
+    def _write_series(self, cursor, table_name, rows, only_changed):
+        """
+        Grava as linhas de uma série na transação do cursor (ver save_data)
+        
+        Returns:
+            Tupla (registros gravados, datas revisadas), ou None se não houver alteração
+        """
+        self._ensure_series_table(cursor, table_name)
+        
+        if only_changed:
+            # Anos inalterados nem chegam à comparação linha a linha
+            rows = self._skip_unchanged_chunks(cursor, table_name, rows)
+            if len(rows['date']):
+                # Manter apenas as linhas novas ou com valor diferente do já salvo
+                merged = self._merge_stored_rows(cursor, table_name, rows)
+                changed = np.isnan(merged['stored_value']) | (merged['value'] != merged['stored_value'])
+                merged = _select(merged, changed)
+                rows = {'date': merged['date'], 'value': merged['value']}
+            if len(rows['date']) == 0:
+                return None
+        else:
+            merged = self._merge_stored_rows(cursor, table_name, rows)
+        
+        # Um único instante para a revisão e o novo valor: os intervalos de vigência se encaixam
+        now = int(time.time())
+        revised = self._record_revisions(cursor, table_name, merged, now)
+        
+        # Inserir ou atualizar (upsert) em lote; valores iguais ao salvo mantêm o created_at
+        if self.schema == 'long':
+            series_id = self.catalog.get(table_name)['series_id']
+            date_keys = rows['date'].astype('int64')
+            cursor.executemany(f'''
+            INSERT INTO {OBSERVATIONS_TABLE} (series_id, date, value, created_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(series_id, date) DO UPDATE SET
+                value = excluded.value, created_at = excluded.created_at
+            WHERE {OBSERVATIONS_TABLE}.value <> excluded.value
+            ''', zip(repeat(series_id), date_keys.tolist(), rows['value'].tolist(), repeat(now)))
+        else:
+            cursor.executemany(f'''
+            INSERT INTO {table_name} (date, value, created_at) VALUES (?, ?, datetime(?, 'unixepoch'))
+            ON CONFLICT(date) DO UPDATE SET value = excluded.value, created_at = excluded.created_at
+            WHERE {table_name}.value <> excluded.value
+            ''', zip(rows['date'].astype(str).tolist(), rows['value'].tolist(), repeat(now)))
+        
+        self._update_rollups(cursor, table_name, rows['date'])
+        self._update_metadata(cursor, table_name, merged)
+        self.catalog.mark_updated(table_name, cursor.connection)
+        return len(rows['date']), revised
+    
+    def save_all_data(self, data_dict, only_changed=True):
+        """Salva todos os DataFrames do dicionário em suas respectivas tabelas, em um único commit"""
+        return self.save_many(data_dict, only_changed)
+    
+    def _update_rollups(self, cursor, table_name, dates=None):
+        """
+        Recalcula os agregados dos períodos tocados por uma gravação
+        
+        Relê da série apenas os anos que contêm as datas gravadas (que cobrem todos
+        os meses e trimestres afetados) e regrava os períodos dessas datas.
+        
+        Args:
+            cursor: Cursor da transação de gravação
+            table_name: Nome da série
+            dates: Datas gravadas (datetime64[D]); None recalcula a série inteira
+        """
+        if dates is not None and len(dates) == 0:
+            return
+        
+        start = end = None
+        if dates is not None:
+            start = str(dates.min().astype('datetime64[Y]').astype('datetime64[D]'))
+            end = str((dates.max().astype('datetime64[Y]') + 1).astype('datetime64[D]') - 1)
+        records = self._query_series(table_name, start, end, ('date', 'value'), conn=cursor.connection)
+        if len(records['date']) == 0:
+            return
+        
+        series_id = self.catalog.get(table_name)['series_id']
+        for resolution in ROLLUP_RESOLUTIONS:
+            periods = _period_starts(records['date'], resolution)
+            aggregates = _aggregate_periods(periods, records['value'])
+            if dates is not None:
+                touched = np.isin(aggregates[0], _period_starts(dates, resolution))
+                aggregates = [column[touched] for column in aggregates]
             
-            # Verificar por valores duplicados na data (para atualização)
-            conn = sqlite3.connect(self.db_path)
+            period_keys = aggregates[0].astype('int64')
+            cursor.executemany(f'''
+            INSERT INTO {ROLLUPS_TABLE}
+                (series_id, resolution, period, mean_value, last_value, min_value, max_value, count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(series_id, resolution, period) DO UPDATE SET
+                mean_value = excluded.mean_value, last_value = excluded.last_value,
+                min_value = excluded.min_value, max_value = excluded.max_value, count = excluded.count
+            ''', zip(repeat(series_id), repeat(resolution), period_keys.tolist(),
+                   *(column.tolist() for column in aggregates[1:])))
+    
+    def _update_metadata(self, cursor, table_name, merged):
+        """
+        Atualiza contagem, período, última gravação e hash de conteúdo da série e
+        dos seus blocos anuais
+        
+        O hash é a soma (mod 2^64) de um hash por observação, então basta somar as
+        linhas gravadas e subtrair o valor anterior das datas que já existiam, sem
+        reler a série.
+        
+        Args:
+            cursor: Cursor da transação de gravação
+            table_name: Nome da série
+            merged: Arrays das linhas gravadas: 'date', 'value' e 'stored_value' (NaN se nova)
+        """
+        date_keys = merged['date'].astype('int64')
+        values = merged['value']
+        stored_values = merged['stored_value']
+        is_new = np.isnan(stored_values)
+        
+        # Variação do hash por linha: hash novo menos o do valor substituído (aritmética mod 2^64)
+        deltas = _row_hashes(date_keys, values) - np.where(is_new, np.uint64(0), _row_hashes(date_keys, stored_values))
+        
+        years, new_counts, hash_deltas = _year_sums(date_keys, deltas, is_new)
+        stored = self._stored_chunks(cursor, table_name, years)
+        chunks = []
+        for year, new_count, hash_delta in zip(years.tolist(), new_counts.tolist(), hash_deltas.tolist()):
+            row_count, content_hash = stored.get(year, (0, 0))
+            chunks.append((table_name, year, row_count + new_count, f"{(content_hash + hash_delta) & HASH_MASK:016x}"))
+        cursor.executemany(f"INSERT OR REPLACE INTO {CHUNKS_TABLE} (name, year, row_count, content_hash) "
+                           f"VALUES (?, ?, ?, ?)", chunks)
+        
+        cursor.execute(f"SELECT row_count, first_date, last_date, content_hash FROM {METADATA_TABLE} "
+                       f"WHERE name = ?", (table_name,))
+        row_count, first_date, last_date, content_hash = cursor.fetchone() or (0, None, None, '0')
+        
+        content_hash = (int(content_hash, 16) + int(np.add.reduce(deltas, dtype=np.uint64))) & HASH_MASK
+        first_date = min(filter(None, (first_date, str(merged['date'][0]))))
+        last_date = max(filter(None, (last_date, str(merged['date'][-1]))))
+        
+        cursor.execute(f'''
+        INSERT INTO {METADATA_TABLE} (name, row_count, first_date, last_date, last_write, content_hash)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            row_count = excluded.row_count, first_date = excluded.first_date, last_date = excluded.last_date,
+            last_write = excluded.last_write, content_hash = excluded.content_hash
+        ''', (table_name, row_count + int(is_new.sum()), first_date, last_date, f"{content_hash:016x}"))
+    
+    def rebuild_metadata(self, tables=None):
+        """Recalcula do zero os metadados e blocos anuais das séries (padrão: todas as do catálogo)"""
+        with self.connections.writer() as conn:
             cursor = conn.cursor()
-            
-            try:
-                # Para cada linha, inserir ou atualizar (upsert)
-                for _, row in df_copy.iterrows():
-                    date_str = row['date'].strftime('%Y-%m-%d') if isinstance(row['date'], datetime) else row['date']
-                    value = row['value']
-                    
-                    # Verificar se já existe um registro para esta data
-                    cursor.execute(f"SELECT id FROM {table_name} WHERE date = ?", (date_str,))
-                    existing = cursor.fetchone()
-                    
-                    if existing:
-                        # Atualizar registro existente
-                        cursor.execute(f"UPDATE {table_name} SET value = ?, created_at = CURRENT_TIMESTAMP WHERE date = ?", 
-                                      (value, date_str))
-                    else:
-                        # Inserir novo registro
-                        cursor.execute(f"INSERT INTO {table_name} (date, value) VALUES (?, ?)", 
-                                      (date_str, value))
+            cursor.execute('BEGIN IMMEDIATE')
+            self._create_metadata_table(cursor)
+            self._create_chunks_table(cursor)
+            self._create_revisions_table(cursor)
+            existing = self._existing_tables(cursor)
+            existing.update((METADATA_TABLE, CHUNKS_TABLE, REVISIONS_TABLE))
+            for table_name in tables or self.catalog.names():
+                if self.schema != 'long' and table_name not in existing:
+                    continue
+                records = self._query_series(table_name, None, None, ('date', 'value'), conn=conn)
+                cursor.execute(f"DELETE FROM {CHUNKS_TABLE} WHERE name = ?", (table_name,))
+                if len(records['date']) == 0:
+                    cursor.execute(f"DELETE FROM {METADATA_TABLE} WHERE name = ?", (table_name,))
+                    continue
                 
-                conn.commit()
-                print(f"Dados salvos com sucesso na tabela {table_name}")
-                return True
+                date_keys = records['date'].astype('int64')
+                hashes = _row_hashes(date_keys, records['value'])
+                years, counts, year_hashes = _year_sums(date_keys, hashes, np.ones(len(date_keys)))
+                cursor.executemany(f"INSERT INTO {CHUNKS_TABLE} (name, year, row_count, content_hash) "
+                                   f"VALUES (?, ?, ?, ?)",
+                                   [(table_name, year, count, f"{content_hash:016x}") for year, count, content_hash
+                                    in zip(years.tolist(), counts.tolist(), year_hashes.tolist())])
+                
+                content_hash = int(np.add.reduce(hashes, dtype=np.uint64))
+                cursor.execute(f'''
+                INSERT OR REPLACE INTO {METADATA_TABLE}
+                    (name, row_count, first_date, last_date, last_write, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', (table_name, len(records['date']), str(records['date'][0]), str(records['date'][-1]),
+                      self.catalog.get(table_name)['last_updated'], f"{content_hash:016x}"))
+    
+    def get_series_metadata(self, table_name=None):
+        """
+        Metadados mantidos pela gravação, sem percorrer os dados
+        
+        Args:
+            table_name: Nome da série (padrão: todas as séries com dados)
+        
+        Returns:
+            Dict com row_count, first_date, last_date, last_write e content_hash da série
+            (None se não houver dados), ou dict {série: metadados} sem table_name
+        """
+        with self.connections.reader() as conn:
+            cursor = conn.execute(f"SELECT name, row_count, first_date, last_date, last_write, content_hash "
+                                  f"FROM {METADATA_TABLE}" + (" WHERE name = ?" if table_name else ""),
+                                  (table_name,) if table_name else ())
+            fields = [column[0] for column in cursor.description]
+            metadata = {row[0]: dict(zip(fields[1:], row[1:])) for row in cursor.fetchall()}
+        
+        return metadata.get(table_name) if table_name else metadata
+    
+    def rebuild_rollups(self, tables=None):
+        """Recalcula do zero os agregados das séries (padrão: todas as do catálogo)"""
+        with self.connections.writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            self._create_rollups_table(cursor)
+            existing = self._existing_tables(cursor)
+            existing.add(ROLLUPS_TABLE)
+            for table_name in tables or self.catalog.names():
+                if self.schema == 'long' or table_name in existing:
+                    self._update_rollups(cursor, table_name)
+        
+        if self.query_cache is not None:
+            for table_name in tables or self.catalog.names():
+                self.query_cache.bump(table_name)
+    
+    def load_series(self, table_name, start_date=None, end_date=None, columns=('date', 'value'),
+                    resolution=None, aggregate='mean'):
+        """
+        Leitura rápida de uma série como arrays NumPy tipados
+        
+        Consulta parametrizada que busca apenas as colunas pedidas, lidas do cursor
+        direto para um array estruturado (sem SQLAlchemy nem pd.to_datetime).
+        Leituras repetidas são atendidas pelo cache em memória até a próxima
+        gravação da série (deste ou de outro processo); os arrays devolvidos são
+        somente leitura.
+        
+        Args:
+            table_name: Nome da série
+            start_date: Data inicial (opcional)
+            end_date: Data final (opcional)
+            columns: Colunas a carregar ('date', 'value' e/ou 'created_at')
+            resolution: 'monthly', 'quarterly' ou 'yearly' para ler os agregados
+                por período em vez das observações (padrão: resolução original)
+            aggregate: Agregado usado como 'value' ('mean', 'last', 'min' ou 'max')
+        
+        Returns:
+            Dict {coluna: np.ndarray} em ordem de data: 'date' em datetime64[D]
+            (início do período, se houver resolution), 'value' em float64 e
+            'created_at' em datetime64[s]
+        """
+        unknown = set(columns) - set(READ_COLUMNS)
+        if unknown:
+            raise ValueError(f"Colunas desconhecidas: {', '.join(sorted(unknown))}")
+        if resolution is not None:
+            if resolution not in ROLLUP_RESOLUTIONS:
+                raise ValueError(f"Resolução desconhecida: {resolution}")
+            if aggregate not in ROLLUP_AGGREGATES:
+                raise ValueError(f"Agregado desconhecido: {aggregate}")
+            if 'created_at' in columns:
+                raise ValueError("A coluna 'created_at' não existe nos agregados por período")
+        
+        if table_name not in self.catalog:
+            raise ValueError(f"Série '{table_name}' não está no catálogo de séries")
+        
+        if self.query_cache is None:
+            return self._query_series(table_name, start_date, end_date, columns, resolution, aggregate)
+        
+        # Gravações feitas por outros processos também invalidam o cache
+        self.query_cache.sync(self.connections.data_version(), self._content_tokens)
+        
+        key = (table_name,
+               _date_str_to_int(start_date) if start_date else None,
+               _date_str_to_int(end_date) if end_date else None,
+               tuple(columns), resolution, aggregate if resolution else None)
+        arrays = self.query_cache.get(key)
+        if arrays is None:
+            # Versão lida antes da consulta: se houver gravação no meio, a entrada é descartada
+            version = self.query_cache.version(table_name)
+            arrays = self._query_series(table_name, start_date, end_date, columns, resolution, aggregate)
+            self.query_cache.put(key, version, arrays)
+        return dict(arrays)
+    
+    def _content_tokens(self):
+        """Marca do conteúdo de cada série (contagem, última gravação e hash) para o cache"""
+        with self.connections.reader() as conn:
+            rows = conn.execute(f"SELECT name, row_count, last_write, content_hash FROM {METADATA_TABLE}")
+            return {name: tuple(token) for name, *token in rows.fetchall()}
+    
+    def _query_series(self, table_name, start_date, end_date, columns, resolution=None, aggregate='mean',
+                      conn=None):
+        """Consulta de load_series no banco de dados (na conexão informada ou em uma do pool)"""
+        entry = self.catalog.get(table_name)
+        
+        if resolution is not None:
+            # Agregados: período e valores já numéricos, ordenados pela chave primária
+            layout = 'long'
+            expressions = {'date': 'period', 'value': f'{aggregate}_value'}
+            query = (f"SELECT {', '.join(expressions[column] for column in columns)} FROM {ROLLUPS_TABLE} "
+                     f"WHERE series_id = ? AND resolution = ?")
+            params = [entry['series_id'], resolution]
+            column_name = 'period'
             
-            except Exception as e:
-                conn.rollback()
-                print(f"Erro ao salvar dados na tabela {table_name}: {e}")
-                return False
-            finally:
-                conn.close()
+            # O período que contém a data inicial também entra
+            bound = _date_str_to_int
+            if start_date:
+                start_date = str(_period_starts(np.array([bound(start_date)], dtype='datetime64[D]'),
+                                                resolution)[0])
+        elif self.schema == 'long':
+            # No layout 'long' datas e created_at já são inteiros; no outro, texto ISO
+            layout = 'long'
+            query = f"SELECT {', '.join(columns)} FROM {OBSERVATIONS_TABLE} WHERE series_id = ?"
+            params = [entry['series_id']]
+            column_name = 'date'
+            bound = _date_str_to_int
         else:
-            print(f"Colunas necessárias não encontradas no DataFrame para a tabela {table_name}")
-            return False
-    
-    def save_all_data(self, data_dict):
-        """Salva todos os DataFrames do dicionário em suas respectivas tabelas"""
-        results = {}
+            layout = 'tables'
+            query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE 1"
+            params = []
+            column_name = 'date'
+            bound = _normalize_date_str
+        dtype = [(column, READ_COLUMNS[column][layout]) for column in columns]
         
-        for table_name, df in data_dict.items():
-            success = self.save_data(table_name, df)
-            results[table_name] = success
+        if start_date:
+            query += f" AND {column_name} >= ?"
+            params.append(bound(start_date))
+        if end_date:
+            query += f" AND {column_name} <= ?"
+            params.append(bound(end_date))
+        
+        # Leitura completa de uma tabela por série: varrer a tabela na ordem de inserção
+        # e ordenar em memória sai mais barato que percorrer o índice de data
+        sort_in_memory = layout == 'tables' and not (start_date or end_date) and 'date' in columns
+        if not sort_in_memory:
+            query += f" ORDER BY {column_name}"
+        
+        if conn is None:
+            with self.connections.reader() as conn:
+                records = np.fromiter(conn.execute(query, params), dtype=dtype)
+        else:
+            records = np.fromiter(conn.execute(query, params), dtype=dtype)
+        
+        if sort_in_memory and len(records) > 1 and (records['date'][1:] < records['date'][:-1]).any():
+            records = records[np.argsort(records['date'], kind='stable')]
         
-        return results
+        # Inteiros (dias/segundos desde 1970) e texto ISO convertem direto para datetime64
+        return {column: records[column].astype(DATETIME_UNITS[column]) if column in DATETIME_UNITS
+                else np.ascontiguousarray(records[column]) for column in columns}
     
-    def load_data(self, table_name, start_date=None, end_date=None):
+    def load_data(self, table_name, start_date=None, end_date=None, columns=None, resolution=None,
+                  aggregate='mean'):
         """
         Carrega dados de uma tabela do banco de dados, com opção de filtrar por período
         
@@ -123,66 +831,346 @@ class DatabaseManager:
             table_name: Nome da tabela
             start_date: Data inicial (opcional)
             end_date: Data final (opcional)
+            columns: Colunas a carregar (padrão: data, valor e data de coleta;
+                só data e valor nos agregados)
+            resolution: 'monthly', 'quarterly' ou 'yearly' para ler os agregados por período
+            aggregate: Agregado usado como valor ('mean', 'last', 'min' ou 'max')
             
         Returns:
             DataFrame com os dados
         """
+        if columns is None:
+            columns = ('date', 'value') if resolution else ('date', 'value', 'created_at')
+        
         try:
-            query = f"SELECT * FROM {table_name}"
+            arrays = self.load_series(table_name, start_date, end_date, columns, resolution, aggregate)
+            return pd.DataFrame({column: values.astype('datetime64[ns]') if values.dtype.kind == 'M' else values.copy()
+                                 for column, values in arrays.items()})
+        except Exception as e:
+            print(f"Erro ao carregar dados da tabela {table_name}: {e}")
+            return None
+    
+    def load_as_of(self, table_name, as_of, start_date=None, end_date=None):
+        """
+        Carrega a série como ela estava gravada em um instante passado
+        
+        Junta as observações atuais já gravadas naquele instante aos valores da
+        tabela de revisões que então vigoravam. Valores gravados antes da tabela de
+        revisões existir não têm histórico anterior à sua última gravação.
+        
+        Args:
+            table_name: Nome da tabela
+            as_of: Instante de referência em UTC (str, datetime ou pd.Timestamp)
+            start_date: Data inicial (opcional)
+            end_date: Data final (opcional)
+        
+        Returns:
+            DataFrame com 'date' e 'value', ou None em caso de erro
+        """
+        try:
+            entry = self.catalog.get(table_name)
+            if entry is None:
+                raise ValueError(f"Série '{table_name}' não está no catálogo de séries")
+            moment = int(pd.Timestamp(as_of).timestamp())
             
-            # Adicionar filtros de data se fornecidos
-            if start_date and end_date:
-                query += f" WHERE date BETWEEN '{start_date}' AND '{end_date}'"
-            elif start_date:
-                query += f" WHERE date >= '{start_date}'"
-            elif end_date:
-                query += f" WHERE date <= '{end_date}'"
-                
-            query += " ORDER BY date"
+            long_layout = self.schema == 'long'
+            if long_layout:
+                current = f"SELECT date, value FROM {OBSERVATIONS_TABLE} WHERE series_id = ? AND created_at <= ?"
+                current_params = [entry['series_id'], moment]
+                to_key = _date_str_to_int
+            else:
+                current = f"SELECT date, value FROM {table_name} WHERE created_at <= datetime(?, 'unixepoch')"
+                current_params = [moment]
+                to_key = _normalize_date_str
+            date_expression = 'date' if long_layout else "date(date * 86400, 'unixepoch')"
+            revised = (f"SELECT {date_expression}, value FROM {REVISIONS_TABLE} "
+                       f"WHERE series_id = ? AND recorded_at <= ? AND superseded_at > ?")
+            revised_params = [entry['series_id'], moment, moment]
             
-            df = pd.read_sql(query, self.engine)
+            if start_date:
+                current += " AND date >= ?"
+                current_params.append(to_key(start_date))
+                revised += " AND date >= ?"
+                revised_params.append(_date_str_to_int(start_date))
+            if end_date:
+                current += " AND date <= ?"
+                current_params.append(to_key(end_date))
+                revised += " AND date <= ?"
+                revised_params.append(_date_str_to_int(end_date))
             
-            # Converter a coluna de data para datetime
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
-                
-            return df
+            dtype = [('date', 'i8' if long_layout else 'S10'), ('value', 'f8')]
+            with self.connections.reader() as conn:
+                records = np.fromiter(conn.execute(f"{current} UNION ALL {revised}",
+                                                   current_params + revised_params), dtype=dtype)
+            
+            # Cada data vem de uma única parte: o valor atual ou a revisão vigente no instante
+            dates = records['date'].astype('datetime64[D]')
+            order = np.argsort(dates, kind='stable')
+            return pd.DataFrame({'date': dates[order].astype('datetime64[ns]'), 'value': records['value'][order]})
         except Exception as e:
-            print(f"Erro ao carregar dados da tabela {table_name}: {e}")
+            print(f"Erro ao carregar dados da tabela {table_name} em {as_of}: {e}")
+            return None
+    
+    def load_revisions(self, table_name, start_date=None, end_date=None):
+        """
+        Histórico de revisões de uma série: valores substituídos e sua vigência
+        
+        Returns:
+            DataFrame com 'date', 'value', 'recorded_at' e 'superseded_at' (UTC),
+            em ordem de data e de substituição, ou None em caso de erro
+        """
+        try:
+            entry = self.catalog.get(table_name)
+            if entry is None:
+                raise ValueError(f"Série '{table_name}' não está no catálogo de séries")
+            query = (f"SELECT date, value, recorded_at, superseded_at FROM {REVISIONS_TABLE} "
+                     f"WHERE series_id = ?")
+            params = [entry['series_id']]
+            if start_date:
+                query += " AND date >= ?"
+                params.append(_date_str_to_int(start_date))
+            if end_date:
+                query += " AND date <= ?"
+                params.append(_date_str_to_int(end_date))
+            query += " ORDER BY date, superseded_at"
+            
+            dtype = [('date', 'i8'), ('value', 'f8'), ('recorded_at', 'i8'), ('superseded_at', 'i8')]
+            with self.connections.reader() as conn:
+                records = np.fromiter(conn.execute(query, params), dtype=dtype)
+            return pd.DataFrame({
+                'date': records['date'].astype('datetime64[D]').astype('datetime64[ns]'),
+                'value': records['value'],
+                'recorded_at': records['recorded_at'].astype('datetime64[s]').astype('datetime64[ns]'),
+                'superseded_at': records['superseded_at'].astype('datetime64[s]').astype('datetime64[ns]'),
+            })
+        except Exception as e:
+            print(f"Erro ao carregar as revisões da tabela {table_name}: {e}")
             return None
     
+    def load_many(self, indicators, start_date=None, end_date=None, freq=None, aggregate='mean'):
+        """
+        Carrega várias séries em uma única consulta, alinhadas por data
+        
+        Regras de alinhamento, pela frequência de cada série no catálogo:
+        - freq=None: a grade é a união das datas observadas; cada série é
+          propagada (forward-fill) a partir da sua primeira observação
+        - freq='monthly', 'quarterly' ou 'yearly': séries mais finas que freq entram
+          pelos agregados por período (rollups); séries na própria frequência entram
+          como estão; séries mais grossas são propagadas pelos períodos seguintes,
+          a partir da sua primeira observação no intervalo
+        
+        Args:
+            indicators: Nomes das séries
+            start_date: Data inicial (opcional)
+            end_date: Data final (opcional)
+            freq: Frequência da grade ('monthly', 'quarterly', 'yearly' ou None)
+            aggregate: Agregado das séries mais finas que freq ('mean', 'last', 'min' ou 'max')
+        
+        Returns:
+            DataFrame com a coluna 'date' e uma coluna por série, ou None em caso de erro
+        """
+        try:
+            return self._load_many(list(indicators), start_date, end_date, freq, aggregate)
+        except Exception as e:
+            print(f"Erro ao carregar as séries {', '.join(indicators)}: {e}")
+            return None
+    
+    def _load_many(self, indicators, start_date, end_date, freq, aggregate):
+        """Consulta e alinhamento de load_many"""
+        if freq is not None and freq not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"Frequência desconhecida: {freq}")
+        if aggregate not in ROLLUP_AGGREGATES:
+            raise ValueError(f"Agregado desconhecido: {aggregate}")
+        entries = [self.catalog.get(name) for name in indicators]
+        missing = [name for name, entry in zip(indicators, entries) if entry is None]
+        if missing:
+            raise ValueError(f"Séries fora do catálogo de séries: {', '.join(missing)}")
+        if not indicators:
+            return pd.DataFrame({'date': np.array([], dtype='datetime64[ns]')})
+        
+        ranks = np.array([FREQUENCY_RANK.get(entry['frequency'], 0) for entry in entries])
+        from_rollups = ranks < FREQUENCY_RANK[freq] if freq else np.zeros(len(entries), dtype=bool)
+        
+        # Uma única consulta (UNION ALL): agregados das séries finas e observações das demais,
+        # com o índice da coluna de destino na primeira posição
+        long_layout = self.schema == 'long'
+        to_key = _date_str_to_int if long_layout else _normalize_date_str
+        # Com freq, o período que contém a data inicial também entra
+        if start_date and freq:
+            start_date = str(_period_starts(np.array([_date_str_to_int(start_date)], dtype='datetime64[D]'), freq)[0])
+        
+        parts, params = [], []
+        for position, (name, entry) in enumerate(zip(indicators, entries)):
+            if from_rollups[position]:
+                date_expression = 'period' if long_layout else "date(period * 86400, 'unixepoch')"
+                part = (f"SELECT {position}, {date_expression}, {aggregate}_value FROM {ROLLUPS_TABLE} "
+                        f"WHERE series_id = ? AND resolution = ?")
+                params += [entry['series_id'], freq]
+                column_name, lower = 'period', _date_str_to_int
+            elif long_layout:
+                part = f"SELECT {position}, date, value FROM {OBSERVATIONS_TABLE} WHERE series_id = ?"
+                params.append(entry['series_id'])
+                column_name, lower = 'date', to_key
+            else:
+                part = f"SELECT {position}, date, value FROM {name} WHERE 1"
+                column_name, lower = 'date', to_key
+            if start_date:
+                part += f" AND {column_name} >= ?"
+                params.append(lower(start_date))
+            if end_date:
+                part += f" AND {column_name} <= ?"
+                params.append(_date_str_to_int(end_date) if column_name == 'period' else to_key(end_date))
+            parts.append(part)
+        
+        dtype = [('position', 'i8'), ('date', 'i8' if long_layout else 'S10'), ('value', 'f8')]
+        with self.connections.reader() as conn:
+            records = np.fromiter(conn.execute(' UNION ALL '.join(parts), params), dtype=dtype)
+        
+        # Ordenar por série e data em memória (mais barato que o ORDER BY sobre o UNION)
+        dates = records['date'].astype('datetime64[D]')
+        order = np.lexsort((dates, records['position']))
+        positions, dates, values = records['position'][order], dates[order], records['value'][order]
+        
+        if freq:
+            # Cada observação vai para o início do seu período; várias no mesmo período
+            # (série na própria frequência com datas fora do início) ficam com o agregado
+            dates = _period_starts(dates, freq)
+            change = np.r_[True, (positions[1:] != positions[:-1]) | (dates[1:] != dates[:-1])]
+            aggregated = _aggregate_periods(np.cumsum(change), values)
+            values = aggregated[1 + ROLLUP_AGGREGATES.index(aggregate)]
+            positions, dates = positions[change], dates[change]
+            grid = _period_range(dates.min(), dates.max(), freq) if len(dates) else dates
+        else:
+            grid = np.unique(dates)
+        
+        # Matriz data x série, preenchida de uma vez pelas posições na grade
+        matrix = np.full((len(grid), len(indicators)), np.nan)
+        matrix[np.searchsorted(grid, dates), positions] = values
+        
+        wide = pd.DataFrame(matrix, columns=indicators)
+        fill = list(np.array(indicators)[ranks > FREQUENCY_RANK[freq]]) if freq else indicators
+        if fill:
+            wide[fill] = wide[fill].ffill()
+        wide.insert(0, 'date', grid.astype('datetime64[ns]'))
+        return wide
+    
     def get_stats(self):
-        """Obtém estatísticas sobre o banco de dados"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """
+        Obtém estatísticas sobre o banco de dados
         
+        Lidas da tabela de metadados: o custo depende do número de séries, não do
+        tamanho do histórico.
+        """
         stats = {}
+        metadata = self.get_series_metadata()
         
-        # Obter lista de tabelas
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall() if row[0] != 'sqlite_sequence']
-        
-        # Obter contagem de registros por tabela
-        for table in tables:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            
-            # Obter período de dados
-            cursor.execute(f"SELECT MIN(date), MAX(date) FROM {table}")
-            min_date, max_date = cursor.fetchone()
-            
-            stats[table] = {
-                'count': count,
-                'period': f"{min_date} a {max_date}" if min_date and max_date else "Sem dados"
-            }
+        # Séries do catálogo ainda sem observações aparecem em qualquer layout
+        for table in self.catalog.names():
+            entry = metadata.get(table)
+            if entry:
+                stats[table] = {
+                    'count': entry['row_count'],
+                    'period': f"{entry['first_date']} a {entry['last_date']}",
+                    'last_write': entry['last_write']
+                }
+            else:
+                stats[table] = {'count': 0, 'period': "Sem dados", 'last_write': None}
         
         # Obter tamanho do banco de dados
         if os.path.exists(self.db_path):
-            stats['db_size'] = f"{os.path.getsize(self.db_path) / (1024 * 1024):.2f} MB"
+            stats['db_size'] = f"{database_file_size(self.db_path) / (1024 * 1024):.2f} MB"
         
-        conn.close()
         return stats
 
+def database_file_size(db_path):
+    """Tamanho do banco, incluindo o arquivo WAL ainda não consolidado"""
+    wal_path = f"{db_path}-wal"
+    return os.path.getsize(db_path) + (os.path.getsize(wal_path) if os.path.exists(wal_path) else 0)
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+def get_database_manager(db_name=DATABASE_NAME):
+    """DatabaseManager compartilhado (um por arquivo de banco de dados no processo)"""
+    key = os.path.abspath(db_name)
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = DatabaseManager(db_name)
+        return _managers[key]
+
+def _period_starts(dates, resolution):
+    """Início do mês, trimestre ou ano de cada data (datetime64[D])"""
+    if resolution == 'yearly':
+        return dates.astype('datetime64[Y]').astype('datetime64[D]')
+    months = dates.astype('datetime64[M]')
+    if resolution == 'quarterly':
+        month_numbers = months.astype('int64')
+        months = (month_numbers - month_numbers % 3).astype('datetime64[M]')
+    return months.astype('datetime64[D]')
+
+def _period_range(first, last, resolution):
+    """Inícios de período consecutivos de first a last (datetime64[D])"""
+    step = {'monthly': 1, 'quarterly': 3, 'yearly': 12}[resolution]
+    months = np.arange(first.astype('datetime64[M]'), last.astype('datetime64[M]') + 1, step)
+    return months.astype('datetime64[D]')
+
+def _aggregate_periods(periods, values):
+    """
+    Média, último, mínimo, máximo e contagem de valores por período
+    
+    Args:
+        periods: Início do período de cada observação, em ordem de data
+        values: Valores das observações
+    
+    Returns:
+        Lista [períodos, médias, últimos, mínimos, máximos, contagens]
+    """
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    ends = np.r_[starts[1:], len(periods)]
+    counts = ends - starts
+    return [periods[starts], np.add.reduceat(values, starts) / counts, values[ends - 1],
+            np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts), counts]
+
+def _row_hashes(date_keys, values):
+    """Hash de 64 bits de cada observação (data em dias, bits do valor)"""
+    with np.errstate(over='ignore'):
+        h = date_keys.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) ^ values.astype(np.float64).view(np.uint64)
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return h
+
+def _years(date_keys):
+    """Ano de cada data (dias desde 1970-01-01)"""
+    return date_keys.astype('datetime64[D]').astype('datetime64[Y]').astype('int64') + 1970
+
+def _year_sums(date_keys, hashes, counts):
+    """
+    Soma (mod 2^64) dos hashes e soma das contagens por ano
+    
+    Returns:
+        Tupla (anos em ordem, contagens int64, hashes uint64)
+    """
+    years, inverse = np.unique(_years(date_keys), return_inverse=True)
+    hash_sums = np.zeros(len(years), dtype=np.uint64)
+    np.add.at(hash_sums, inverse, hashes)
+    count_sums = np.bincount(inverse, weights=counts, minlength=len(years)).astype('int64')
+    return years, count_sums, hash_sums
+
+def _select(arrays, mask):
+    """Filtra da mesma forma todos os arrays de um dict {coluna: np.ndarray}"""
+    return {column: values[mask] for column, values in arrays.items()}
+
+def _date_str_to_int(date):
+    """Data ('AAAA-MM-DD', datetime, ...) como dias desde 1970-01-01"""
+    return int(pd.Timestamp(date).to_datetime64().astype('datetime64[D]').astype('int64'))
+
+def _normalize_date_str(date):
+    """Data ('AAAA-MM-DD', datetime, ...) como 'AAAA-MM-DD'"""
+    return str(pd.Timestamp(date).date())
+
 if __name__ == "__main__":
     # Teste da classe DatabaseManager
     from data_collector import BCBDataCollector
@@ -0,0 +1,72 @@
+# Arquivo: migrate_storage.py
+# Converte um banco no layout de uma tabela por série para a tabela única de
+# observações (layout 'long'), no mesmo arquivo.
+#
+# Uso: python migrate_storage.py [banco.db] [--keep-tables]
+import sys
+from config import DATABASE_NAME
+from database_manager import DatabaseManager, OBSERVATIONS_TABLE, database_file_size
+
+
+def migrate_to_long(db_path=DATABASE_NAME, keep_tables=False):
+    """
+    Copia todas as séries para a tabela de observações e remove as tabelas antigas
+
+    Args:
+        db_path: Arquivo do banco de dados
+        keep_tables: Se True, mantém as tabelas por série após a cópia
+
+    Returns:
+        Dict {série: registros migrados}
+    """
+    db = DatabaseManager(db_path)
+    if db.schema == 'long':
+        print("O banco já está no layout de tabela única de observações")
+        return {}
+
+    size_before = database_file_size(db_path)
+    migrated = {}
+
+    with db.connections.writer() as conn:
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        db.schema = 'long'
+        db._create_observations_table(cursor)
+
+        existing = db._existing_tables(cursor)
+        for name in db.catalog.names():
+            if name not in existing:
+                continue
+            series_id = db.catalog.get(name)['series_id']
+
+            # Datas 'AAAA-MM-DD' viram dias desde 1970-01-01; created_at vira timestamp Unix.
+            # Datas repetidas (tabelas anteriores ao índice único) ficam com o registro mais recente.
+            cursor.execute(f'''
+            INSERT INTO {OBSERVATIONS_TABLE} (series_id, date, value, created_at)
+            SELECT ?, CAST(julianday(date) - 2440587.5 AS INTEGER), value,
+                   COALESCE(CAST(strftime('%s', created_at) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER))
+            FROM {name}
+            WHERE id IN (SELECT MAX(id) FROM {name} GROUP BY date)
+            ORDER BY date
+            ON CONFLICT(series_id, date) DO UPDATE SET value = excluded.value, created_at = excluded.created_at
+            ''', (series_id,))
+            migrated[name] = cursor.rowcount
+
+            if not keep_tables:
+                cursor.execute(f"DROP TABLE {name}")
+
+    # Recuperar o espaço das tabelas removidas
+    if not keep_tables:
+        with db.connections.writer() as conn:
+            conn.execute('VACUUM')
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    size_after = database_file_size(db_path)
+    print(f"{sum(migrated.values())} registros de {len(migrated)} séries migrados para '{OBSERVATIONS_TABLE}'")
+    print(f"Tamanho do banco: {size_before / (1024 * 1024):.2f} MB -> {size_after / (1024 * 1024):.2f} MB")
+    return migrated
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    migrate_to_long(args[0] if args else DATABASE_NAME, keep_tables='--keep-tables' in sys.argv)
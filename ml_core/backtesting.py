@@ -0,0 +1,337 @@
+# Arquivo: ml_core/backtesting.py
+import sys
+import json
+import hashlib
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from config import (DATABASE_NAME, FORECAST_FREQUENCY, FORECAST_MAX_HISTORY, FAST_FORECAST_METHOD,
+                    FAST_FORECAST_INTERVAL_WIDTH, BACKTEST_HORIZON, BACKTEST_FOLDS, BACKTEST_STEP,
+                    BACKTEST_MIN_TRAIN, BACKTEST_MAX_WORKERS)
+from connection_manager import get_connection_manager
+from database_manager import get_database_manager
+from series_catalog import get_catalog
+from ml_core.forecaster import simulate_forecast, PROPHET_CONFIG, PROPHET_AVAILABLE
+from ml_core.model_cache import PROPHET_VERSION
+from ml_core.preprocessing import prepare_history, PERIOD_MONTHS
+from ml_core.batch_forecast import available_cpus
+
+# Previsão de cada dobra (reaproveitada enquanto os dados da janela não mudarem)
+BACKTEST_FOLDS_TABLE = 'backtest_folds'
+
+# Métricas de cada série, pela versão dos dados (content_hash dos metadados)
+BACKTEST_SCORES_TABLE = 'backtest_scores'
+
+METRICS = ['mape', 'rmse', 'mae', 'coverage']
+
+# Coluna 'tipo' da previsão de cada motor: qualquer outra indica que o simulate_forecast
+# recorreu à previsão simples, que não pode ser avaliada (nem guardada) como o motor
+ENGINE_FORECAST_TYPES = {'fast': 'Previsão Rápida', 'prophet': 'Previsão'}
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def fold_cutoffs(dates, horizon: int, folds: int, step: int, min_train: int,
+                 frequency: str = FORECAST_FREQUENCY) -> np.ndarray:
+    """
+    Posições de corte das dobras da validação com origem móvel
+
+    Cada corte é a posição do primeiro ponto previsto: a dobra é ajustada com os
+    pontos anteriores e avaliada nos horizon pontos seguintes. Os cortes caem em
+    períodos fixos do calendário (a cada step períodos, contados desde 1970), e não
+    a partir do fim da série: com a chegada de um dado novo as dobras antigas
+    continuam as mesmas e podem ser reaproveitadas.
+
+    Returns:
+        np.ndarray: Até folds posições, as mais recentes com horizonte completo
+    """
+    months = np.asarray(dates, dtype='datetime64[M]').astype('int64')
+    periods = months // PERIOD_MONTHS.get(frequency, 1)
+    positions = np.arange(len(periods))
+    valid = (positions >= min_train) & (positions + horizon <= len(periods)) & (periods % step == 0)
+    return positions[valid][-folds:]
+
+
+def score(actual, mean, lower, upper) -> dict:
+    """
+    MAPE (%), RMSE, MAE e cobertura do intervalo de previsão
+
+    O MAPE ignora os pontos com valor observado igual a zero.
+    """
+    actual, mean = np.asarray(actual, dtype='float64'), np.asarray(mean, dtype='float64')
+    errors = actual - mean
+    nonzero = actual != 0
+    return {
+        'mape': float(np.mean(np.abs(errors[nonzero] / actual[nonzero])) * 100) if nonzero.any() else np.nan,
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+        'mae': float(np.mean(np.abs(errors))),
+        'coverage': float(np.mean((actual >= np.asarray(lower)) & (actual <= np.asarray(upper)))),
+    }
+
+
+def _engine_signature(engine, frequency):
+    """Configuração que define o resultado de uma dobra (faz parte da chave)"""
+    if engine == 'fast':
+        settings = {'method': FAST_FORECAST_METHOD, 'interval_width': FAST_FORECAST_INTERVAL_WIDTH}
+    else:
+        settings = {'config': PROPHET_CONFIG, 'version': PROPHET_VERSION}
+    return json.dumps({'engine': engine, 'frequency': frequency, 'max_history': FORECAST_MAX_HISTORY,
+                       **settings}, sort_keys=True, default=str)
+
+
+def _fold_hash(signature, dates, values, cutoff, horizon, frequency):
+    """Hash da configuração e da janela de dados da dobra (treino efetivo + observado)"""
+    limit = (FORECAST_MAX_HISTORY or {}).get(frequency)
+    start = max(0, cutoff - limit) if limit else 0
+    digest = hashlib.sha256(signature.encode('utf-8'))
+    digest.update(str(horizon).encode('utf-8'))
+    digest.update(np.ascontiguousarray(dates[start:cutoff + horizon]).view('int64').tobytes())
+    digest.update(np.ascontiguousarray(values[start:cutoff + horizon]).tobytes())
+    return digest.hexdigest()
+
+
+def _run_fold(dates, values, horizon, engine, frequency):
+    """Previsão de uma dobra (executada no pool de processos, quando houver)"""
+    train = pd.DataFrame({'date': dates.astype('datetime64[ns]'), 'value': values})
+    forecast = simulate_forecast(train, horizon, use_cache=False, engine=engine, frequency=frequency)
+    if forecast.empty or len(forecast) < horizon:
+        raise ValueError("previsão vazia")
+    if forecast['tipo'].iloc[0] != ENGINE_FORECAST_TYPES[engine]:
+        raise ValueError(f"o motor '{engine}' falhou ({forecast['tipo'].iloc[0]} usada no lugar)")
+    return (forecast['value'].to_numpy(dtype='float64')[:horizon],
+            forecast['lower_bound'].to_numpy(dtype='float64')[:horizon],
+            forecast['upper_bound'].to_numpy(dtype='float64')[:horizon])
+
+
+def _create_tables(connections):
+    """Cria as tabelas de dobras e de métricas do backtest"""
+    with connections.writer() as conn:
+        conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {BACKTEST_FOLDS_TABLE} (
+            name TEXT NOT NULL,
+            engine TEXT NOT NULL,
+            horizon INTEGER NOT NULL,
+            cutoff TEXT NOT NULL,
+            fold_hash TEXT NOT NULL,
+            result TEXT NOT NULL,
+            PRIMARY KEY (name, engine, horizon, cutoff)
+        ) WITHOUT ROWID
+        ''')
+        conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {BACKTEST_SCORES_TABLE} (
+            name TEXT NOT NULL,
+            engine TEXT NOT NULL,
+            horizon INTEGER NOT NULL,
+            settings_hash TEXT NOT NULL,
+            data_version TEXT,
+            folds INTEGER NOT NULL,
+            mape REAL,
+            rmse REAL,
+            mae REAL,
+            coverage REAL,
+            computed_at TEXT NOT NULL,
+            PRIMARY KEY (name, engine, horizon)
+        ) WITHOUT ROWID
+        ''')
+
+
+def _check_engine(engine):
+    """Recusa motores desconhecidos ou indisponíveis (sem o Prophet, toda dobra cairia na previsão simples)"""
+    if engine not in ENGINE_FORECAST_TYPES:
+        raise ValueError(f"Motor de previsão desconhecido: {engine} (use 'prophet' ou 'fast')")
+    if engine == 'prophet' and not PROPHET_AVAILABLE:
+        raise ValueError("O Prophet não está instalado; use engine='fast'")
+
+
+def _pool(engine, max_workers):
+    # A previsão rápida leva milissegundos por dobra: menos que iniciar um processo
+    workers = max_workers or available_cpus()
+    if engine == 'fast' or workers <= 1:
+        return None
+    # spawn pelo mesmo motivo da previsão em lote (conexões e threads do processo principal)
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def backtest(indicator: str, engine: str = 'fast', horizon: int = BACKTEST_HORIZON, folds: int = BACKTEST_FOLDS,
+             step: int = BACKTEST_STEP, min_train: int = BACKTEST_MIN_TRAIN, db_path=DATABASE_NAME,
+             frequency: str = FORECAST_FREQUENCY, max_workers=BACKTEST_MAX_WORKERS, executor=None) -> dict:
+    """
+    Validação com origem móvel de um motor de previsão em uma série
+
+    Cada dobra ajusta o motor (pelo simulate_forecast, com a mesma preparação do
+    histórico da previsão normal) com os dados até o corte e compara os horizon
+    períodos seguintes com o observado. As dobras já calculadas com a mesma janela
+    de dados e a mesma configuração são lidas do banco; só as novas (ou com dados
+    revisados) são ajustadas, em paralelo no pool de processos.
+
+    Args:
+        indicator: Nome da série
+        engine: 'fast' ou 'prophet'
+        horizon: Períodos previstos em cada dobra
+        folds: Número máximo de dobras (as mais recentes)
+        step: Distância entre cortes, em períodos
+        min_train: Mínimo de pontos antes do primeiro corte
+        db_path: Arquivo do banco de dados
+        frequency: Frequência da previsão
+        max_workers: Processos do pool (padrão: núcleos disponíveis)
+        executor: Pool já criado (usado por backtest_all para todas as séries)
+
+    Returns:
+        dict: Métricas gerais (METRICS), 'by_step' (DataFrame com as métricas por
+        período do horizonte), 'folds', 'computed' e 'failed' (dobras ajustadas agora
+        e com erro)
+    """
+    _check_engine(engine)
+    data = get_database_manager(db_path).load_data(indicator, resolution=frequency)
+    if data is None or data.empty:
+        raise ValueError(f"Nenhum dado disponível para {indicator}")
+    history = prepare_history(data, frequency, max_history=None)
+    dates = history['date'].to_numpy(dtype='datetime64[D]')
+    values = history['value'].to_numpy(dtype='float64')
+    cutoffs = fold_cutoffs(dates, horizon, folds, step, min_train, frequency)
+    if len(cutoffs) == 0:
+        raise ValueError(f"Histórico insuficiente para o backtest de {indicator} ({len(values)} pontos)")
+
+    connections = get_connection_manager(db_path)
+    _create_tables(connections)
+    signature = _engine_signature(engine, frequency)
+    keys = {int(cutoff): (str(dates[cutoff]), _fold_hash(signature, dates, values, cutoff, horizon, frequency))
+            for cutoff in cutoffs}
+
+    with connections.reader() as conn:
+        stored = dict(((cutoff, fold_hash), result) for cutoff, fold_hash, result in conn.execute(
+            f"SELECT cutoff, fold_hash, result FROM {BACKTEST_FOLDS_TABLE} "
+            f"WHERE name = ? AND engine = ? AND horizon = ?", (indicator, engine, horizon)))
+    results = {cutoff: json.loads(stored[key]) for cutoff, key in keys.items() if key in stored}
+
+    missing = [cutoff for cutoff in keys if cutoff not in results]
+    own_pool = executor is None and len(missing) > 1
+    pool = _pool(engine, max_workers) if own_pool else executor
+    outcomes = {}
+    try:
+        futures = {cutoff: pool.submit(_run_fold, dates[:cutoff], values[:cutoff], horizon, engine, frequency)
+                   for cutoff in missing} if pool is not None else {}
+        for cutoff in missing:
+            try:
+                outcomes[cutoff] = (futures[cutoff].result() if futures else
+                                    _run_fold(dates[:cutoff], values[:cutoff], horizon, engine, frequency))
+            except Exception as e:
+                print(f"❌ Dobra {indicator} {keys[cutoff][0]}: {e}")
+    finally:
+        if own_pool and pool is not None:
+            pool.shutdown()
+    failed = len(missing) - len(outcomes)
+
+    rows = []
+    for cutoff, (mean, lower, upper) in outcomes.items():
+        results[cutoff] = {'actual': values[cutoff:cutoff + horizon].tolist(), 'mean': mean.tolist(),
+                           'lower': lower.tolist(), 'upper': upper.tolist()}
+        rows.append((indicator, engine, horizon, keys[cutoff][0], keys[cutoff][1], json.dumps(results[cutoff])))
+    if rows:
+        with connections.writer() as conn:
+            conn.executemany(f"INSERT OR REPLACE INTO {BACKTEST_FOLDS_TABLE} "
+                             f"(name, engine, horizon, cutoff, fold_hash, result) VALUES (?, ?, ?, ?, ?, ?)", rows)
+    if not results:
+        raise ValueError(f"Nenhuma dobra do backtest de {indicator} foi concluída")
+
+    # Matrizes (dobras, horizonte) para as métricas gerais e por período do horizonte
+    stacked = {field: np.array([results[cutoff][field] for cutoff in sorted(results)])
+               for field in ('actual', 'mean', 'lower', 'upper')}
+    by_step = pd.DataFrame([{'step': h + 1, **score(*(stacked[field][:, h] for field in
+                                                      ('actual', 'mean', 'lower', 'upper')))}
+                            for h in range(horizon)])
+    return {**score(*(stacked[field].ravel() for field in ('actual', 'mean', 'lower', 'upper'))),
+            'by_step': by_step, 'folds': len(results), 'computed': len(outcomes), 'failed': failed}
+
+
+def backtest_all(indicators=None, engine: str = 'fast', horizon: int = BACKTEST_HORIZON,
+                 folds: int = BACKTEST_FOLDS, step: int = BACKTEST_STEP, min_train: int = BACKTEST_MIN_TRAIN,
+                 db_path=DATABASE_NAME, frequency: str = FORECAST_FREQUENCY,
+                 max_workers=BACKTEST_MAX_WORKERS) -> pd.DataFrame:
+    """
+    Tabela de precisão de um motor de previsão em várias séries
+
+    As métricas de cada série ficam gravadas com a versão dos dados (o content_hash
+    dos metadados da série): séries sem gravação nova desde o último cálculo não são
+    nem lidas; nas demais, só as dobras novas são ajustadas (ver backtest).
+
+    Args:
+        indicators: Séries avaliadas (padrão: todas as séries do catálogo)
+        engine, horizon, folds, step, min_train, frequency: Como em backtest
+        db_path: Arquivo do banco de dados
+        max_workers: Processos do pool, compartilhado por todas as séries
+
+    Returns:
+        pd.DataFrame: Uma linha por série, com as colunas name, folds, METRICS,
+        data_version, computed_at e cached (se veio da tabela de métricas)
+    """
+    _check_engine(engine)
+    if indicators is None:
+        indicators = get_catalog(db_path).names()
+    connections = get_connection_manager(db_path)
+    _create_tables(connections)
+    settings_hash = hashlib.sha256(json.dumps([_engine_signature(engine, frequency), folds, step, min_train])
+                                   .encode('utf-8')).hexdigest()
+    metadata = get_database_manager(db_path).get_series_metadata()
+
+    with connections.reader() as conn:
+        cursor = conn.execute(f"SELECT name, settings_hash, data_version, folds, {', '.join(METRICS)}, computed_at "
+                              f"FROM {BACKTEST_SCORES_TABLE} WHERE engine = ? AND horizon = ?", (engine, horizon))
+        stored = {row[0]: row[1:] for row in cursor.fetchall()}
+
+    table = []
+    outdated = []
+    for name in indicators:
+        version = (metadata.get(name) or {}).get('content_hash')
+        entry = stored.get(name)
+        if entry and version and entry[0] == settings_hash and entry[1] == version:
+            table.append({'name': name, 'folds': entry[2], **dict(zip(METRICS, entry[3:7])),
+                          'data_version': version, 'computed_at': entry[7], 'cached': True})
+        else:
+            outdated.append((name, version))
+
+    pool = _pool(engine, max_workers) if outdated else None
+    try:
+        for name, version in outdated:
+            try:
+                result = backtest(name, engine, horizon, folds, step, min_train, db_path, frequency,
+                                  max_workers, executor=pool)
+            except ValueError as e:
+                print(f"⚠️ {e}")
+                continue
+
+            row = {'name': name, 'folds': result['folds'], **{metric: result[metric] for metric in METRICS},
+                   'data_version': version, 'computed_at': datetime.now().strftime(TIMESTAMP_FORMAT),
+                   'cached': False}
+            table.append(row)
+            if not result['failed']:
+                with connections.writer() as conn:
+                    conn.execute(f"INSERT OR REPLACE INTO {BACKTEST_SCORES_TABLE} "
+                                 f"(name, engine, horizon, settings_hash, data_version, folds, "
+                                 f"{', '.join(METRICS)}, computed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (name, engine, horizon, settings_hash, version, row['folds'],
+                                  *[row[metric] for metric in METRICS], row['computed_at']))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    order = {name: i for i, name in enumerate(indicators)}
+    table.sort(key=lambda row: order[row['name']])
+    return pd.DataFrame(table, columns=['name', 'folds', *METRICS, 'data_version', 'computed_at', 'cached'])
+
+
+if __name__ == "__main__":
+    # Uso: python -m ml_core.backtesting [série ...] [--engine=fast|prophet] [--horizon=12]
+    #                                    [--workers=N] [--db=banco.db]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    names = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    accuracy = backtest_all(
+        names or None,
+        engine=options.get('engine', 'fast'),
+        horizon=int(options.get('horizon', BACKTEST_HORIZON)),
+        db_path=options.get('db', DATABASE_NAME),
+        max_workers=int(options['workers']) if 'workers' in options else BACKTEST_MAX_WORKERS,
+    )
+    print(accuracy.to_string(index=False))
@@ -0,0 +1,213 @@
+# Arquivo: ml_core/batch_forecast.py
+import os
+import sys
+import math
+import time
+import queue
+import signal
+import multiprocessing
+from collections import deque
+import pandas as pd
+from config import (DATABASE_NAME, BATCH_FORECAST_HORIZONS, BATCH_FORECAST_MAX_WORKERS,
+                    BATCH_FORECAST_TIMEOUT_SECONDS)
+from database_manager import get_database_manager
+from series_catalog import get_catalog
+from ml_core.forecaster import simulate_forecast
+
+# Folga (s) além do tempo máximo antes de dar como perdido um processo que não respondeu
+# (o próprio processo interrompe a tarefa no tempo máximo; a folga cobre a inicialização)
+HARD_TIMEOUT_GRACE_SECONDS = 30
+
+FORECAST_COLUMNS = ['indicator', 'horizon', 'date', 'value', 'lower_bound', 'upper_bound', 'tipo']
+
+
+class ForecastTimeout(BaseException):
+    """
+    Tempo máximo da previsão de uma série esgotado
+
+    Deriva de BaseException para não ser tratado como erro do Prophet pelo
+    simulate_forecast (que cairia na previsão simples em vez de interromper).
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise ForecastTimeout()
+
+
+def available_cpus() -> int:
+    """Núcleos disponíveis para o processo (respeita a afinidade de CPU, quando houver)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _forecast_indicator(indicator: str, horizons: list, db_path: str, timeout, use_cache: bool) -> dict:
+    """
+    Previsão de uma série em todos os horizontes (executada no processo de trabalho)
+
+    O modelo é ajustado uma vez, no maior horizonte; os horizontes menores são os
+    primeiros períodos dessa mesma previsão. Erros são devolvidos no resultado em
+    vez de propagados, para não afetar as outras séries do lote.
+    """
+    started = time.perf_counter()
+    use_alarm = bool(timeout) and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(max(1, math.ceil(timeout)))
+    try:
+        data = get_database_manager(db_path).load_data(indicator, resolution='monthly')
+        if data is None or data.empty:
+            raise ValueError("nenhum dado disponível")
+
+        forecast = simulate_forecast(data, max(horizons), use_cache)
+        if forecast.empty:
+            raise ValueError("previsão vazia")
+
+        forecasts = {horizon: forecast.head(horizon) for horizon in horizons}
+        return {'indicator': indicator, 'forecasts': forecasts, 'error': None,
+                'seconds': time.perf_counter() - started}
+    except ForecastTimeout:
+        error = f"tempo máximo de {timeout}s esgotado"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+    return {'indicator': indicator, 'forecasts': {}, 'error': error,
+            'seconds': time.perf_counter() - started}
+
+
+def _new_pool(workers):
+    # spawn em vez de fork: o processo principal pode ter conexões SQLite abertas e
+    # threads (gravador único, agendador) que não sobrevivem a um fork
+    return multiprocessing.get_context('spawn').Pool(workers)
+
+
+def forecast_all(indicators=None, horizons=BATCH_FORECAST_HORIZONS, db_path=DATABASE_NAME,
+                 max_workers=BATCH_FORECAST_MAX_WORKERS, timeout=BATCH_FORECAST_TIMEOUT_SECONDS,
+                 use_cache=True):
+    """
+    Previsão de várias séries em paralelo, em um pool de processos
+
+    Cada série é uma tarefa independente: uma série que falha ou passa do tempo
+    máximo entra em failures sem interromper as demais. Há no máximo uma tarefa em
+    execução por processo, então o prazo de cada tarefa conta a partir do envio;
+    um processo que não responde nem depois do prazo é dado como perdido e, quando
+    todos se perdem, o pool é recriado.
+
+    Args:
+        indicators: Séries a prever (padrão: todas as séries do catálogo)
+        horizons: Horizontes da previsão, em meses
+        db_path: Arquivo do banco de dados
+        max_workers: Número de processos (padrão: núcleos disponíveis)
+        timeout: Tempo máximo (s) da previsão de cada série (None = sem limite)
+        use_cache: Se False, ajusta todos os modelos de novo (ignora o cache de modelos)
+
+    Returns:
+        tuple: (DataFrame com as colunas FORECAST_COLUMNS, {série: mensagem de erro})
+    """
+    if indicators is None:
+        indicators = get_catalog(db_path).names()
+    indicators = list(dict.fromkeys(indicators))
+    horizons = sorted({int(horizon) for horizon in horizons})
+    if not horizons or horizons[0] <= 0:
+        raise ValueError("Os horizontes devem ser inteiros positivos")
+    if not indicators:
+        return pd.DataFrame(columns=FORECAST_COLUMNS), {}
+
+    workers = max(1, min(max_workers or available_cpus(), len(indicators)))
+    print(f"🔮 Previsão em lote: {len(indicators)} séries, horizontes {horizons}, {workers} processos")
+
+    started = time.perf_counter()
+    results = queue.Queue()
+    pending = deque(indicators)
+    deadlines = {}
+    timed_out = set()
+    frames = []
+    failures = {}
+    lost = 0
+
+    def on_error(indicator):
+        return lambda e: results.put({'indicator': indicator, 'forecasts': {},
+                                      'error': f"{type(e).__name__}: {e}", 'seconds': None})
+
+    pool = _new_pool(workers)
+    try:
+        while pending or deadlines:
+            while pending and len(deadlines) < workers - lost:
+                indicator = pending.popleft()
+                pool.apply_async(_forecast_indicator, (indicator, horizons, db_path, timeout, use_cache),
+                                 callback=results.put, error_callback=on_error(indicator))
+                deadlines[indicator] = (time.monotonic() + timeout + HARD_TIMEOUT_GRACE_SECONDS
+                                        if timeout else None)
+
+            active = [deadline for deadline in deadlines.values() if deadline is not None]
+            wait = max(0.0, min(active) - time.monotonic()) if active else None
+            try:
+                result = results.get(timeout=wait)
+            except queue.Empty:
+                result = None
+
+            if result is not None:
+                indicator = result['indicator']
+                if indicator in timed_out:
+                    # O processo dado como perdido respondeu: volta a ficar disponível
+                    timed_out.discard(indicator)
+                    lost -= 1
+                elif indicator in deadlines:
+                    del deadlines[indicator]
+                    if result['error']:
+                        failures[indicator] = result['error']
+                        print(f"❌ {indicator}: {result['error']}")
+                    else:
+                        for horizon, forecast in result['forecasts'].items():
+                            frames.append(forecast.assign(indicator=indicator, horizon=horizon))
+                        print(f"✅ {indicator}: {result['seconds']:.1f}s")
+
+            now = time.monotonic()
+            for indicator, deadline in list(deadlines.items()):
+                if deadline is not None and now >= deadline:
+                    del deadlines[indicator]
+                    timed_out.add(indicator)
+                    failures[indicator] = f"sem resposta em {timeout + HARD_TIMEOUT_GRACE_SECONDS}s"
+                    print(f"❌ {indicator}: {failures[indicator]}")
+                    lost += 1
+
+            if lost >= workers:
+                pool.terminate()
+                pool = _new_pool(workers)
+                timed_out.clear()
+                lost = 0
+    finally:
+        if timed_out:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+
+    forecasts = (pd.concat(frames, ignore_index=True)[FORECAST_COLUMNS] if frames
+                 else pd.DataFrame(columns=FORECAST_COLUMNS))
+    print(f"🏁 Previsão em lote concluída em {time.perf_counter() - started:.1f}s: "
+          f"{len(indicators) - len(failures)} séries ok, {len(failures)} falhas")
+    return forecasts, failures
+
+
+if __name__ == "__main__":
+    # Uso: python -m ml_core.batch_forecast [série ...] [--horizons=6,12,24] [--workers=N]
+    #                                       [--timeout=S] [--db=banco.db] [--output=previsoes.csv]
+    #                                       [--no-cache]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    names = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    forecasts, failures = forecast_all(
+        names or None,
+        horizons=[int(h) for h in options['horizons'].split(',')] if 'horizons' in options else BATCH_FORECAST_HORIZONS,
+        db_path=options.get('db', DATABASE_NAME),
+        max_workers=int(options['workers']) if 'workers' in options else BATCH_FORECAST_MAX_WORKERS,
+        timeout=float(options['timeout']) if 'timeout' in options else BATCH_FORECAST_TIMEOUT_SECONDS,
+        use_cache='--no-cache' not in sys.argv,
+    )
+    output = options.get('output', 'previsoes.csv')
+    forecasts.to_csv(output, index=False)
+    print(f"💾 {len(forecasts)} linhas gravadas em {output}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,248 @@
+# Arquivo: ml_core/fast_forecast.py
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from config import FAST_FORECAST_METHOD, FAST_FORECAST_INTERVAL_WIDTH, FAST_FORECAST_MAX_HISTORY
+
+FAST_FORECAST_METHODS = ('ets', 'seasonal_naive', 'ar')
+
+# Grade de parâmetros do Holt-Winters aditivo com tendência amortecida, na forma de
+# correção de erro: alpha (nível), beta como fração de alpha (tendência) e gamma
+# (sazonalidade). Todas as combinações são ajustadas de uma vez e cada série fica
+# com a de menor erro quadrático um passo à frente.
+ETS_ALPHAS = np.array([0.05, 0.2, 0.4, 0.6, 0.8, 0.95])
+ETS_BETA_FRACTIONS = np.array([0.0, 0.05, 0.2])
+ETS_GAMMAS = np.array([0.01, 0.1, 0.3])
+ETS_DAMPING = 0.98
+
+
+def season_length(freq) -> int:
+    """Número de períodos de um ciclo sazonal anual para a frequência pandas"""
+    if not freq:
+        return 1
+    code = pd.tseries.frequencies.to_offset(freq).name.split('-')[0].upper()
+    if code.lstrip('B').startswith('Q'):
+        return 4
+    if code.lstrip('CB').startswith('M'):
+        return 12
+    if code.startswith('W'):
+        return 52
+    return 1
+
+
+def _ets(Y, periods, m):
+    """
+    Holt-Winters aditivo amortecido sobre Y (n, T), com todas as combinações da
+    grade ajustadas em uma única passada (arrays de forma (n, k))
+    """
+    n, T = Y.shape
+    if T < 2 * m:
+        m = 1
+    gammas = ETS_GAMMAS if m > 1 else np.zeros(1)
+    a, f, g = (grid.ravel() for grid in np.meshgrid(ETS_ALPHAS, ETS_BETA_FRACTIONS, gammas, indexing='ij'))
+    alpha, beta, gamma = a[None, :], (a * f)[None, :], g[None, :]
+    k = a.size
+
+    # Estado inicial (no instante anterior ao primeiro ponto): tendência pela diferença
+    # entre as médias dos dois primeiros ciclos e sazonalidade do primeiro ciclo sem
+    # a tendência
+    if m > 1:
+        first = Y[:, :m].mean(axis=1)
+        slope = (Y[:, m:2 * m].mean(axis=1) - first) / m
+        offsets = np.arange(m) - (m - 1) / 2
+        level = np.repeat((first - slope * (m + 1) / 2)[:, None], k, axis=1)
+        trend = np.repeat(slope[:, None], k, axis=1)
+        season = np.repeat((Y[:, :m] - first[:, None] - slope[:, None] * offsets).T[:, :, None], k, axis=2)
+    else:
+        slope = Y[:, 1] - Y[:, 0]
+        level = np.repeat((Y[:, 0] - slope)[:, None], k, axis=1)
+        trend = np.repeat(slope[:, None], k, axis=1)
+        season = np.zeros((1, n, k))
+
+    # Os erros do período de inicialização não entram na escolha dos parâmetros
+    # nem na estimativa da variância
+    warmup = m if m > 1 else 2
+    sse = np.zeros((n, k))
+    columns = np.ascontiguousarray(Y.T[:, :, None])
+    for t in range(T):
+        s = season[t % m]
+        damped = ETS_DAMPING * trend
+        error = columns[t] - level - damped - s
+        if t >= warmup:
+            sse += error * error
+        level += damped + alpha * error
+        trend = damped + beta * error
+        s += gamma * error
+
+    best = sse.argmin(axis=1)
+    rows = np.arange(n)
+    alpha, beta, gamma = alpha[0, best][:, None], beta[0, best][:, None], gamma[0, best][:, None]
+    sigma = np.sqrt(sse[rows, best] / (T - warmup))[:, None]
+
+    steps = np.arange(1, periods + 1)
+    phi_sums = np.cumsum(ETS_DAMPING ** steps)
+    slots = (T + steps - 1) % m
+    mean = (level[rows, best][:, None] + trend[rows, best][:, None] * phi_sums[None, :]
+            + season[slots][:, rows, best].T)
+
+    # Variância h passos à frente: sigma² (1 + soma dos c_j² para j < h)
+    c = alpha + beta * phi_sums[None, :] + gamma * (steps % m == 0)[None, :]
+    spread = np.sqrt(np.concatenate([np.ones((n, 1)), 1 + np.cumsum(c[:, :-1] ** 2, axis=1)], axis=1))
+    return mean, sigma * spread
+
+
+def _seasonal_naive(Y, periods, m):
+    n, T = Y.shape
+    if T <= m:
+        m = 1
+    steps = np.arange(1, periods + 1)
+    mean = Y[:, T - m + (steps - 1) % m]
+    sigma = np.sqrt(np.mean((Y[:, m:] - Y[:, :-m]) ** 2, axis=1))[:, None]
+    spread = np.sqrt((steps - 1) // m + 1)[None, :]
+    return mean, sigma * spread
+
+
+def _ar(Y, periods, m, order=None):
+    n, T = Y.shape
+    p = max(1, min(order or max(m, 2), (T - 2) // 3))
+
+    # Regressão de y_t sobre [1, y_{t-1}, ..., y_{t-p}], resolvida para todas as séries
+    # de uma vez pelas equações normais (com uma regularização mínima)
+    lags = sliding_window_view(Y, p, axis=1)[:, :-1, ::-1]
+    X = np.concatenate([np.ones(lags.shape[:2] + (1,)), lags], axis=2)
+    y = Y[:, p:]
+    XtX = np.einsum('ntk,ntl->nkl', X, X)
+    XtX += 1e-10 * np.trace(XtX, axis1=1, axis2=2)[:, None, None] * np.eye(p + 1)
+    coef = np.linalg.solve(XtX, np.einsum('ntk,nt->nk', X, y)[:, :, None])[:, :, 0]
+    sigma = np.sqrt(np.mean((y - np.einsum('ntk,nk->nt', X, coef)) ** 2, axis=1))[:, None]
+
+    history = Y[:, ::-1][:, :p].copy()
+    mean = np.empty((n, periods))
+    for h in range(periods):
+        mean[:, h] = coef[:, 0] + np.einsum('nk,nk->n', coef[:, 1:], history)
+        history = np.concatenate([mean[:, h:h + 1], history[:, :-1]], axis=1)
+
+    # Pesos psi da representação MA: variância h passos à frente = sigma² soma(psi_j²)
+    phi = coef[:, 1:]
+    psi = np.zeros((n, periods))
+    psi[:, 0] = 1.0
+    for j in range(1, periods):
+        i = min(j, p)
+        psi[:, j] = np.einsum('nk,nk->n', phi[:, :i], psi[:, j - 1::-1][:, :i])
+    return mean, sigma * np.sqrt(np.cumsum(psi ** 2, axis=1))
+
+
+def forecast_arrays(Y, periods: int, method: str = FAST_FORECAST_METHOD, season: int = 12,
+                    interval_width: float = FAST_FORECAST_INTERVAL_WIDTH, ar_order: int = None) -> dict:
+    """
+    Previsão vetorizada de várias séries de mesmo tamanho
+
+    Args:
+        Y: Array (séries, períodos) sem valores faltantes
+        periods: Número de períodos a prever
+        method: 'ets' (Holt-Winters aditivo amortecido), 'seasonal_naive' ou 'ar'
+        season: Períodos de um ciclo sazonal (1 = sem sazonalidade)
+        interval_width: Cobertura do intervalo de previsão (como o interval_width do Prophet)
+        ar_order: Ordem do modelo AR (padrão: um ciclo sazonal)
+
+    Returns:
+        dict: Arrays (séries, periods) 'mean', 'lower' e 'upper'
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype='float64'))
+    if Y.shape[1] < 3:
+        raise ValueError(f"Dados insuficientes ({Y.shape[1]} pontos)")
+    season = max(1, int(season))
+
+    if method == 'ets':
+        mean, scale = _ets(Y, periods, season)
+    elif method == 'seasonal_naive':
+        mean, scale = _seasonal_naive(Y, periods, season)
+    elif method == 'ar':
+        mean, scale = _ar(Y, periods, season, ar_order)
+    else:
+        raise ValueError(f"Método desconhecido: {method} (use {', '.join(FAST_FORECAST_METHODS)})")
+
+    z = NormalDist().inv_cdf(0.5 + interval_width / 2)
+    return {'mean': mean, 'lower': mean - z * scale, 'upper': mean + z * scale}
+
+
+def _prepare(data: pd.DataFrame, max_history):
+    dates = pd.DatetimeIndex(data['date'])
+    values = data['value'].to_numpy(dtype='float64')
+    if not dates.is_monotonic_increasing:
+        order = np.argsort(dates.asi8, kind='stable')
+        dates, values = dates[order], values[order]
+    valid = ~np.isnan(values) & ~dates.isna()
+    if not valid.all():
+        dates, values = dates[valid], values[valid]
+    if max_history:
+        dates, values = dates[-max_history:], values[-max_history:]
+    # A frequência é inferida só pelo fim da série, que é o que se projeta
+    freq = pd.infer_freq(dates[-25:]) if len(dates) >= 3 else None
+    return dates, values, freq or 'MS'
+
+
+def fast_forecast_many(series: dict, periods: int, method: str = FAST_FORECAST_METHOD,
+                       interval_width: float = FAST_FORECAST_INTERVAL_WIDTH,
+                       max_history: int = FAST_FORECAST_MAX_HISTORY) -> dict:
+    """
+    Previsão rápida de várias séries, ajustadas juntas
+
+    As séries com o mesmo número de pontos e a mesma frequência são empilhadas e
+    previstas em uma única chamada de forecast_arrays.
+
+    Args:
+        series: {nome: DataFrame com colunas 'date' e 'value'}
+        periods: Número de períodos a prever
+        method: 'ets', 'seasonal_naive' ou 'ar'
+        interval_width: Cobertura do intervalo de previsão
+        max_history: Máximo de pontos mais recentes usados por série (None = todos)
+
+    Returns:
+        dict: {nome: DataFrame com date, value, lower_bound, upper_bound e tipo};
+        séries com menos de 3 pontos ficam com um DataFrame vazio
+    """
+    groups = {}
+    results = {}
+    for name, data in series.items():
+        dates, values, freq = _prepare(data, max_history)
+        if len(values) < 3:
+            results[name] = pd.DataFrame()
+            continue
+        groups.setdefault((len(values), freq), []).append((name, dates, values))
+
+    for (_, freq), members in groups.items():
+        forecast = forecast_arrays(np.stack([values for _, _, values in members]), periods, method,
+                                   season_length(freq), interval_width)
+        future = {}
+        for i, (name, dates, _) in enumerate(members):
+            if dates[-1] not in future:
+                future[dates[-1]] = pd.date_range(dates[-1], periods=periods + 1, freq=freq)[1:]
+            results[name] = pd.DataFrame({
+                'date': future[dates[-1]],
+                'value': forecast['mean'][i],
+                'lower_bound': forecast['lower'][i],
+                'upper_bound': forecast['upper'][i],
+                'tipo': 'Previsão Rápida'
+            })
+    return {name: results[name] for name in series}
+
+
+def fast_forecast(data: pd.DataFrame, periods: int, method: str = FAST_FORECAST_METHOD,
+                  interval_width: float = FAST_FORECAST_INTERVAL_WIDTH,
+                  max_history: int = FAST_FORECAST_MAX_HISTORY) -> pd.DataFrame:
+    """
+    Previsão rápida (NumPy) de uma série, no mesmo formato de simulate_forecast
+
+    Args:
+        data: DataFrame com colunas 'date' e 'value'
+        periods: Número de períodos a prever
+        method: 'ets', 'seasonal_naive' ou 'ar'
+        interval_width: Cobertura do intervalo de previsão
+        max_history: Máximo de pontos mais recentes usados (None = todos)
+
+    Returns:
+        pd.DataFrame: Datas, valores previstos e limites do intervalo
+    """
+    return fast_forecast_many({'serie': data}, periods, method, interval_width, max_history)['serie']
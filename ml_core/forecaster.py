@@ -1,5 +1,8 @@
 import pandas as pd
-from prophet import Prophet
+from config import MODEL_CACHE_ENABLED, FORECAST_FREQUENCY
+from ml_core.model_cache import get_model_cache
+from ml_core.fast_forecast import fast_forecast
+from ml_core.preprocessing import prepare_history, PANDAS_FREQUENCIES
 
 
 # Verificar disponibilidade do Prophet
@@ -10,13 +13,62 @@ except ImportError:
     PROPHET_AVAILABLE = False
     print("⚠️ Prophet não disponível, usando método alternativo")
 
-def simulate_forecast(indicator_or_data, periods: int) -> pd.DataFrame:
+# Configuração do modelo Prophet (faz parte da chave do cache de modelos)
+PROPHET_CONFIG = {
+    'yearly_seasonality': True,
+    'weekly_seasonality': False,
+    'daily_seasonality': False
+}
+
+def fit_prophet(history_df: pd.DataFrame, config: dict = PROPHET_CONFIG, use_cache: bool = True) -> 'Prophet':
+    """
+    Ajusta um modelo Prophet, ou reaproveita do cache o modelo já ajustado com o
+    mesmo histórico e a mesma configuração.
+    
+    Args:
+        history_df: DataFrame com as colunas 'ds' e 'y'
+        config: Parâmetros do construtor do Prophet
+        use_cache: Se False, sempre ajusta um modelo novo
+
+    Returns:
+        Prophet: Modelo ajustado.
+    """
+    cache = get_model_cache() if use_cache and MODEL_CACHE_ENABLED else None
+    if cache is not None:
+        key = cache.key(history_df, config)
+        forecaster = cache.get(key)
+        if forecaster is not None:
+            print("♻️ Modelo Prophet reaproveitado do cache")
+            return forecaster
+    
+    forecaster = Prophet(**config)
+    forecaster.fit(history_df)
+    
+    if cache is not None:
+        try:
+            cache.put(key, forecaster)
+        except Exception as e:
+            print(f"⚠️ Não foi possível guardar o modelo no cache: {e}")
+    return forecaster
+
+def simulate_forecast(indicator_or_data, periods: int, use_cache: bool = True, engine: str = 'prophet',
+                      frequency: str = FORECAST_FREQUENCY) -> pd.DataFrame:
     """
     Gera previsão usando Prophet ou dados diretos.
     
+    O modelo ajustado fica no cache de modelos: repetir a previsão com o mesmo
+    histórico (mudando só o horizonte, por exemplo) executa apenas o predict.
+    Com engine='fast', a previsão usa o Holt-Winters em NumPy de fast_forecast
+    (poucos milissegundos, para uso interativo) em vez do Prophet. Antes do ajuste,
+    o histórico é agregado à frequência da previsão (séries diárias viram médias
+    mensais) e limitado aos pontos mais recentes (ver preprocessing.prepare_history).
+    
     Args:
         indicator_or_data: Nome do indicador (str) ou DataFrame com dados históricos
         periods (int): Número de períodos para prever.
+        use_cache (bool): Se False, ajusta o modelo de novo mesmo que esteja em cache.
+        engine (str): 'prophet' (análise completa) ou 'fast' (previsão rápida em NumPy).
+        frequency (str): Frequência da previsão ('monthly', 'quarterly' ou 'yearly').
 
     Returns:
         pd.DataFrame: DataFrame contendo as datas e valores da previsão.
@@ -24,9 +76,9 @@ def simulate_forecast(indicator_or_data, periods: int) -> pd.DataFrame:
     
     # Se recebeu string (nome do indicador), carregar dados
     if isinstance(indicator_or_data, str):
-        from database_manager import DatabaseManager
-        db = DatabaseManager()
-        data = db.load_data(indicator_or_data)
+        from database_manager import get_database_manager
+        db = get_database_manager()
+        data = db.load_data(indicator_or_data, resolution=frequency)
         if data is None or data.empty:
             print(f"❌ Nenhum dado disponível para {indicator_or_data}")
             return pd.DataFrame()
@@ -38,34 +90,34 @@ def simulate_forecast(indicator_or_data, periods: int) -> pd.DataFrame:
         print("❌ DataFrame vazio fornecido")
         return pd.DataFrame()
 
+    if engine not in ('prophet', 'fast'):
+        raise ValueError(f"Motor de previsão desconhecido: {engine} (use 'prophet' ou 'fast')")
+
+    # Agregar à frequência da previsão e limitar o histórico antes do ajuste
+    data = prepare_history(data, frequency)
+
+    if engine == 'fast':
+        return fast_forecast(data, periods)
+
     if PROPHET_AVAILABLE:
         try:
-            # Preparar dados para Prophet
-            history_df = data[['date', 'value']].copy()
-            history_df.rename(columns={'date': 'ds', 'value': 'y'}, inplace=True)
-            
-            # Remover valores nulos
-            history_df = history_df.dropna()
+            # Preparar dados para Prophet (já sem valores nulos)
+            history_df = data.rename(columns={'date': 'ds', 'value': 'y'})
             
             if len(history_df) < 10:
                 print(f"❌ Dados insuficientes ({len(history_df)} pontos)")
-                return create_simple_forecast(data, periods)
+                return create_simple_forecast(data, periods, frequency)
             
             print(f"📈 Gerando previsão Prophet ({len(history_df)} pontos, {periods} períodos)")
             
-            # Criar e treinar modelo Prophet
-            forecaster = Prophet(
-                yearly_seasonality=True,
-                weekly_seasonality=False,
-                daily_seasonality=False
-            )
-            forecaster.fit(history_df)
+            # Criar e treinar modelo Prophet (ou reaproveitar o já ajustado)
+            forecaster = fit_prophet(history_df, PROPHET_CONFIG, use_cache)
             
             # Criar período futuro
             forecasting_period = forecaster.make_future_dataframe(
                 periods=periods, 
                 include_history=False, 
-                freq='ME'  # Monthly End
+                freq=PANDAS_FREQUENCIES[frequency]  # início do período, como o histórico
             )
             
             # Fazer previsão
@@ -86,18 +138,19 @@ def simulate_forecast(indicator_or_data, periods: int) -> pd.DataFrame:
         except Exception as e:
             print(f"❌ Erro no Prophet: {e}")
             print("🔄 Usando método alternativo...")
-            return create_simple_forecast(data, periods)
+            return create_simple_forecast(data, periods, frequency)
     else:
         # Usar método alternativo se Prophet não disponível
-        return create_simple_forecast(data, periods)
+        return create_simple_forecast(data, periods, frequency)
 
-def create_simple_forecast(data: pd.DataFrame, periods: int) -> pd.DataFrame:
+def create_simple_forecast(data: pd.DataFrame, periods: int, frequency: str = FORECAST_FREQUENCY) -> pd.DataFrame:
     """
     Método alternativo simples de previsão usando tendência linear.
     
     Args:
         data: DataFrame com colunas 'date' e 'value'
         periods: Número de períodos para prever
+        frequency: Frequência da previsão ('monthly', 'quarterly' ou 'yearly')
         
     Returns:
         DataFrame com previsões
@@ -123,12 +176,13 @@ def create_simple_forecast(data: pd.DataFrame, periods: int) -> pd.DataFrame:
         last_value = recent_data['value'].iloc[-1]
         last_date = recent_data['date'].iloc[-1]
         
-        # Gerar datas futuras (assumindo frequência mensal)
+        # Gerar datas futuras no início de cada período, como o histórico preparado
         future_dates = pd.date_range(
-            start=last_date + pd.DateOffset(months=1),
-            periods=periods,
-            freq='M'
+            start=last_date,
+            periods=periods + 1,
+            freq=PANDAS_FREQUENCIES[frequency]
         )
+        future_dates = future_dates[future_dates > last_date][:periods]
         
         # Gerar previsões com tendência
         predictions = []
@@ -0,0 +1,149 @@
+# Arquivo: ml_core/model_cache.py
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from config import MODEL_CACHE_DIR, MODEL_CACHE_MAX_BYTES, MODEL_CACHE_MEMORY_ENTRIES
+
+try:
+    from prophet import __version__ as PROPHET_VERSION
+    from prophet.serialize import model_to_json, model_from_json
+except ImportError:
+    PROPHET_VERSION = None
+
+
+class ModelCache:
+    """
+    Cache em disco dos modelos Prophet ajustados
+
+    A chave é o hash do histórico (datas e valores) com a configuração do modelo e a
+    versão do Prophet: o mesmo histórico com as mesmas opções reaproveita o modelo e
+    só precisa de predict. Cada modelo é gravado em JSON (prophet.serialize); quando
+    a pasta passa de max_bytes, os modelos usados há mais tempo são removidos. Os
+    modelos usados mais recentemente também ficam em memória, sem precisar reler o JSON.
+    """
+
+    def __init__(self, cache_dir=MODEL_CACHE_DIR, max_bytes=MODEL_CACHE_MAX_BYTES,
+                 memory_entries=MODEL_CACHE_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+    def key(self, history_df: pd.DataFrame, config: dict) -> str:
+        """
+        Chave do modelo ajustado para um histórico e uma configuração
+
+        Args:
+            history_df: DataFrame com as colunas 'ds' e 'y' usado no ajuste
+            config: Parâmetros do construtor do Prophet
+        """
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(history_df['ds'].to_numpy(dtype='datetime64[ns]')).view('int64').tobytes())
+        digest.update(np.ascontiguousarray(history_df['y'].to_numpy(dtype='float64')).tobytes())
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(str(PROPHET_VERSION).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Modelo ajustado da chave, ou None se não estiver em cache"""
+        with self._lock:
+            model = self._memory.get(key)
+            if model is not None:
+                self._memory.move_to_end(key)
+                self.stats['hits'] += 1
+                return model
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                model = model_from_json(f.read())
+            # Data de modificação marca o último uso (ordem de remoção)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+
+        with self._lock:
+            self.stats['hits'] += 1
+            self._remember(key, model)
+        return model
+
+    def put(self, key, model):
+        """Grava o modelo ajustado e remove os mais antigos se o cache passar do limite"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(model_to_json(model))
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.stats['stored'] += 1
+            self._remember(key, model)
+        self._evict()
+
+    def _remember(self, key, model):
+        self._memory[key] = model
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Remove os modelos usados há mais tempo até o cache caber em max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self._memory.pop(name[:-len('.json')], None)
+                self.stats['evicted'] += 1
+
+    def size(self):
+        """Bytes ocupados pelos modelos em disco"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        return sum(os.path.getsize(os.path.join(self.cache_dir, name))
+                   for name in os.listdir(self.cache_dir) if name.endswith('.json'))
+
+    def hit_rate(self):
+        """Fração dos ajustes evitados pelo cache"""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_model_cache():
+    """Cache de modelos compartilhado pelo processo"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ModelCache()
+        return _cache
@@ -0,0 +1,109 @@
+# Arquivo: ml_core/preprocessing.py
+import numpy as np
+import pandas as pd
+from config import FORECAST_FREQUENCY, FORECAST_MAX_HISTORY
+
+# Ordem das frequências, da mais fina para a mais grossa, e o passo de cada uma em meses
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'quarterly', 'yearly')
+PERIOD_MONTHS = {'monthly': 1, 'quarterly': 3, 'yearly': 12}
+
+# Frequência pandas das datas geradas (início do período, como os agregados do banco)
+PANDAS_FREQUENCIES = {'monthly': 'MS', 'quarterly': 'QS', 'yearly': 'YS'}
+
+# Intervalo mediano máximo (em dias) entre observações de cada frequência
+_MAX_MEDIAN_GAP_DAYS = (('daily', 4), ('weekly', 10), ('monthly', 45), ('quarterly', 135))
+
+
+def infer_frequency(dates) -> str:
+    """
+    Frequência nativa de uma série pelo intervalo mediano entre as datas
+
+    O intervalo mediano é robusto a feriados e a meses sem publicação, que fazem o
+    pd.infer_freq desistir em séries diárias de dias úteis.
+
+    Returns:
+        str: 'daily', 'weekly', 'monthly', 'quarterly' ou 'yearly'
+    """
+    days = np.unique(np.asarray(dates, dtype='datetime64[D]'))
+    if len(days) < 2:
+        return FORECAST_FREQUENCY
+    gap = np.median(np.diff(days).astype('int64'))
+    for frequency, max_gap in _MAX_MEDIAN_GAP_DAYS:
+        if gap <= max_gap:
+            return frequency
+    return 'yearly'
+
+
+def _aggregate(dates, values, frequency, aggregate):
+    """Agrega arrays (datetime64[D] em ordem, float64) ao início de cada período"""
+    months = dates.astype('datetime64[M]').astype('int64')
+    months -= months % PERIOD_MONTHS[frequency]
+    periods, starts = np.unique(months, return_index=True)
+
+    if aggregate == 'mean':
+        result = np.add.reduceat(values, starts) / np.diff(np.append(starts, len(values)))
+    elif aggregate == 'last':
+        result = values[np.append(starts[1:], len(values)) - 1]
+    elif aggregate == 'min':
+        result = np.minimum.reduceat(values, starts)
+    elif aggregate == 'max':
+        result = np.maximum.reduceat(values, starts)
+    else:
+        raise ValueError(f"Agregado desconhecido: {aggregate}")
+    return periods.astype('datetime64[M]').astype('datetime64[D]'), result
+
+
+def _sorted_arrays(data):
+    dates = data['date'].to_numpy(dtype='datetime64[D]')
+    values = data['value'].to_numpy(dtype='float64')
+    if len(dates) > 1 and (np.diff(dates.astype('int64')) < 0).any():
+        order = np.argsort(dates, kind='stable')
+        dates, values = dates[order], values[order]
+    return dates, values
+
+
+def aggregate_to(data: pd.DataFrame, frequency: str, aggregate: str = 'mean') -> pd.DataFrame:
+    """
+    Agrega uma série ao início de cada mês, trimestre ou ano
+
+    Args:
+        data: DataFrame com colunas 'date' e 'value' (sem valores faltantes)
+        frequency: 'monthly', 'quarterly' ou 'yearly'
+        aggregate: 'mean', 'last', 'min' ou 'max' (como nos agregados do banco)
+    """
+    periods, values = _aggregate(*_sorted_arrays(data), frequency, aggregate)
+    return pd.DataFrame({'date': periods.astype('datetime64[ns]'), 'value': values})
+
+
+def prepare_history(data: pd.DataFrame, frequency: str = FORECAST_FREQUENCY, aggregate: str = 'mean',
+                    max_history: dict = FORECAST_MAX_HISTORY) -> pd.DataFrame:
+    """
+    Prepara o histórico de uma série para o ajuste do modelo de previsão
+
+    Remove valores faltantes, agrega a série à frequência da previsão quando a
+    frequência nativa é mais fina (séries diárias viram médias mensais, por exemplo)
+    e mantém só os pontos mais recentes permitidos pela política de histórico. Séries
+    na própria frequência da previsão só têm as datas levadas ao início do período;
+    séries mais grossas não são alteradas.
+
+    Args:
+        data: DataFrame com colunas 'date' e 'value'
+        frequency: Frequência da previsão ('monthly', 'quarterly' ou 'yearly')
+        aggregate: Agregado usado ao reduzir a frequência
+        max_history: Máximo de pontos por frequência ({frequência: pontos}; None = sem limite)
+
+    Returns:
+        pd.DataFrame: Colunas 'date' e 'value', em ordem de data
+    """
+    dates, values = _sorted_arrays(data)
+    valid = ~np.isnan(values) & ~np.isnat(dates)
+    if not valid.all():
+        dates, values = dates[valid], values[valid]
+
+    if len(dates) and FREQUENCIES.index(infer_frequency(dates)) <= FREQUENCIES.index(frequency):
+        dates, values = _aggregate(dates, values, frequency, aggregate)
+
+    limit = (max_history or {}).get(frequency)
+    if limit:
+        dates, values = dates[-limit:], values[-limit:]
+    return pd.DataFrame({'date': dates.astype('datetime64[ns]'), 'value': values})
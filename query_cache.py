@@ -0,0 +1,140 @@
+# Arquivo: query_cache.py
+import os
+import threading
+from collections import OrderedDict
+from config import DATABASE_NAME, QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_MAX_BYTES
+
+class QueryCache:
+    """
+    Cache LRU em memória das leituras de séries do banco de dados
+
+    As entradas são indexadas por série, período e colunas, e guardam a versão da
+    série no momento da leitura. save_data incrementa a versão da série gravada, o
+    que invalida todas as suas entradas sem precisar percorrer o cache.
+
+    Gravações de outros processos (agendador, outros workers) são detectadas por
+    sync: quando o contador de alterações do banco muda, os metadados das séries
+    são relidos e as séries com conteúdo diferente têm a versão incrementada.
+    """
+
+    def __init__(self, max_entries=QUERY_CACHE_MAX_ENTRIES, max_bytes=QUERY_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._data_version = None
+        self._tokens = {}
+        self._bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'invalidated': 0, 'evicted': 0}
+
+    def version(self, series):
+        """Versão atual dos dados de uma série"""
+        return self._versions.get(series, 0)
+
+    def bump(self, series):
+        """Marca os dados da série como alterados (invalida as leituras em cache)"""
+        with self._lock:
+            self._versions[series] = self._versions.get(series, 0) + 1
+
+    def sync(self, data_version, load_tokens):
+        """
+        Invalida as séries alteradas por outras conexões desde a última verificação
+
+        Args:
+            data_version: Contador de alterações atual do banco (PRAGMA data_version)
+            load_tokens: Função sem argumentos que devolve {série: marca do conteúdo},
+                chamada só quando o contador mudou
+        """
+        with self._lock:
+            if data_version == self._data_version:
+                return
+        tokens = load_tokens()
+        with self._lock:
+            for series in set(tokens) | set(self._tokens):
+                if tokens.get(series) != self._tokens.get(series):
+                    self._versions[series] = self._versions.get(series, 0) + 1
+            self._tokens = tokens
+            self._data_version = data_version
+
+    def get(self, key):
+        """
+        Busca uma leitura no cache
+
+        Args:
+            key: Tupla (série, início, fim, colunas)
+
+        Returns:
+            Dict {coluna: np.ndarray} ou None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            version, arrays, size = entry
+            if version != self._versions.get(key[0], 0):
+                self._discard(key)
+                self.stats['invalidated'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return arrays
+
+    def put(self, key, version, arrays):
+        """
+        Guarda uma leitura feita na versão informada da série
+
+        Os arrays passam a ser somente leitura, pois são compartilhados entre chamadas.
+        """
+        size = sum(values.nbytes for values in arrays.values())
+        if size > self.max_bytes:
+            return
+        for values in arrays.values():
+            values.setflags(write=False)
+
+        with self._lock:
+            # Gravação concorrente: a leitura já nasceu desatualizada
+            if version != self._versions.get(key[0], 0):
+                return
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (version, arrays, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.stats['evicted'] += 1
+
+    def _discard(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def memory_usage(self):
+        """Bytes ocupados pelos arrays em cache"""
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def hit_rate(self):
+        """Fração das leituras atendidas pelo cache"""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_query_cache(db_path=DATABASE_NAME):
+    """Cache de leituras compartilhado (um por arquivo de banco de dados no processo)"""
+    key = os.path.abspath(db_path)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = QueryCache()
+        return _caches[key]
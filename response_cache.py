@@ -0,0 +1,172 @@
+# Arquivo: response_cache.py
+import os
+import json
+import time
+import threading
+from datetime import date, datetime
+from config import BCB_CACHE_DIR, BCB_CACHE_TTL_SECONDS, BCB_CACHE_MAX_BYTES, BCB_CACHE_MAX_AGE_SECONDS
+
+# Intervalo mínimo (s) entre duas limpezas da pasta do cache feitas pelo put
+CLEANUP_INTERVAL_SECONDS = 60
+
+# Nome do arquivo das janelas em aberto (que terminam hoje ou depois)
+OPEN_WINDOW = 'aberto'
+
+class ResponseCache:
+    """
+    Cache em disco das respostas da API do BCB
+
+    Cada resposta é guardada por série e janela de datas, com o corpo bruto em um
+    arquivo e os metadados (momento da coleta, ETag, Last-Modified) em outro.
+
+    Janelas que terminam hoje (ou sem data final) têm uma única entrada em aberto por
+    série, que guarda a data inicial pedida: ela atende qualquer janela em aberto que
+    comece nessa data ou depois, também nos dias seguintes (quem lê recorta as datas
+    anteriores ao pedido). A pasta é limitada por idade e por tamanho: entradas
+    gravadas há mais de max_age_seconds são removidas e, acima de max_bytes, as mais
+    antigas saem primeiro.
+    """
+
+    def __init__(self, cache_dir=BCB_CACHE_DIR, ttl_seconds=BCB_CACHE_TTL_SECONDS,
+                 max_bytes=BCB_CACHE_MAX_BYTES, max_age_seconds=BCB_CACHE_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0}
+
+    def _is_open(self, end_date):
+        """Se a janela ainda está em aberto (termina hoje, depois ou sem data final)"""
+        return not end_date or _parse_date(end_date) >= date.today()
+
+    def _paths(self, serie_id, start_date, end_date):
+        """Caminhos do corpo e dos metadados de uma entrada"""
+        if self._is_open(end_date):
+            name = OPEN_WINDOW
+        else:
+            start = start_date.replace('/', '') if start_date else 'inicio'
+            name = f"{start}_{end_date.replace('/', '')}"
+        base = os.path.join(self.cache_dir, str(serie_id), name)
+        return f"{base}.json", f"{base}.meta.json"
+
+    def record(self, stat):
+        """Incrementa um dos contadores de uso do cache"""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get(self, serie_id, start_date, end_date):
+        """
+        Busca uma entrada no cache
+
+        Returns:
+            Dict com 'body' (bytes) e os metadados (inclusive 'start_date', a data
+            inicial da resposta guardada), ou None se não houver entrada que cubra a janela
+        """
+        body_path, meta_path = self._paths(serie_id, start_date, end_date)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Entrada em aberto que começa depois da janela pedida não a cobre
+            stored_start = entry.get('start_date')
+            if self._is_open(end_date) and stored_start and (
+                    not start_date or _parse_date(stored_start) > _parse_date(start_date)):
+                return None
+            with open(body_path, 'rb') as f:
+                entry['body'] = f.read()
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry, frequency):
+        """Verifica se a entrada ainda está dentro do TTL da frequência da série"""
+        ttl = self.ttl_seconds.get(frequency, min(self.ttl_seconds.values()))
+        return time.time() - entry['fetched_at'] < ttl
+
+    def validators(self, entry):
+        """Cabeçalhos para revalidação condicional da entrada"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, serie_id, start_date, end_date, body, etag=None, last_modified=None):
+        """Grava (ou substitui) uma entrada no cache"""
+        body_path, meta_path = self._paths(serie_id, start_date, end_date)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+        meta = {'fetched_at': time.time(), 'start_date': start_date, 'etag': etag, 'last_modified': last_modified}
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        self.record('stored')
+
+        if time.time() - self._last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+            self.cleanup()
+
+    def touch(self, serie_id, start_date, end_date, entry):
+        """Renova o TTL de uma entrada revalidada pelo servidor (HTTP 304)"""
+        _, meta_path = self._paths(serie_id, start_date, end_date)
+        meta = {'fetched_at': time.time(), 'start_date': entry.get('start_date'), 'etag': entry.get('etag'),
+                'last_modified': entry.get('last_modified')}
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def cleanup(self):
+        """
+        Remove as entradas gravadas (ou revalidadas) há mais de max_age_seconds e, se a
+        pasta ainda passar de max_bytes, as mais antigas até caber no limite
+
+        Returns:
+            Número de entradas removidas
+        """
+        self._last_cleanup = time.time()
+        entries = []
+        for folder, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.meta.json'):
+                    continue
+                meta_path = os.path.join(folder, name)
+                body_path = meta_path[:-len('.meta.json')] + '.json'
+                try:
+                    modified = os.stat(meta_path).st_mtime
+                    size = os.stat(body_path).st_size
+                except OSError:
+                    continue
+                entries.append((modified, size, body_path, meta_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        oldest_allowed = self._last_cleanup - self.max_age_seconds
+        removed = 0
+        for modified, size, body_path, meta_path in sorted(entries):
+            if modified >= oldest_allowed and total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        if removed:
+            with self._lock:
+                self.stats['evicted'] += removed
+        return removed
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def hit_rate(self):
+        """Fração das consultas atendidas sem baixar o corpo da resposta"""
+        total = self.stats['hits'] + self.stats['misses'] + self.stats['revalidated']
+        served = self.stats['hits'] + self.stats['revalidated']
+        return served / total if total else 0.0
+
+
+def _parse_date(value):
+    """Data no formato da API ('DD/MM/AAAA')"""
+    return datetime.strptime(value, '%d/%m/%Y').date()
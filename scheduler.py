@@ -0,0 +1,322 @@
+# Arquivo: scheduler.py
+import os
+import sys
+import random
+import threading
+from datetime import datetime, timedelta
+import pandas as pd
+from config import (DATABASE_NAME, SCHEDULER_POLL_SECONDS, SCHEDULER_MAX_CONCURRENT, SCHEDULER_RUN_HOUR,
+                    SCHEDULER_JITTER_SECONDS, SCHEDULER_RETRY_SECONDS, SCHEDULER_RELEASE_WINDOWS,
+                    SCHEDULER_RELEASE_WINDOW_OVERRIDES)
+from connection_manager import get_connection_manager
+from series_catalog import get_catalog
+from data_collector import BCBDataCollector
+from database_manager import get_database_manager
+from collection_pipeline import collect_and_save, collection_lease
+
+# Situação da coleta de cada série, lida pela interface
+STATUS_TABLE = 'collection_status'
+STATUS_COLUMNS = ['name', 'frequency', 'status', 'last_run_at', 'last_success_at', 'next_run_at',
+                  'last_rows', 'elapsed', 'last_error']
+
+# Último sinal de vida do processo agendador
+HEARTBEAT_TABLE = 'scheduler_heartbeat'
+
+# Períodos do pandas usados para saber se uma coleta trouxe um período novo
+PERIOD_ALIASES = {'monthly': 'M', 'quarterly': 'Q', 'yearly': 'Y'}
+
+# Resultados de coleta que pedem nova tentativa antes do horário normal
+FAILED_STATUSES = {'error', 'circuit_open'}
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class CollectionScheduler:
+    """
+    Agendador de coleta em segundo plano, fora da interface
+
+    A cada verificação, as séries vencidas são baixadas e gravadas em pipeline
+    (collect_and_save), com no máximo max_concurrent downloads simultâneos. O próximo
+    horário de cada série depende da sua frequência (ver next_run) e recebe um
+    atraso aleatório, para não concentrar as requisições. A situação de cada série
+    fica na tabela collection_status, que a interface apenas lê.
+
+    Horários em hora local; dias úteis são de segunda a sexta (sem feriados).
+    """
+
+    def __init__(self, db_path=DATABASE_NAME, max_concurrent=SCHEDULER_MAX_CONCURRENT,
+                 poll_seconds=SCHEDULER_POLL_SECONDS, run_hour=SCHEDULER_RUN_HOUR,
+                 jitter_seconds=SCHEDULER_JITTER_SECONDS, retry_seconds=SCHEDULER_RETRY_SECONDS,
+                 last_n_years=5, collector=None, seed=None):
+        self.db_path = db_path
+        self.max_concurrent = max(1, max_concurrent)
+        self.poll_seconds = poll_seconds
+        self.run_hour = run_hour
+        self.jitter_seconds = jitter_seconds
+        self.retry_seconds = retry_seconds
+        self.last_n_years = last_n_years
+        self.random = random.Random(seed)
+        # Se a última verificação encontrou a reserva de coleta com outro processo
+        self.lease_busy = False
+
+        self.db = get_database_manager(db_path)
+        self.catalog = get_catalog(db_path)
+        self.collector = collector or BCBDataCollector(max_workers=self.max_concurrent, catalog=self.catalog)
+        self.connections = get_connection_manager(db_path)
+        _create_status_tables(self.connections)
+
+    def next_run(self, name, frequency, now, new_period=False):
+        """
+        Próximo horário agendado de uma série, sem o atraso aleatório
+
+        - Séries diárias: o próximo dia útil, na hora de coleta
+        - Demais séries: o próximo dia dentro da janela de divulgação do mês, na
+          hora de coleta; depois de uma coleta que trouxe um período novo, a
+          busca recomeça no mês seguinte
+
+        Args:
+            name: Nome da série
+            frequency: Frequência da série no catálogo
+            now: Horário de referência
+            new_period: Se a última coleta trouxe um período ainda não salvo
+        """
+        candidate = now.replace(hour=self.run_hour, minute=0, second=0, microsecond=0)
+        if candidate <= now:
+            candidate += timedelta(days=1)
+
+        if frequency == 'daily':
+            while candidate.weekday() >= 5:
+                candidate += timedelta(days=1)
+            return candidate
+
+        first_day, last_day = SCHEDULER_RELEASE_WINDOW_OVERRIDES.get(
+            name, SCHEDULER_RELEASE_WINDOWS.get(frequency, (1, 31)))
+        if new_period:
+            next_month = (candidate.replace(day=1) + timedelta(days=32)).replace(day=1)
+            candidate = max(candidate, next_month)
+        while not first_day <= candidate.day <= last_day:
+            candidate += timedelta(days=1)
+        return candidate
+
+    def _jitter(self):
+        return timedelta(seconds=self.random.uniform(0, self.jitter_seconds))
+
+    def due(self, now=None):
+        """Séries do catálogo cuja coleta está vencida (nunca coletadas entram primeiro)"""
+        now = now or datetime.now()
+        status = get_collection_status(self.db_path)
+        due = []
+        for name in self.catalog.names():
+            next_run_at = status.get(name, {}).get('next_run_at')
+            if next_run_at is None or next_run_at <= now.strftime(TIMESTAMP_FORMAT):
+                due.append(name)
+        return sorted(due, key=lambda name: status.get(name, {}).get('next_run_at') or '')
+
+    def run_once(self, now=None):
+        """
+        Coleta e grava as séries vencidas e agenda a próxima coleta de cada uma
+
+        Se outro processo estiver coletando (ver collection_lease), a verificação é
+        adiada para a próxima rodada (e lease_busy fica True).
+
+        Returns:
+            Dict {série: situação} das séries coletadas nesta verificação
+        """
+        now = now or datetime.now()
+        self.lease_busy = False
+        names = self.due(now)
+        if not names:
+            return {}
+
+        with collection_lease(self.db_path) as acquired:
+            if not acquired:
+                self.lease_busy = True
+                return {}
+            return self._collect(names, now)
+
+    def _collect(self, names, now):
+        """Coleta das séries vencidas de run_once, com a reserva de coleta obtida"""
+
+        frequencies = self.catalog.frequency_map()
+        before = self.db.get_last_dates(names)
+        self._write_status([{'name': name, 'frequency': frequencies.get(name), 'status': 'running',
+                             'last_run_at': now.strftime(TIMESTAMP_FORMAT)} for name in names])
+
+        date_ranges = self.collector.incremental_date_ranges(before, last_n_years=self.last_n_years)
+        date_ranges = {name: date_ranges[name] for name in names if name in date_ranges}
+        try:
+            saved = collect_and_save(self.collector, self.db, date_ranges, max_workers=self.max_concurrent)
+        except Exception as e:
+            print(f"Erro na coleta agendada: {e}")
+            saved = {}
+        after = self.db.get_last_dates(names)
+
+        finished = datetime.now()
+        rows = []
+        for name in names:
+            frequency = frequencies.get(name)
+            outcome = self.collector.outcomes.get(name) or {'status': 'error', 'rows': 0, 'elapsed': 0.0,
+                                                            'error': 'Série não coletada'}
+            status = outcome['status']
+            if status == 'ok' and not saved.get(name):
+                status, outcome = 'error', dict(outcome, error='Falha ao gravar no banco de dados')
+
+            new_period = _new_period(before.get(name), after.get(name), frequency)
+            if status in FAILED_STATUSES:
+                next_run_at = finished + timedelta(seconds=self.retry_seconds)
+            else:
+                next_run_at = self.next_run(name, frequency, finished, new_period)
+            rows.append({
+                'name': name, 'frequency': frequency, 'status': status,
+                'last_run_at': now.strftime(TIMESTAMP_FORMAT),
+                'last_success_at': finished.strftime(TIMESTAMP_FORMAT) if status not in FAILED_STATUSES else None,
+                'next_run_at': (next_run_at + self._jitter()).strftime(TIMESTAMP_FORMAT),
+                'last_rows': outcome['rows'], 'elapsed': round(outcome['elapsed'], 3),
+                'last_error': outcome['error'],
+            })
+        self._write_status(rows)
+        return {row['name']: row['status'] for row in rows}
+
+    def _write_status(self, rows):
+        """Atualiza as colunas informadas da situação de cada série (as demais são mantidas)"""
+        with self.connections.writer() as conn:
+            for row in rows:
+                columns = list(row)
+                updates = ', '.join(f"{column} = excluded.{column}" for column in columns
+                                    if column != 'name' and (column != 'last_success_at' or row[column]))
+                conn.execute(f"INSERT INTO {STATUS_TABLE} ({', '.join(columns)}) "
+                             f"VALUES ({', '.join('?' * len(columns))}) "
+                             f"ON CONFLICT(name) DO UPDATE SET {updates}", list(row.values()))
+
+    def _beat(self):
+        """Registra o sinal de vida do processo"""
+        with self.connections.writer() as conn:
+            conn.execute(f"INSERT OR REPLACE INTO {HEARTBEAT_TABLE} (id, pid, beat_at) VALUES (1, ?, ?)",
+                         (os.getpid(), datetime.now().strftime(TIMESTAMP_FORMAT)))
+
+    def seconds_until_next(self, now=None):
+        """Segundos até a próxima série vencer (limitado a poll_seconds)"""
+        now = now or datetime.now()
+        pending = [entry['next_run_at'] for entry in get_collection_status(self.db_path).values()
+                   if entry['next_run_at'] and entry['status'] != 'running']
+        if not pending:
+            return self.poll_seconds
+        wait = (datetime.strptime(min(pending), TIMESTAMP_FORMAT) - now).total_seconds()
+        return min(max(wait, 1), self.poll_seconds)
+
+    def run_forever(self, stop_event=None):
+        """Executa verificações até stop_event ser sinalizado (ou o processo ser interrompido)"""
+        stop_event = stop_event or threading.Event()
+        print(f"Agendador de coleta iniciado (até {self.max_concurrent} séries simultâneas)")
+        while not stop_event.is_set():
+            self._beat()
+            try:
+                results = self.run_once()
+                if results:
+                    print(f"{datetime.now():%Y-%m-%d %H:%M:%S} coleta agendada: "
+                          + ', '.join(f"{name}={status}" for name, status in results.items()))
+            except Exception as e:
+                print(f"Erro no agendador de coleta: {e}")
+            # Com a coleta em outro processo, as séries continuam vencidas até ele terminar:
+            # esperar a verificação normal em vez de tentar de novo a cada segundo
+            stop_event.wait(self.poll_seconds if self.lease_busy else self.seconds_until_next())
+
+
+def _create_status_tables(connections):
+    """Cria as tabelas de situação da coleta e de sinal de vida do agendador"""
+    with connections.writer() as conn:
+        conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {STATUS_TABLE} (
+            name TEXT PRIMARY KEY,
+            frequency TEXT,
+            status TEXT NOT NULL,
+            last_run_at TEXT,
+            last_success_at TEXT,
+            next_run_at TEXT,
+            last_rows INTEGER,
+            elapsed REAL,
+            last_error TEXT
+        )
+        ''')
+        conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {HEARTBEAT_TABLE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            pid INTEGER,
+            beat_at TEXT NOT NULL
+        )
+        ''')
+
+
+def _has_status_tables(conn):
+    return conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (STATUS_TABLE,)).fetchone()[0] > 0
+
+
+def _new_period(before, after, frequency):
+    """Se a última data salva passou para um período (mês, trimestre, ano) ainda não salvo"""
+    if after is None:
+        return False
+    if before is None:
+        return True
+    alias = PERIOD_ALIASES.get(frequency, 'D')
+    return pd.Period(after, alias) > pd.Period(before, alias)
+
+
+def get_collection_status(db_path=DATABASE_NAME):
+    """
+    Situação da coleta de cada série (somente leitura; não acessa a rede)
+
+    Returns:
+        Dict {série: {coluna: valor}} com as colunas de STATUS_COLUMNS
+    """
+    with get_connection_manager(db_path).reader() as conn:
+        if not _has_status_tables(conn):
+            return {}
+        cursor = conn.execute(f"SELECT {', '.join(STATUS_COLUMNS)} FROM {STATUS_TABLE} ORDER BY name")
+        return {row[0]: dict(zip(STATUS_COLUMNS[1:], row[1:])) for row in cursor.fetchall()}
+
+
+def scheduler_alive(db_path=DATABASE_NAME, max_age_seconds=None):
+    """Se há um agendador em execução (sinal de vida recente)"""
+    max_age_seconds = max_age_seconds or 3 * SCHEDULER_POLL_SECONDS
+    with get_connection_manager(db_path).reader() as conn:
+        if not _has_status_tables(conn):
+            return False
+        row = conn.execute(f"SELECT beat_at FROM {HEARTBEAT_TABLE} WHERE id = 1").fetchone()
+    if row is None:
+        return False
+    age = datetime.now() - datetime.strptime(row[0], TIMESTAMP_FORMAT)
+    return age.total_seconds() <= max_age_seconds
+
+
+def request_refresh(names=None, db_path=DATABASE_NAME):
+    """
+    Antecipa a coleta das séries (padrão: todas) para a próxima verificação do agendador
+
+    Returns:
+        Número de séries antecipadas
+    """
+    connections = get_connection_manager(db_path)
+    _create_status_tables(connections)
+    names = names or get_catalog(db_path).names()
+    frequencies = get_catalog(db_path).frequency_map()
+    now = datetime.now().strftime(TIMESTAMP_FORMAT)
+    with connections.writer() as conn:
+        conn.executemany(f'''
+        INSERT INTO {STATUS_TABLE} (name, frequency, status, next_run_at) VALUES (?, ?, 'scheduled', ?)
+        ON CONFLICT(name) DO UPDATE SET next_run_at = excluded.next_run_at
+        ''', [(name, frequencies.get(name), now) for name in names])
+    return len(names)
+
+
+if __name__ == "__main__":
+    # Uso: python scheduler.py [banco.db] [--once]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    scheduler = CollectionScheduler(args[0] if args else DATABASE_NAME)
+    if '--once' in sys.argv:
+        print(scheduler.run_once())
+    else:
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            print("Agendador de coleta encerrado")
@@ -0,0 +1,218 @@
+# Arquivo: series_catalog.py
+import os
+import re
+import sys
+import threading
+import pandas as pd
+from connection_manager import get_connection_manager
+from config import (DATABASE_NAME, BCB_INDICATOR_SERIES_MAP, BCB_INDICATOR_LABELS,
+                    BCB_INDICATOR_UNIT_MAP, BCB_INDICATOR_FREQUENCY_MAP)
+
+CATALOG_TABLE = 'series_catalog'
+CATALOG_COLUMNS = ['name', 'series_id', 'label', 'frequency', 'unit']
+FREQUENCIES = {'daily', 'monthly', 'quarterly', 'yearly'}
+
+# O nome da série também é o nome da sua tabela, então precisa ser um identificador SQL
+VALID_NAME = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+# Palavras-chave do SQLite (não podem ser nomes de tabela sem aspas) e tabelas internas
+# do banco; nomes começados por sqlite_ são reservados pelo próprio SQLite
+SQL_KEYWORDS = frozenset({
+    'abort', 'action', 'add', 'after', 'all', 'alter', 'always', 'analyze', 'and', 'as', 'asc',
+    'attach', 'autoincrement', 'before', 'begin', 'between', 'by', 'cascade', 'case', 'cast',
+    'check', 'collate', 'column', 'commit', 'conflict', 'constraint', 'create', 'cross',
+    'current', 'current_date', 'current_time', 'current_timestamp', 'database', 'default',
+    'deferrable', 'deferred', 'delete', 'desc', 'detach', 'distinct', 'do', 'drop', 'each',
+    'else', 'end', 'escape', 'except', 'exclude', 'exclusive', 'exists', 'explain', 'fail',
+    'filter', 'first', 'following', 'for', 'foreign', 'from', 'full', 'generated', 'glob',
+    'group', 'groups', 'having', 'if', 'ignore', 'immediate', 'in', 'index', 'indexed',
+    'initially', 'inner', 'insert', 'instead', 'intersect', 'into', 'is', 'isnull', 'join',
+    'key', 'last', 'left', 'like', 'limit', 'match', 'materialized', 'natural', 'no', 'not',
+    'nothing', 'notnull', 'null', 'nulls', 'of', 'offset', 'on', 'or', 'order', 'others',
+    'outer', 'over', 'partition', 'plan', 'pragma', 'preceding', 'primary', 'query', 'raise',
+    'range', 'recursive', 'references', 'regexp', 'reindex', 'release', 'rename', 'replace',
+    'restrict', 'returning', 'right', 'rollback', 'row', 'rows', 'savepoint', 'select', 'set',
+    'table', 'temp', 'temporary', 'then', 'ties', 'to', 'transaction', 'trigger', 'unbounded',
+    'union', 'unique', 'update', 'using', 'vacuum', 'values', 'view', 'virtual', 'when',
+    'where', 'window', 'with', 'without'
+})
+RESERVED_NAMES = frozenset({
+    CATALOG_TABLE, 'observations', 'series_rollups', 'series_metadata', 'series_chunks',
+    'series_revisions', 'collection_status', 'scheduler_heartbeat', 'collection_lease',
+    'backtest_folds', 'backtest_scores'
+})
+
+
+def is_valid_name(name):
+    """Se o nome pode ser usado como nome de série (e de tabela) no banco de dados"""
+    return (bool(VALID_NAME.match(name)) and name not in SQL_KEYWORDS
+            and name not in RESERVED_NAMES and not name.startswith('sqlite_'))
+
+
+class SeriesCatalog:
+    """
+    Catálogo das séries SGS acompanhadas (nome, código, frequência, unidade, última atualização)
+
+    O catálogo fica no próprio banco de dados e é mantido em memória, indexado por
+    nome e por código, para que as consultas sejam O(1) mesmo com milhares de séries.
+    """
+
+    def __init__(self, db_path=DATABASE_NAME):
+        self.db_path = db_path
+        self.connections = get_connection_manager(db_path)
+        self._lock = threading.Lock()
+        self._by_name = {}
+        self._by_id = {}
+        self._create_table()
+        self.reload()
+
+    def _create_table(self):
+        """Cria a tabela do catálogo e a preenche com as séries do config.py, se vazia"""
+        with self.connections.writer() as conn:
+            conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+                name TEXT PRIMARY KEY,
+                series_id INTEGER NOT NULL UNIQUE,
+                label TEXT,
+                frequency TEXT NOT NULL DEFAULT 'monthly',
+                unit TEXT,
+                last_updated TIMESTAMP
+            )
+            ''')
+            if conn.execute(f"SELECT COUNT(*) FROM {CATALOG_TABLE}").fetchone()[0] == 0:
+                defaults = [
+                    (name, series_id, BCB_INDICATOR_LABELS.get(name, name),
+                     BCB_INDICATOR_FREQUENCY_MAP.get(name, 'monthly'), BCB_INDICATOR_UNIT_MAP.get(name))
+                    for name, series_id in BCB_INDICATOR_SERIES_MAP.items()
+                ]
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {CATALOG_TABLE} (name, series_id, label, frequency, unit) "
+                    f"VALUES (?, ?, ?, ?, ?)", defaults)
+
+    def reload(self):
+        """Recarrega o catálogo do banco de dados para a memória"""
+        with self.connections.reader() as conn:
+            rows = conn.execute(
+                f"SELECT name, series_id, label, frequency, unit, last_updated "
+                f"FROM {CATALOG_TABLE} ORDER BY rowid").fetchall()
+
+        by_name = {}
+        for name, series_id, label, frequency, unit, last_updated in rows:
+            by_name[name] = {'name': name, 'series_id': series_id, 'label': label or name,
+                             'frequency': frequency, 'unit': unit, 'last_updated': last_updated}
+        with self._lock:
+            self._by_name = by_name
+            self._by_id = {entry['series_id']: entry for entry in by_name.values()}
+
+    def load_file(self, path):
+        """
+        Importa (ou atualiza) séries de um arquivo CSV ou JSON
+
+        O arquivo deve ter as colunas name e series_id; label, frequency e unit são opcionais.
+
+        Returns:
+            Número de séries importadas
+        """
+        if path.lower().endswith('.json'):
+            df = pd.read_json(path)
+        else:
+            df = pd.read_csv(path)
+
+        missing = {'name', 'series_id'} - set(df.columns)
+        if missing:
+            raise ValueError(f"Colunas obrigatórias ausentes no catálogo: {', '.join(sorted(missing))}")
+
+        df = df.reindex(columns=CATALOG_COLUMNS)
+        df['name'] = df['name'].astype(str).str.strip().str.lower()
+        df['series_id'] = df['series_id'].astype(int)
+        df['label'] = df['label'].fillna(df['name'])
+        df['frequency'] = df['frequency'].fillna('monthly')
+        df['unit'] = df['unit'].astype(object).where(df['unit'].notna(), None)
+
+        invalid = df.loc[~df['name'].map(is_valid_name), 'name']
+        if not invalid.empty:
+            raise ValueError(f"Nomes de série inválidos: {', '.join(invalid.head(5))}")
+        unknown = set(df['frequency']) - FREQUENCIES
+        if unknown:
+            raise ValueError(f"Frequências desconhecidas: {', '.join(sorted(unknown))}")
+
+        with self.connections.writer() as conn:
+            conn.executemany(f'''
+            INSERT INTO {CATALOG_TABLE} (name, series_id, label, frequency, unit)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                series_id = excluded.series_id,
+                label = excluded.label,
+                frequency = excluded.frequency,
+                unit = excluded.unit
+            ''', df[CATALOG_COLUMNS].itertuples(index=False, name=None))
+
+        self.reload()
+        return len(df)
+
+    def mark_updated(self, name, conn=None):
+        """Registra o momento da última gravação de dados da série"""
+        if conn is None:
+            with self.connections.writer() as conn:
+                return self.mark_updated(name, conn)
+
+        conn.execute(f"UPDATE {CATALOG_TABLE} SET last_updated = CURRENT_TIMESTAMP WHERE name = ?", (name,))
+        last_updated = conn.execute(
+            f"SELECT last_updated FROM {CATALOG_TABLE} WHERE name = ?", (name,)).fetchone()
+
+        with self._lock:
+            if name in self._by_name and last_updated:
+                self._by_name[name]['last_updated'] = last_updated[0]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def get(self, name):
+        """Dados de uma série pelo nome (ou None)"""
+        return self._by_name.get(name)
+
+    def get_by_id(self, series_id):
+        """Dados de uma série pelo código SGS (ou None)"""
+        return self._by_id.get(series_id)
+
+    def names(self):
+        return list(self._by_name)
+
+    def series_map(self):
+        """Dict {nome: código SGS}, no formato de BCB_INDICATOR_SERIES_MAP"""
+        return {name: entry['series_id'] for name, entry in self._by_name.items()}
+
+    def frequency_map(self):
+        """Dict {nome: frequência}"""
+        return {name: entry['frequency'] for name, entry in self._by_name.items()}
+
+    def labels(self):
+        """Dict {nome: nome de exibição}"""
+        return {name: entry['label'] for name, entry in self._by_name.items()}
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(db_path=DATABASE_NAME):
+    """Catálogo compartilhado (um por arquivo de banco de dados no processo)"""
+    key = os.path.abspath(db_path)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = SeriesCatalog(db_path)
+        return _catalogs[key]
+
+
+if __name__ == "__main__":
+    # Importação de séries: python series_catalog.py arquivo.csv [banco.db]
+    if len(sys.argv) < 2:
+        print("Uso: python series_catalog.py <arquivo.csv|arquivo.json> [banco.db]")
+        sys.exit(1)
+
+    catalog = get_catalog(sys.argv[2] if len(sys.argv) > 2 else DATABASE_NAME)
+    count = catalog.load_file(sys.argv[1])
+    print(f"{count} séries importadas; catálogo com {len(catalog)} séries")
@@ -0,0 +1,169 @@
+# Arquivo: sgs_parser.py
+import json
+import numpy as np
+
+# Marcadores dos campos no JSON compacto retornado pela API SGS:
+# [{"data":"DD/MM/AAAA","valor":"1.23"}, ...]
+_DATE_KEY = np.frombuffer(b'"data":"', dtype=np.uint8)
+_VALUE_KEY = np.frombuffer(b'"valor":"', dtype=np.uint8)
+_DATE_WIDTH = 10
+_QUOTE = ord('"')
+_MAX_VALUE_WIDTH = 64
+
+
+def _find_marker(buffer, marker):
+    """Posições (vetorizadas) em que a sequência de bytes `marker` ocorre no buffer"""
+    limit = len(buffer) - len(marker) + 1
+    if limit <= 0:
+        return np.empty(0, dtype=np.int64)
+    # Ancorar a busca no segundo byte ('d' / 'v'), bem mais raro que as aspas
+    candidates = np.flatnonzero(buffer[1:limit + 1] == marker[1])
+    for offset in range(len(marker)):
+        if offset != 1:
+            candidates = candidates[buffer[candidates + offset] == marker[offset]]
+    return candidates
+
+
+def _parse_dates(buffer, starts):
+    """Converte os campos 'DD/MM/AAAA' em datetime64[D] sem criar strings Python"""
+    def digit(offset):
+        return buffer[starts + offset].astype(np.int32) - ord('0')
+
+    day = digit(0) * 10 + digit(1)
+    month = digit(3) * 10 + digit(4)
+    year = digit(6) * 1000 + digit(7) * 100 + digit(8) * 10 + digit(9)
+
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    return months.astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+
+
+def _parse_values(buffer, starts):
+    """Converte os campos de valor (texto de tamanho variável) em float64"""
+    count = len(starts)
+    last = len(buffer) - 1
+
+    # Decimais simples ('-123.456') são lidos coluna a coluna: os dígitos são acumulados
+    # como inteiro e divididos pela potência de 10 correspondente, o que dá o mesmo
+    # resultado de float(texto) sem criar strings
+    lengths = np.zeros(count, dtype=np.int32)
+    mantissa = np.zeros(count, dtype=np.int64)
+    decimals = np.zeros(count, dtype=np.int32)
+    digits = np.zeros(count, dtype=np.int32)
+    seen_dot = np.zeros(count, dtype=bool)
+    negative = np.zeros(count, dtype=bool)
+    unsupported = np.zeros(count, dtype=bool)
+    active = np.ones(count, dtype=bool)
+
+    for offset in range(_MAX_VALUE_WIDTH):
+        column = buffer[np.minimum(starts + offset, last)]
+        active &= column != _QUOTE
+        if not active.any():
+            break
+        lengths += active
+
+        is_digit = active & (column >= ord('0')) & (column <= ord('9'))
+        is_dot = active & (column == ord('.'))
+        is_minus = active & (column == ord('-'))
+        if offset == 0:
+            negative = is_minus
+        else:
+            unsupported |= is_minus
+        unsupported |= active & ~(is_digit | is_dot | is_minus)
+
+        mantissa = np.where(is_digit, mantissa * 10 + (column - ord('0')), mantissa)
+        decimals += is_digit & seen_dot
+        digits += is_digit
+        seen_dot |= is_dot
+
+    empty = lengths == 0
+    if unsupported.any() or digits.max() > 15:
+        return _parse_values_as_text(buffer, starts, lengths)
+
+    values = mantissa / np.power(10.0, decimals)
+    values[negative] *= -1
+    values[empty] = np.nan
+    return values
+
+
+def _parse_values_as_text(buffer, starts, lengths):
+    """Conversão genérica (notação científica, etc.) via array de bytes de largura fixa"""
+    width = max(int(lengths.max()), 3)
+    offsets = np.arange(width)
+    index = np.minimum(starts[:, None] + offsets, len(buffer) - 1)
+    chars = np.where(offsets < lengths[:, None], buffer[index], 0).astype(np.uint8)
+
+    # Valores vazios viram NaN
+    chars[lengths == 0, :3] = np.frombuffer(b'nan', dtype=np.uint8)
+    return chars.view(f'S{width}').ravel().astype(np.float64)
+
+
+def parse_sgs_payload(payload):
+    """
+    Converte a resposta JSON da API SGS diretamente em arrays NumPy tipados
+
+    Args:
+        payload: Corpo da resposta (bytes ou str)
+
+    Returns:
+        Tupla (datas datetime64[D], valores float64)
+    """
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    buffer = np.frombuffer(payload, dtype=np.uint8)
+
+    date_starts = _find_marker(buffer, _DATE_KEY) + len(_DATE_KEY)
+    value_starts = _find_marker(buffer, _VALUE_KEY) + len(_VALUE_KEY)
+
+    # Resposta vazia ou fora do layout compacto esperado: usar o decodificador genérico
+    if (len(date_starts) == 0 or len(date_starts) != len(value_starts)
+            or date_starts[-1] + _DATE_WIDTH >= len(buffer)
+            or buffer[date_starts + _DATE_WIDTH].min() != _QUOTE):
+        return _parse_with_json(payload)
+
+    return _parse_dates(buffer, date_starts), _parse_values(buffer, value_starts)
+
+
+def _parse_with_json(payload):
+    """Caminho genérico (mais lento) para respostas fora do formato compacto"""
+    records = json.loads(payload) or []
+    dates = np.array(
+        [f"{r['data'][6:10]}-{r['data'][3:5]}-{r['data'][0:2]}" for r in records],
+        dtype='datetime64[D]'
+    )
+    values = np.array([float(r['valor']) if r['valor'] not in ('', None) else np.nan
+                       for r in records], dtype=np.float64)
+    return dates, values
+
+
+def parse_sgs_stream(chunks):
+    """
+    Converte uma resposta recebida em partes (ex.: response.iter_content) em arrays NumPy
+
+    Cada parte é decodificada assim que chega, até o último registro completo; o
+    restante é guardado para a próxima parte. Assim o corpo inteiro nunca precisa
+    ficar em memória.
+
+    Args:
+        chunks: Iterável de bytes
+
+    Returns:
+        Tupla (datas datetime64[D], valores float64)
+    """
+    all_dates, all_values = [], []
+    pending = b''
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+        cut = pending.rfind(b'}')
+        if cut < 0:
+            continue
+        dates, values = parse_sgs_payload(b'[' + pending[:cut + 1].lstrip(b'[, \r\n\t') + b']')
+        all_dates.append(dates)
+        all_values.append(values)
+        pending = pending[cut + 1:]
+
+    if not all_dates:
+        return np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.float64)
+    return np.concatenate(all_dates), np.concatenate(all_values)
@@ -0,0 +1,42 @@
+# Arquivo: tests/test_write_service.py
+import os
+import sys
+import tempfile
+import unittest
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager
+from write_service import WriteService
+
+
+def monthly(values):
+    return pd.DataFrame({'date': pd.date_range('2020-01-01', periods=len(values), freq='MS'), 'value': values})
+
+
+class WriteServiceTest(unittest.TestCase):
+    def setUp(self):
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            self.db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'write_service.db'))
+        self.service = WriteService(self.db)
+
+    def tearDown(self):
+        self.service.close()
+
+    def test_invalid_request_does_not_stop_the_writer(self):
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            # Segurar o lock garante que os dois pedidos caiam no mesmo lote
+            with self.service._cond:
+                invalid = self.service.submit('selic', {'date': ['2020-01-01'], 'value': [1.0]})
+                valid = self.service.submit('selic', monthly([1.0, 2.0]))
+
+            self.assertFalse(invalid.result(timeout=10))
+            self.assertFalse(valid.result(timeout=10))
+
+            self.assertTrue(self.service.save('ipca', monthly([0.5, 0.4, 0.3]), timeout=10))
+        self.assertEqual(len(self.db.load_series('ipca')['value']), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+# Arquivo: write_service.py
+import os
+import time
+import threading
+from concurrent.futures import Future
+import pandas as pd
+from config import DATABASE_NAME, WRITE_BATCH_MAX_SERIES, WRITE_BATCH_MAX_DELAY_SECONDS
+from database_manager import get_database_manager
+
+
+class WriteService:
+    """
+    Gravador único de séries de um processo
+
+    Todas as gravações entram em uma fila atendida por uma única thread, que junta
+    os pedidos pendentes em lotes gravados em uma só transação (commit em grupo,
+    por DatabaseManager.save_many). Pedidos pendentes da mesma série são combinados
+    em um só (as linhas mais recentes prevalecem), então cliques simultâneos na
+    coleta não gravam a mesma série várias vezes. Com WAL, as leituras seguem sem
+    bloqueio enquanto o lote é gravado.
+    """
+
+    def __init__(self, db, max_batch=WRITE_BATCH_MAX_SERIES, max_delay=WRITE_BATCH_MAX_DELAY_SECONDS):
+        self.db = db
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._thread = None
+        self._closed = False
+        self.stats = {'requests': 0, 'coalesced': 0, 'batches': 0, 'series_written': 0}
+
+    def submit(self, table_name, df, only_changed=True):
+        """
+        Enfileira a gravação de uma série
+
+        Returns:
+            Future com o resultado de save_data (True/False)
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Serviço de gravação encerrado")
+            entry = self._pending.get(table_name)
+            if entry is None:
+                entry = self._pending[table_name] = {'frames': [], 'only_changed': True, 'futures': []}
+            else:
+                self.stats['coalesced'] += 1
+            entry['frames'].append(df)
+            entry['only_changed'] = entry['only_changed'] and only_changed
+            entry['futures'].append(future)
+            self.stats['requests'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='write-service', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def save(self, table_name, df, only_changed=True, timeout=None):
+        """Grava uma série pelo gravador único e aguarda o resultado"""
+        return self.submit(table_name, df, only_changed).result(timeout)
+
+    def _next_batch(self):
+        """Aguarda pedidos e retira até max_batch séries da fila (None ao encerrar)"""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+
+            # Espera curta para que pedidos simultâneos entrem no mesmo commit
+            deadline = time.monotonic() + self.max_delay
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            names = list(self._pending)[:self.max_batch]
+            return {name: self._pending.pop(name) for name in names}
+
+    def _run(self):
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                self._write_batch(batch)
+        finally:
+            # Saída anormal da thread: o próximo submit inicia outro gravador
+            with self._cond:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                    if self._pending and not self._closed:
+                        self._thread = threading.Thread(target=self._run, name='write-service', daemon=True)
+                        self._thread.start()
+
+    def _write_batch(self, batch):
+        """
+        Grava um lote retirado da fila e resolve todos os seus futures
+
+        Uma série cujos pedidos não formam um DataFrame recebe False sozinha; um erro
+        inesperado no lote é repassado aos futures ainda pendentes, sem derrubar a thread.
+        """
+        results = {}
+        error = None
+        try:
+            for only_changed in (True, False):
+                group = {}
+                for name, entry in batch.items():
+                    if entry['only_changed'] != only_changed:
+                        continue
+                    try:
+                        group[name] = _combine(entry['frames'])
+                    except Exception as e:
+                        print(f"Erro ao combinar os pedidos de gravação de {name}: {e}")
+                        results[name] = False
+                if not group:
+                    continue
+                try:
+                    results.update(self.db.save_many(group, only_changed))
+                except Exception as e:
+                    print(f"Erro no serviço de gravação: {e}")
+                    results.update({name: False for name in group})
+
+            self.stats['batches'] += 1
+            self.stats['series_written'] += len(batch)
+        except Exception as e:
+            print(f"Erro no serviço de gravação: {e}")
+            error = e
+        finally:
+            for name, entry in batch.items():
+                for future in entry['futures']:
+                    if future.done():
+                        continue
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(results.get(name, False))
+
+    def close(self):
+        """Grava os pedidos pendentes e encerra a thread de gravação"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+
+def _combine(frames):
+    """Junta os pedidos pendentes de uma série (os mais recentes por último) em um só DataFrame"""
+    if not all(isinstance(frame, pd.DataFrame) for frame in frames):
+        raise TypeError("os pedidos de gravação precisam ser DataFrames")
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_write_service(db=None, db_path=DATABASE_NAME):
+    """
+    Gravador único compartilhado (um por arquivo de banco de dados no processo)
+
+    Args:
+        db: DatabaseManager usado na criação do serviço (padrão: get_database_manager(db_path))
+        db_path: Arquivo do banco, se db não for informado
+    """
+    if db is None:
+        db = get_database_manager(db_path)
+    key = os.path.abspath(db.db_path)
+    with _services_lock:
+        if key not in _services:
+            _services[key] = WriteService(db)
+        return _services[key]